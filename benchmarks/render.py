@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+# -------------------------------------------------
+# Micro-benchmark: rendering man pages of large classes
+# -------------------------------------------------
+#
+# Generates a module with one large class (many methods with arguments,
+# return values, exceptions, and examples) and measures the time and the
+# memory allocated (tracemalloc peak) to render the man page of the class
+# (`ManPage.render()`), once with a cold docstring cache (parsing included)
+# and once with a warm cache (rendering only).
+#
+# Usage:
+#   python benchmarks/render.py [--methods 50 200 500] [--examples 5] [--repeat 5] [--json res.json]
+
+
+def make_module(path, name, methods, examples):
+    """Write module `name` with class `Large` into `path`"""
+    from os.path import join
+
+    ex  = "".join(f"            >>> x = Large().method_0(a = {i}, b = 'b{i}')\n" + \
+                  f"            >>> print(x)\n" for i in range(examples))
+    src = ["class Large:\n",
+           "    \"\"\"Large Class\n\n    Class with many methods, see :py:meth:`method_0`.\n\n" + \
+           "    Args:\n        n (int): Some number.\n    \"\"\"\n",
+           "    def __init__(self, n = 1):\n        self.n = n\n\n"]
+    for i in range(methods):
+        src.append(f"    def method_{i}(self, a, b = \"x\", *args, c = None, **kwargs):\n" + \
+                   f"        \"\"\"Method {i}\n\n" + \
+                   f"        Does something; see :py:meth:`method_{(i + 1) % methods}` and\n" + \
+                   f"        :py:class:`Large`. " + "Lorem ipsum dolor sit amet. " * 5 + "\n\n" + \
+                   f"        Args:\n" + \
+                   f"            a (int): First argument, see :py:meth:`method_0`.\n" + \
+                   f"            b (str): Second argument.\n" + \
+                   f"            c (None, float): Third argument.\n\n" + \
+                   f"        Returns:\n            int: Some result.\n\n" + \
+                   f"        Raises:\n            ValueError: If `a` is negative.\n\n" + \
+                   f"        Examples:\n{ex}        \"\"\"\n" + \
+                   f"        return a\n\n")
+    with open(join(path, f"{name}.py"), "w") as fid:
+        fid.write("".join(src))
+
+
+def measure(fun, repeat):
+    """Returns minimum time (ms) and maximum tracemalloc peak (KiB) of `fun()`"""
+    import tracemalloc
+    from time import perf_counter
+
+    times, peaks = [], []
+    for i in range(repeat):
+        start = perf_counter()
+        fun()
+        times.append((perf_counter() - start) * 1000.)
+
+        tracemalloc.start()
+        fun()
+        peaks.append(tracemalloc.get_traced_memory()[1] / 1024.)
+        tracemalloc.stop()
+    return min(times), max(peaks)
+
+
+def main():
+    import sys
+    import json
+    import argparse
+    from tempfile import TemporaryDirectory
+    from importlib import import_module
+
+    parser = argparse.ArgumentParser("render")
+    parser.add_argument("--methods", type = int, nargs = "+", default = [50, 200, 500],
+            help = "Number of methods of the class (one benchmark each), defaults to 50 200 500.")
+    parser.add_argument("--examples", type = int, default = 5,
+            help = "Number of example lines per method, defaults to 5.")
+    parser.add_argument("--repeat", type = int, default = 5,
+            help = "Number of runs per benchmark (minimum time is reported), defaults to 5.")
+    parser.add_argument("--json", type = str, default = None,
+            help = "Name of a JSON file to store the results.")
+    args = parser.parse_args()
+
+    from pyp2qmd import Config, ManPage, DocCache, SymbolIndex, CrossReferences
+
+    results = dict()
+    with TemporaryDirectory() as tmp:
+        sys.path.insert(0, tmp)
+        for n in args.methods:
+            name = f"pyp2qmd_bench_render_{n}"
+            make_module(tmp, name, n, args.examples)
+            mod = import_module(name)
+
+            config = Config()
+            config.setup("document", name, silent = True)
+            refs   = CrossReferences(SymbolIndex(mod))
+
+            # Cold: new cache, docstrings parsed while rendering
+            cold = lambda: ManPage("Large", mod.Large, config, cache = DocCache(), refs = refs).render([])
+            # Warm: cache already populated, rendering only
+            cache = DocCache()
+            ManPage("Large", mod.Large, config, cache = cache, refs = refs).render([])
+            warm = lambda: ManPage("Large", mod.Large, config, cache = cache, refs = refs).render([])
+
+            size = len("".join(warm()))
+            res  = {"methods": n, "page_kib": round(size / 1024., 1)}
+            for key, fun in [("cold", cold), ("warm", warm)]:
+                ms, kib = measure(fun, args.repeat)
+                res[f"{key}_ms"], res[f"{key}_peak_kib"] = round(ms, 3), round(kib, 1)
+            results[str(n)] = res
+
+            print(f"{n:5d} methods  page {res['page_kib']:8.1f} KiB   " + \
+                  f"cold {res['cold_ms']:9.2f} ms {res['cold_peak_kib']:9.1f} KiB   " + \
+                  f"warm {res['warm_ms']:9.2f} ms {res['warm_peak_kib']:9.1f} KiB")
+
+    if args.json:
+        with open(args.json, "w") as fid: json.dump(results, fid, indent = 2, sort_keys = True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+# -------------------------------------------------
+# Cold start benchmark for the pyp2qmd console tool
+# -------------------------------------------------
+#
+# Runs the pyp2qmd command line interface via `python -X importtime`
+# and checks (i) the total import time and (ii) that no heavy module
+# is imported which is not required by the action (e.g., `--help` must
+# not import yaml or docstring_parser). Exits with status 1 if a budget
+# is exceeded or a forbidden module is imported.
+#
+# Usage:
+#   python benchmarks/startup.py [--repeat 5] [--budget help=60] [--json res.json]
+
+
+# Scenarios: name -> (arguments, budget in milliseconds, forbidden modules)
+SCENARIOS = {
+    "help":     (["--help"], 60.,
+                 ["pkg_resources", "importlib.metadata", "yaml", "docstring_parser",
+                  "concurrent.futures"]),
+    # No-op incremental run (nothing changed since the previous run)
+    "document": (["document", "-p", "pyp2qmd", "--silent"], 120.,
+                 ["pkg_resources", "importlib.metadata", "yaml", "docstring_parser",
+                  "concurrent.futures"]),
+    "init":     (["init", "-p", "pyp2qmd", "--silent", "--overwrite"], 250.,
+                 ["pkg_resources", "importlib.metadata", "concurrent.futures"]),
+}
+
+
+def importtime(args, cwd):
+    """Run pyp2qmd with `args`; returns dict module -> self import time (us)"""
+    import sys
+    from os import environ
+    from subprocess import run
+
+    code = "import sys; from pyp2qmd.bin.pyp2qmd import main; " + \
+           f"sys.argv = {['pyp2qmd'] + args!r}; main()"
+    # Measure with bytecode caches as in a regular installation
+    env = dict(environ)
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+
+    res = run([sys.executable, "-X", "importtime", "-c", code], cwd = cwd, env = env,
+              capture_output = True, text = True)
+    if res.returncode != 0:
+        raise Exception(f"pyp2qmd {' '.join(args)} failed:\n{res.stderr}")
+
+    times = dict()
+    for line in res.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line: continue
+        tmp = line[len("import time:"):].split("|")
+        times[tmp[2].strip()] = int(tmp[0])
+    return times
+
+
+def main():
+    import argparse
+    import json
+    from tempfile import TemporaryDirectory
+
+    parser = argparse.ArgumentParser("startup")
+    parser.add_argument("--repeat", type = int, default = 5,
+            help = "Number of runs per scenario (minimum is reported), defaults to 5.")
+    parser.add_argument("--budget", action = "append", default = [],
+            help = "Overwrite budget (milliseconds), e.g., `--budget help=40`.")
+    parser.add_argument("--json", type = str, default = None,
+            help = "Name of a JSON file to store the results.")
+    args = parser.parse_args()
+
+    budgets = {k: v[1] for k, v in SCENARIOS.items()}
+    for rec in args.budget:
+        key, val = rec.split("=")
+        budgets[key] = float(val)
+
+    results, failed = dict(), False
+    with TemporaryDirectory() as tmp:
+        # Set up documentation (and warm up bytecode caches)
+        importtime(["init", "-p", "pyp2qmd", "--silent"], tmp)
+
+        for name, (cli, _, forbidden) in SCENARIOS.items():
+            runs = [importtime(cli, tmp) for i in range(args.repeat)]
+            total = min(sum(x.values()) for x in runs) / 1000.
+            heavy = sorted(set(m for x in runs for m in x \
+                               if any(m == f or m.startswith(f + ".") for f in forbidden)))
+
+            ok = total <= budgets[name] and len(heavy) == 0
+            failed = failed or not ok
+            results[name] = {"import_ms": round(total, 2), "budget_ms": budgets[name],
+                             "forbidden_imported": heavy, "ok": ok}
+            print(f"{name:10s} {total:8.2f} ms (budget {budgets[name]:6.1f} ms)  " + \
+                  ("ok" if ok else "FAILED") + \
+                  (f"; imports {', '.join(heavy)}" if heavy else ""))
+
+    if args.json:
+        with open(args.json, "w") as fid: json.dump(results, fid, indent = 2, sort_keys = True)
+
+    if failed:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
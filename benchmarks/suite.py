@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+# -------------------------------------------------
+# Benchmark suite: documenting a synthetic package
+# -------------------------------------------------
+#
+# Generates a synthetic package (see benchmarks/synthetic.py) and times
+# the phases of pyp2qmd, each run in a fresh interpreter:
+#
+# * cold: first run (no quarto project, no manifest, no examples);
+#   DocConverter initialized with action "init".
+# * warm: second run on the existing project (nothing changed);
+#   DocConverter initialized with action "document".
+#
+# Timed phases are `import` (import of pyp2qmd), `init` (DocConverter.__init__),
+# `document`, `update_quarto_yml`, and `examples`. The minimum over
+# `--repeat` runs is reported. The results are written in a stable JSON
+# format (`--json`; sorted keys, schema version) which can be compared
+# across commits.
+#
+# Usage:
+#   python benchmarks/suite.py [--modules 10 --classes 5 ...] [--repeat 3] [--json res.json]
+
+# Version of the JSON format
+SCHEMA = 1
+
+PHASES = ["import", "init", "document", "update_quarto_yml", "examples"]
+
+# Executed in a child process: times the phases, prints a JSON dict
+CHILD = """
+import sys, json
+from time import perf_counter
+t = [perf_counter()]
+from pyp2qmd import Config, DocConverter
+t.append(perf_counter())
+config = Config()
+config.setup(action = {action!r}, package = {name!r}, docstringstyle = {style!r},
+             silent = True, overwrite = True, jobs = {jobs!r}, static = {static!r})
+docconv = DocConverter(config)
+t.append(perf_counter())
+docconv.document()
+t.append(perf_counter())
+docconv.update_quarto_yml()
+t.append(perf_counter())
+docconv.examples()
+t.append(perf_counter())
+print(json.dumps(dict(zip({phases!r}, [b - a for a, b in zip(t[:-1], t[1:])]))))
+"""
+
+
+def run_child(cwd, pythonpath, **kwargs):
+    """Run the phases in a new interpreter; returns dict phase -> seconds"""
+    import sys
+    import json
+    from os import environ, pathsep
+    from subprocess import run
+
+    env = dict(environ)
+    env["PYTHONPATH"] = pathsep.join([pythonpath] + ([env["PYTHONPATH"]] if env.get("PYTHONPATH") else []))
+    res = run([sys.executable, "-c", CHILD.format(phases = PHASES, **kwargs)],
+              cwd = cwd, env = env, capture_output = True, text = True)
+    if res.returncode != 0:
+        raise Exception(f"benchmark run failed:\n{res.stderr}")
+    return json.loads(res.stdout.strip().split("\n")[-1])
+
+
+def main():
+    import sys
+    import json
+    import argparse
+    import platform
+    from os.path import dirname, abspath, join
+    from shutil import rmtree
+    from tempfile import TemporaryDirectory
+
+    sys.path.insert(0, dirname(abspath(__file__)))
+    import synthetic
+
+    parser = argparse.ArgumentParser("suite")
+    synthetic.add_arguments(parser)
+    parser.add_argument("--repeat", type = int, default = 3,
+            help = "Number of runs (minimum is reported), defaults to 3.")
+    parser.add_argument("-j", "--jobs", type = int, default = 1,
+            help = "Passed on to pyp2qmd (number of worker processes), defaults to 1.")
+    parser.add_argument("--static", default = False, action = "store_true",
+            help = "If set, pyp2qmd runs in static mode (package not imported).")
+    parser.add_argument("--json", type = str, default = None,
+            help = "Name of a JSON file to store the results.")
+    args = parser.parse_args()
+
+    import pyp2qmd
+    size = {k: getattr(args, k) for k in ["modules", "classes", "methods", "functions",
+                                          "length", "examples", "style"]}
+
+    timings = {"cold": [], "warm": []}
+    with TemporaryDirectory() as tmp:
+        pkgdir, workdir = join(tmp, "pkg"), join(tmp, "work")
+        counts = synthetic.generate(pkgdir, args.name, **size)
+        opts   = {"name": args.name, "style": args.style, "jobs": args.jobs, "static": args.static}
+        for i in range(args.repeat):
+            rmtree(workdir, ignore_errors = True)
+            from os import makedirs
+            makedirs(workdir)
+            timings["cold"].append(run_child(workdir, pkgdir, action = "init", **opts))
+            timings["warm"].append(run_child(workdir, pkgdir, action = "document", **opts))
+
+    results = {"schema": SCHEMA, "pyp2qmd": pyp2qmd.__version__,
+               "python": platform.python_version(), "platform": platform.platform(),
+               "parameters": dict(size, jobs = args.jobs, static = args.static, repeat = args.repeat),
+               "package": counts, "results": dict()}
+    for key, runs in timings.items():
+        results["results"][key] = {p: round(min(r[p] for r in runs), 6) for p in PHASES}
+        results["results"][key]["total"] = round(sum(results["results"][key][p] for p in PHASES), 6)
+
+    print(f"Package: {counts['modules']} modules, {counts['classes']} classes, " + \
+          f"{counts['methods']} methods, {counts['functions']} functions ({args.style})")
+    print(f"{'phase':20s} {'cold [s]':>10s} {'warm [s]':>10s}")
+    for p in PHASES + ["total"]:
+        print(f"{p:20s} {results['results']['cold'][p]:10.4f} {results['results']['warm'][p]:10.4f}")
+
+    if args.json:
+        with open(args.json, "w") as fid: json.dump(results, fid, indent = 2, sort_keys = True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+# -------------------------------------------------
+# Synthetic package generator for benchmarks
+# -------------------------------------------------
+#
+# Writes a python package of configurable size (modules, classes, methods,
+# functions, docstring length, examples, docstring style) which can be
+# documented by pyp2qmd. Used by benchmarks/suite.py; can also be used
+# on its own to size documentation jobs.
+#
+# Usage:
+#   python benchmarks/synthetic.py <path> [--name synpkg] [--modules 10] [--classes 5] ...
+
+
+# Docstring templates by style; {title}, {text}, and {examples} are
+# replaced, arguments/returns/raises are the same for all objects.
+STYLES = {
+    "GOOGLE":   ("{title}\n\n{text}\n\nArgs:\n    a (int): First argument.\n" + \
+                 "    b (str): Second argument, see :py:func:`{ref}`.\n\n" + \
+                 "Returns:\n    int: Some result.\n\n" + \
+                 "Raises:\n    ValueError: If `a` is negative.\n{examples}"),
+    "NUMPYDOC": ("{title}\n\n{text}\n\nParameters\n----------\na : int\n    First argument.\n" + \
+                 "b : str\n    Second argument, see :py:func:`{ref}`.\n\n" + \
+                 "Returns\n-------\nint\n    Some result.\n\n" + \
+                 "Raises\n------\nValueError\n    If `a` is negative.\n{examples}"),
+    "REST":     ("{title}\n\n{text}\n\n:param a: First argument.\n:type a: int\n" + \
+                 ":param b: Second argument, see :py:func:`{ref}`.\n:type b: str\n" + \
+                 ":returns: Some result.\n:rtype: int\n:raises ValueError: If `a` is negative.\n{examples}"),
+}
+
+# Examples section by style
+EXAMPLES = {"GOOGLE": "\nExamples:\n{lines}", "NUMPYDOC": "\nExamples\n--------\n{lines}",
+            "REST": "\n.. rubric:: Examples\n\n{lines}"}
+
+LOREM = "Lorem ipsum dolor sit amet, consectetur adipiscing elit. "
+
+
+def docstring(style, title, ref, length, examples, indent):
+    """Docstring of `style` with `length` sentences and `examples` example lines"""
+    lines = "".join(f"    >>> x = {i} + 1\n" if style == "GOOGLE" else f">>> x = {i} + 1\n"
+                    for i in range(examples))
+    ex  = EXAMPLES[style].format(lines = lines) if examples > 0 else ""
+    doc = STYLES[style].format(title = title, text = (LOREM * length).strip(), ref = ref, examples = ex)
+    pad = " " * indent
+    return "\"\"\"" + "\n".join((pad + x) if x else x for x in doc.split("\n")).lstrip() + \
+           f"\n{pad}\"\"\"\n"
+
+
+def generate(path, name = "synpkg", modules = 10, classes = 5, methods = 10, functions = 10,
+             length = 3, examples = 3, style = "GOOGLE"):
+    """Generate Synthetic Package
+
+    Args:
+        path (str): Directory in which the package is created.
+        name (str): Name of the package.
+        modules (int): Number of modules.
+        classes (int): Number of classes per module.
+        methods (int): Number of methods per class.
+        functions (int): Number of functions per module.
+        length (int): Length of the long descriptions (sentences).
+        examples (int): Number of example lines per docstring.
+        style (str): Docstring style, one of the keys of `STYLES`.
+
+    Returns:
+        dict: Number of `modules`, `classes`, `methods`, and `functions` created.
+    """
+    from os import makedirs
+    from os.path import join
+
+    if not style in STYLES:
+        raise ValueError(f"argument `style` must be one of {', '.join(STYLES)}")
+
+    makedirs(join(path, name), exist_ok = True)
+    init = [f"\"\"\"Synthetic package for benchmarking\"\"\"\n"]
+    for m in range(modules):
+        src, exports = [], []
+        for f in range(functions):
+            fname = f"func_{m}_{f}"
+            ref   = f"func_{m}_{(f + 1) % functions}"
+            src.append(f"def {fname}(a, b = \"x\"):\n    " + \
+                       docstring(style, f"Function {m} {f}", ref, length, examples, 4) + \
+                       "    return a\n\n")
+            exports.append(fname)
+        for c in range(classes):
+            cname = f"Class_{m}_{c}"
+            ref   = f"func_{m}_0" if functions > 0 else cname
+            body  = [f"class {cname}:\n    " + docstring(style, f"Class {m} {c}", ref, length, examples, 4) + \
+                     "    def __init__(self, a, b = \"x\"):\n        self.a = a\n\n"]
+            for k in range(methods):
+                body.append(f"    def method_{k}(self, a, b = \"x\"):\n        " + \
+                            docstring(style, f"Method {k}", ref, length, examples, 8) + \
+                            "        return a\n\n")
+            src.append("".join(body))
+            exports.append(cname)
+        with open(join(path, name, f"module_{m}.py"), "w") as fid:
+            fid.write(f"__all__ = {exports!r}\n\n\n" + "\n".join(src))
+        init.append(f"from .module_{m} import *\n")
+
+    with open(join(path, name, "__init__.py"), "w") as fid:
+        fid.write("".join(init))
+
+    return {"modules": modules, "classes": modules * classes,
+            "methods": modules * classes * methods, "functions": modules * functions}
+
+
+def add_arguments(parser):
+    """Add the package size options to an argparse parser"""
+    parser.add_argument("--name", type = str, default = "synpkg",
+            help = "Name of the package, defaults to \"synpkg\".")
+    parser.add_argument("--modules", type = int, default = 10,
+            help = "Number of modules, defaults to 10.")
+    parser.add_argument("--classes", type = int, default = 5,
+            help = "Number of classes per module, defaults to 5.")
+    parser.add_argument("--methods", type = int, default = 10,
+            help = "Number of methods per class, defaults to 10.")
+    parser.add_argument("--functions", type = int, default = 10,
+            help = "Number of functions per module, defaults to 10.")
+    parser.add_argument("--length", type = int, default = 3,
+            help = "Length of the long descriptions (sentences), defaults to 3.")
+    parser.add_argument("--examples", type = int, default = 3,
+            help = "Number of example lines per docstring, defaults to 3.")
+    parser.add_argument("--style", type = str, default = "GOOGLE", choices = list(STYLES),
+            help = "Docstring style, defaults to \"GOOGLE\".")
+
+
+def main():
+    import argparse
+    parser = argparse.ArgumentParser("synthetic")
+    parser.add_argument("path", type = str, help = "Directory in which the package is created.")
+    add_arguments(parser)
+    args = vars(parser.parse_args())
+    print(generate(**args))
+
+
+if __name__ == "__main__":
+    main()
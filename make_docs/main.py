@@ -18,22 +18,24 @@ def main():
     docconv.document()
     docconv.update_quarto_yml()
 
-    # Adding test page
-    src = join(abspath, "getting_started.qmd")
-    docconv.add_navbar_page(src, basename(src), "Getting started")
-    src = join(abspath, "design_philosophy.qmd")
-    docconv.add_navbar_page(src, basename(src), "Design philosophy")
-
-    # Adding favicon
-    docconv.add_favicon(join(abspath, "favicon.png"))
-
-    # Adding repo and issue URL + github icon
-    repo_url    = "https://github.com/retostauffer/pyp2qmd"
-    repo_branch = "main"
-    docconv.add_repo_url(repo_url, repo_branch)
-    docconv.add_issue_url("https://github.com/retostauffer/pyp2qmd/issues")
-
-    docconv.add_navbar_right({"icon": "github", "href": f"{repo_url}/tree/{repo_branch}"})
+    # Apply all changes to _quarto.yml in one go (read and written once)
+    with docconv.quarto_yml():
+        # Adding test page
+        src = join(abspath, "getting_started.qmd")
+        docconv.add_navbar_page(src, basename(src), "Getting started")
+        src = join(abspath, "design_philosophy.qmd")
+        docconv.add_navbar_page(src, basename(src), "Design philosophy")
+
+        # Adding favicon
+        docconv.add_favicon(join(abspath, "favicon.png"))
+
+        # Adding repo and issue URL + github icon
+        repo_url    = "https://github.com/retostauffer/pyp2qmd"
+        repo_branch = "main"
+        docconv.add_repo_url(repo_url, repo_branch)
+        docconv.add_issue_url("https://github.com/retostauffer/pyp2qmd/issues")
+
+        docconv.add_navbar_right({"icon": "github", "href": f"{repo_url}/tree/{repo_branch}"})
 
 
 if __name__ == "__main__":
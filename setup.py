@@ -4,9 +4,12 @@
 # -------------------------------------------------------------------
 
 from setuptools import setup, find_namespace_packages
+from re import search
 
 ISRELEASED  = False
-VERSION     = "0.1.2"
+# Single source of the version: src/pyp2qmd/__init__.py
+with open("src/pyp2qmd/__init__.py", "r") as fid:
+    VERSION = search(r"__version__\s*=\s*\"(.*?)\"", fid.read()).group(1)
 
 setup(
     name         = "pyp2qmd",
@@ -0,0 +1,233 @@
+
+
+class ArchiveSink:
+    """Archive Output Sink
+
+    Writes pages into a single zip or tar archive instead of individual
+    files. Used by :py:class:`DocConverter <pyp2qmd.DocConverter.DocConverter>`
+    if `archive` is set (see :py:class:`Config <pyp2qmd.Config.Config>`);
+    same interface as :py:class:`FileWriter <pyp2qmd.FileWriter.FileWriter>`.
+    Entries are compressed while writing (streaming, the pages are not
+    kept in memory). The archive is written to a temporary file which
+    replaces `file` when closed (see :py:meth:`close` and :py:meth:`discard`).
+
+    Entry names are relative to `root` (e.g., `man/<name>.qmd` for man pages
+    with `root = quarto_dir`, `<name>.qmd` for examples with
+    `root = examples_dir`). The first entry (`.pyp2qmd_archive.json`)
+    stores `what` the archive contains, used by :py:meth:`extract`.
+
+    Args:
+        file (str): Name of the archive; the format is derived from the file
+            extension (`.zip`, `.tar`, `.tar.gz` or `.tgz`).
+        root (str): Directory the entries are relative to.
+        what (str): Either `"man"` or `"examples"`.
+
+    Return:
+        Initializes a new object of class `ArchiveSink`; opens the archive.
+        Should be used as a context manager (or :py:meth:`close` called).
+
+    Raises:
+        TypeError: If `file`, `root`, or `what` are not str.
+        ValueError: If `file` has an unsupported extension.
+        ValueError: If `what` is not `"man"` or `"examples"`.
+    """
+
+    # Name of the entry containing the meta information
+    METAFILE = ".pyp2qmd_archive.json"
+
+    # Supported file extensions
+    EXTENSIONS = [".zip", ".tar", ".tar.gz", ".tgz"]
+
+    def __init__(self, file, root, what):
+        import json
+
+        if not isinstance(file, str):
+            raise TypeError("argument `file` must be str")
+        elif not self.supported(file):
+            raise ValueError(f"argument `file` must end in one of {', '.join(self.EXTENSIONS)}")
+        if not isinstance(root, str):
+            raise TypeError("argument `root` must be str")
+        if not isinstance(what, str):
+            raise TypeError("argument `what` must be str")
+        elif not what in ["man", "examples"]:
+            raise ValueError("argument `what` must be \"man\" or \"examples\"")
+
+        self._file    = file
+        self._tmp     = f"{file}.tmp"
+        self._root    = root
+        self._results = []
+        if file.endswith(".zip"):
+            from zipfile import ZipFile, ZIP_DEFLATED
+            self._zip, self._tar = ZipFile(self._tmp, "w", ZIP_DEFLATED), None
+        else:
+            import tarfile
+            self._zip = None
+            self._tar = tarfile.open(self._tmp, "w|" if file.endswith(".tar") else "w|gz")
+        self._add(self.METAFILE, json.dumps({"what": what}).encode("utf-8"))
+
+
+    @classmethod
+    def supported(cls, file):
+        """Supported Archive
+
+        Args:
+            file (str): Name of the archive.
+
+        Returns:
+            bool: `True` if the file extension is supported.
+        """
+        return any(file.endswith(x) for x in cls.EXTENSIONS)
+
+
+    def _add(self, name, content):
+        """Add entry (bytes); fixed time stamps for reproducible archives"""
+        if self._zip is not None:
+            from zipfile import ZipInfo, ZIP_DEFLATED
+            info = ZipInfo(name, date_time = (1980, 1, 1, 0, 0, 0))
+            info.compress_type = ZIP_DEFLATED
+            self._zip.writestr(info, content)
+        else:
+            from tarfile import TarInfo
+            from io import BytesIO
+            info = TarInfo(name)
+            info.size, info.mode = len(content), 0o644
+            self._tar.addfile(info, BytesIO(content))
+
+
+    def put(self, file, content):
+        """Add File
+
+        Args:
+            file (str): Path of the file (see `root`).
+            content (str): Content to be written.
+        """
+        from os.path import relpath
+        from time import perf_counter
+
+        start = perf_counter()
+        name  = relpath(file, self._root).replace("\\", "/")
+        if name.startswith(".."):
+            raise ValueError(f"file \"{file}\" is not inside \"{self._root}\"")
+        self._add(name, content.encode("utf-8"))
+        self._results.append((file, True, perf_counter() - start))
+
+
+    def join(self):
+        """Files Added
+
+        Returns:
+            list: List of tuples `(file, True, seconds)` for all files added since
+            the last call (see :py:meth:`FileWriter.join <pyp2qmd.FileWriter.FileWriter.join>`).
+        """
+        res, self._results = self._results, []
+        return res
+
+
+    def close(self):
+        """Close Archive
+
+        Finalizes the archive and moves it to `file`.
+        """
+        from os import replace
+        if self._zip is None and self._tar is None: return
+        (self._zip or self._tar).close()
+        self._zip = self._tar = None
+        replace(self._tmp, self._file)
+
+
+    def discard(self):
+        """Discard Archive
+
+        Closes and removes the (incomplete) archive; an existing `file` is
+        left unchanged. Does nothing if already closed.
+        """
+        from os import remove
+        if self._zip is None and self._tar is None: return
+        try:
+            (self._zip or self._tar).close()
+        finally:
+            self._zip = self._tar = None
+            remove(self._tmp)
+
+
+    def __enter__(self):
+        return self
+
+
+    def __exit__(self, exc_type, *args):
+        # Do not replace an existing archive by an incomplete one
+        if exc_type is None:
+            self.close()
+        else:
+            self.discard()
+        return False
+
+
+    @staticmethod
+    def extract(file, quarto_dir = "_quarto", examples_dir = "_examples"):
+        """Extract Archive
+
+        Extracts an archive written by :py:class:`ArchiveSink` into `quarto_dir`
+        (man pages) or `examples_dir` (examples). Only entries which differ
+        from the existing files are written (see
+        :py:meth:`ManPage.write_file <pyp2qmd.ManPage.ManPage.write_file>`).
+
+        Args:
+            file (str): Name of the archive.
+            quarto_dir (str): Target directory for man pages, defaults to `"_quarto"`.
+            examples_dir (str): Target directory for examples, defaults to `"_examples"`.
+
+        Returns:
+            dict: Dictionary with the lists of files `written` and `unchanged`.
+
+        Raises:
+            Exception: If `file` has not been written by :py:class:`ArchiveSink`
+                or contains entries pointing outside the target directory.
+        """
+        import json
+        from os import makedirs
+        from os.path import join, dirname, normpath, isabs
+        from .ManPage import ManPage
+
+        if not ArchiveSink.supported(file):
+            raise ValueError(f"argument `file` must end in one of {', '.join(ArchiveSink.EXTENSIONS)}")
+
+        def entries():
+            """Yields (name, bytes) for all entries"""
+            if file.endswith(".zip"):
+                from zipfile import ZipFile
+                with ZipFile(file, "r") as fid:
+                    for name in fid.namelist():
+                        if not name.endswith("/"): yield name, fid.read(name)
+            else:
+                import tarfile
+                with tarfile.open(file, "r:*") as fid:
+                    for info in fid:
+                        if info.isfile(): yield info.name, fid.extractfile(info).read()
+
+        res, dest, dirs = {"written": [], "unchanged": []}, None, set()
+        for name, content in entries():
+            if dest is None:
+                if name != ArchiveSink.METAFILE:
+                    raise Exception(f"\"{file}\" has not been created by pyp2qmd (missing {ArchiveSink.METAFILE})")
+                dest = quarto_dir if json.loads(content)["what"] == "man" else examples_dir
+                continue
+            if isabs(name) or normpath(name).startswith(".."):
+                raise Exception(f"\"{file}\" contains invalid entry \"{name}\"")
+            target = join(dest, normpath(name))
+            if not dirname(target) in dirs:
+                makedirs(dirname(target) or ".", exist_ok = True)
+                dirs.add(dirname(target))
+            changed = ManPage.write_file(target, content.decode("utf-8"))
+            res["written" if changed else "unchanged"].append(target)
+        return res
+
+
+    def __repr__(self):
+        """Standard Representation
+
+        Returns:
+            str: Standard representation of the class.
+        """
+        return f"{self.__module__} Object: \"{self._file}\""
+
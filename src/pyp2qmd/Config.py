@@ -32,7 +32,8 @@ class Config:
     def __parse_arguments(self):
 
         # Allowed action options
-        allowed_action = ["init", "document", "examples"]
+        allowed_action = ["init", "document", "examples", "watch", "render",
+                          "unpack", "extract", "render-qmd"]
 
         import argparse
         import sys
@@ -42,8 +43,13 @@ class Config:
         parser = argparse.ArgumentParser(pkg_name)
         parser.add_argument("action", nargs = 1, type = str,
                 help = f"Action to perform, one of: {', '.join(allowed_action)}")
-        parser.add_argument("-p", "--package", type = str,
-                help = "Name of the python package.")
+        parser.add_argument("-p", "--package", type = str, nargs = "+",
+                help = "Name of the python package. If multiple packages are given, all " + \
+                       "of them are documented in one run (batch mode, see --batch).")
+        parser.add_argument("--batch", type = str, default = None,
+                help = "Name of a file listing the packages to be documented (one per " + \
+                       "line; # starts a comment). Each package gets its own subfolder " + \
+                       "in man_dir and examples_dir and its own section in the sidebar.")
         parser.add_argument("--overwrite", default = False, action = "store_true",
                 help = "Only used if action = create; will overwrite _quarto.yml if needed.")
         parser.add_argument("--quarto_dir", type = str, default = "_quarto",
@@ -57,14 +63,70 @@ class Config:
                        "relative to quarto_dir. Defaults to \"_site\".")
         parser.add_argument("--docstringstyle", type = str, default = "GOOGLE",
                 help = "Docstring type (format). Defaults to \"GOOGLE\".")
+        parser.add_argument("--max_default_length", type = int, default = 100,
+                help = "Maximum length of the default values shown in the signatures; " + \
+                       "longer ones are shortened. Defaults to 100.")
         parser.add_argument("--include_hidden", default = False, action = "store_true",
                 help = "If set, hidden functions and methods will also be documented " + \
                         "(functions/methods starting with _ or __).")
+        parser.add_argument("--link_inherited", default = False, action = "store_true",
+                help = "If set, methods are only documented on the class defining them; " + \
+                       "subclasses link inherited methods to the page of the base class " + \
+                       "(if documented).")
         parser.add_argument("--examples_dir", type = str, default = "_examples",
                 help = "Name of the target directory for docstring examples (qmds). " + \
                        "Only used if action is 'examples', defaults to \"_examples\".")
         parser.add_argument("--silent", default = False, action = "store_true",
                 help = "If set, output will be suppressed.")
+        parser.add_argument("--static", default = False, action = "store_true",
+                help = "If set, the package is not imported; classes, functions, and " + \
+                       "docstrings are extracted by parsing the source files.")
+        parser.add_argument("--recursive", default = False, action = "store_true",
+                help = "If set, all submodules are walked and all classes and functions " + \
+                       "defined in the package are documented (not only the exported ones).")
+        parser.add_argument("--profile", type = str, default = None,
+                help = "Name of a JSON file; if set, timings of all phases and symbols " + \
+                       "are written to this file (profiling report).")
+        parser.add_argument("--pstats", type = str, default = None,
+                help = "Name of a file; if set (in addition to --profile), the whole run " + \
+                       "is profiled using cProfile, statistics are written to this file.")
+        parser.add_argument("--run_examples", default = False, action = "store_true",
+                help = "Only used if action is 'examples'. If set, the examples are also " + \
+                       "executed (without quarto); writes a JSON and JUnit XML report into examples_dir.")
+        parser.add_argument("--timeout", type = float, default = 60.,
+                help = "Only used with --run_examples; maximum time (seconds) per example " + \
+                       "segment, defaults to 60.")
+        parser.add_argument("--memory_limit", type = int, default = 0,
+                help = "Only used with --run_examples; maximum memory (megabytes) " + \
+                       "per example process, defaults to 0 (no limit).")
+        parser.add_argument("--no_cache", dest = "cache", default = True, action = "store_false",
+                help = "Only used with --run_examples. If set, all examples are executed; " + \
+                       "by default results of unchanged examples are taken from the cache.")
+        parser.add_argument("--cache_size", type = int, default = 16,
+                help = "Only used with --run_examples; maximum size (megabytes) of " + \
+                       "the example result cache, defaults to 16.")
+        parser.add_argument("--archive", type = str, default = None,
+                help = "Name of a zip or tar archive (.zip, .tar, .tar.gz, .tgz). If set, " + \
+                       "the pages are written into this archive instead of man_dir/examples_dir. " + \
+                       "Required if action is 'unpack' (archive to be extracted).")
+        parser.add_argument("--ir", type = str, default = None,
+                help = "Name of the intermediate representation file (JSON Lines). " + \
+                       "Required if action is 'extract' (written) or 'render-qmd' (read).")
+        parser.add_argument("--quarto", type = str, default = "quarto",
+                help = "Only used if action is 'render'; name of (or path to) the " + \
+                       "quarto executable, defaults to \"quarto\".")
+        parser.add_argument("--no_prune", dest = "prune", default = True, action = "store_false",
+                help = "If set, orphaned pages (man pages and examples of symbols which " + \
+                       "no longer exist) are kept. By default they are removed.")
+        parser.add_argument("--prune_dry_run", default = False, action = "store_true",
+                help = "If set, orphaned pages are only listed but not removed.")
+        parser.add_argument("--no_incremental", dest = "incremental",
+                default = True, action = "store_false",
+                help = "If set, all man pages are rebuilt. By default, man pages of classes " + \
+                       "and functions which did not change since the last run are skipped.")
+        parser.add_argument("-j", "--jobs", type = int, default = 1,
+                help = "Number of worker processes used to render the man pages. " + \
+                       "0 uses one process per CPU, defaults to 1 (no parallelization).")
 
         # Parsing input args
         args = parser.parse_args()
@@ -74,9 +136,17 @@ class Config:
             parser.print_help()
             sys.exit("\nUsage error: invalid \"action\" (see help).")
 
-        if args.package is None:
+        # Unpacking an archive or rendering from an IR file does not require the package
+        if args.package is None and args.action in ["unpack", "render-qmd"]:
+            args.package = ""
+        if args.package is None and args.batch is None:
             parser.print_help()
-            sys.exit("\nUsage error: argument -p/--package must be set.")
+            sys.exit("\nUsage error: argument -p/--package (or --batch) must be set.")
+        # Single package (str) unless multiple packages or a batch file are given
+        if args.package is None:
+            args.package = []
+        elif isinstance(args.package, list) and len(args.package) == 1 and args.batch is None:
+            args.package = args.package[0]
 
         ymlfile = f"{args.quarto_dir}/_quarto.yml"
         if args.action == "create" and isfile(ymlfile):
@@ -93,7 +163,12 @@ class Config:
     def setup(self, action, package,
               quarto_dir = "_quarto", man_dir = "man", output_dir = "_site",
               overwrite = False, include_hidden = False, examples_dir = "_examples",
-              docstringstyle = "GOOGLE", silent = False):
+              docstringstyle = "GOOGLE", silent = False, jobs = 1, incremental = True,
+              static = False, recursive = False, profile = None, pstats = None,
+              run_examples = False, timeout = 60, memory_limit = 0,
+              cache = True, cache_size = 16, prune = True, prune_dry_run = False,
+              quarto = "quarto", archive = None, ir = None, max_default_length = 100,
+              link_inherited = False, batch = None):
         """Config Setup
 
         `action = "init"` initializes the auto-generated documentation and will
@@ -108,10 +183,33 @@ class Config:
         output folder structure and create the required files (`_quarto.yml`,
         `pyp.sass`) similar to the init action.
 
+        `action = "watch"` documents the package like `"document"` and
+        then watches the source files of the package; man pages of objects
+        defined in modified modules are re-rendered on the fly (see
+        :py:class:`Watcher <pyp2qmd.Watcher.Watcher>`).
+
+        `action = "unpack"` extracts an archive (see `archive`) into
+        `quarto_dir` (man pages) or `examples_dir` (examples); only files which
+        differ are written (see :py:meth:`ArchiveSink.extract <pyp2qmd.ArchiveSink.ArchiveSink.extract>`).
+        The package is not required (can be an empty string).
+
+        `action = "extract"` extracts all symbols of the package into an
+        intermediate representation (see `ir`), `action = "render-qmd"` renders
+        the man pages from this file without importing the package (the
+        package is not required; see :py:class:`IRFile <pyp2qmd.IRFile.IRFile>`).
+
+        `action = "render"` documents the package like `"document"` and then
+        calls quarto to render the pages which have been modified (see
+        :py:meth:`DocConverter.render <pyp2qmd.DocConverter.DocConverter.render>`).
+
         Args:
-            action (str): Action to be executed. One of `"init"` or `"document"`,
+            action (str): Action to be executed. One of `"init"`, `"document"`,
+                `"examples"`, `"watch"`, `"render"`, `"unpack"`, `"extract"`,
+                or `"render-qmd"`,
                 see method description.
-            package (str): Name of the package which should be documented.
+            package (str, list): Name of the package which should be documented.
+                If a list of names is given, all packages are documented in one run
+                (batch mode; see `batch`).
             quarto_dir (str): Output directory, defaults to `"_quarto"`.
             man_dir (str): Name of the directory for the manual pages (subfolder
                 inside `quarto_dir`), defaults to `"man"`.
@@ -127,14 +225,97 @@ class Config:
             docstringstyle (str): Style of the docstrings in the package, must be one
                 of the allowed types of the `docstring_parser` package
                 (AUTO, EPYDOC, GOOGLE, NUMPYDOC, REST), defaults to `"GOOGLE"`;
-                not case sensitive.
+                not case sensitive. If `"AUTO"` the style is detected per docstring (see
+                :py:class:`StyleDetector <pyp2qmd.StyleDetector.StyleDetector>`).
             silent (bool): If `False` (default) some output will be produced
                 when rendering the man pages. Can be specified to silence the
                 execution.
+            jobs (int): Number of worker processes used to extract and render
+                the man pages. Defaults to `1` (sequential, no worker processes);
+                `0` uses one process per CPU. The order of the results (and thus
+                the sidebar in `_quarto.yml`) does not depend on `jobs`.
+            incremental (bool): If `True` (default) a manifest is kept in `man_dir`
+                and man pages of classes, functions, and methods which did not change
+                since the last run are neither parsed nor rendered again (see
+                :py:class:`Manifest <pyp2qmd.Manifest.Manifest>`). If `False`, all
+                man pages are rebuilt.
+            static (bool): If `False` (default) the package is imported to extract
+                the classes and functions. If `True` the package is not imported;
+                classes, functions, methods, signatures, and docstrings are extracted
+                by parsing the source files (see
+                :py:class:`StaticPackage <pyp2qmd.StaticPackage.StaticPackage>`).
+            recursive (bool): If `False` (default) only the classes and functions
+                exported by the package are documented. If `True` all submodules
+                are walked and all classes and functions defined in the package
+                are documented (once, even if reachable under several names; see
+                :py:class:`SymbolIndex <pyp2qmd.SymbolIndex.SymbolIndex>`).
+            profile (None, str): If `None` (default) no profiling is done. Else
+                the name of a JSON file to which the profiling report (timings of the
+                phases, timings per symbol, pages written and unchanged) is written
+                (see :py:class:`Profiler <pyp2qmd.Profiler.Profiler>`).
+            pstats (None, str): Only used if `profile` is set. If not `None`
+                (default) the run is also profiled using `cProfile`, the statistics
+                are written to this file (can be read using `pstats`).
+            run_examples (bool): Only used by
+                :py:meth:`DocConverter.examples <pyp2qmd.DocConverter.DocConverter.examples>`.
+                If `True` the examples are also executed (see
+                :py:class:`ExampleRunner <pyp2qmd.ExampleRunner.ExampleRunner>`),
+                defaults to `False`.
+            timeout (int, float): Maximum time (seconds) per example segment if
+                `run_examples = True`, defaults to `60`.
+            memory_limit (int): Maximum memory (megabytes) of the processes executing
+                the examples if `run_examples = True`, defaults to `0` (no limit).
+            cache (bool): Only used if `run_examples = True`. If `True` (default)
+                the results of the examples are cached across runs (see
+                :py:class:`ExampleCache <pyp2qmd.ExampleCache.ExampleCache>`),
+                only new or modified examples are executed.
+            cache_size (int): Maximum size (megabytes) of the example result
+                cache, defaults to `16`.
+            prune (bool): If `True` (default), orphaned pages in `man_dir` and
+                `examples_dir` (and their quarto freeze entries) are removed, see
+                :py:meth:`DocConverter.prune <pyp2qmd.DocConverter.DocConverter.prune>`.
+            prune_dry_run (bool): If `True`, orphaned pages are only listed but
+                not removed, defaults to `False`.
+            quarto (str): Name of (or path to) the quarto executable used
+                if `action = "render"`, defaults to `"quarto"`.
+            archive (None, str): If set, the man pages (or examples) are written
+                into this zip or tar archive (`.zip`, `.tar`, `.tar.gz`, `.tgz`)
+                instead of `man_dir` (or `examples_dir`), see
+                :py:class:`ArchiveSink <pyp2qmd.ArchiveSink.ArchiveSink>`. Incremental
+                builds and pruning are disabled. Required if `action = "unpack"`.
+            ir (None, str): Name of the intermediate representation file (JSON Lines),
+                required if `action` is `"extract"` or `"render-qmd"`.
+            max_default_length (int): Maximum length of the representation of
+                default values in the signatures (longer ones are shortened using
+                `reprlib`; large containers are not converted in full), defaults to `100`.
+            link_inherited (bool): If `False` (default) each class documents all its
+                methods including inherited ones (one man page per class and method).
+                If `True`, methods inherited from a documented base class are
+                only listed in the methods table of the subclass, linked to the man
+                page of the method on the base class (see
+                :py:class:`CrossReferences <pyp2qmd.CrossReferences.CrossReferences>`).
+            batch (None, str): Name of a file listing packages to be documented
+                (one per line, `#` starts a comment), in addition to `package`.
+                In batch mode (`batch` set or `package` is a list) all packages are
+                documented in one run sharing imports, the docstring cache, and the
+                worker processes (see :py:class:`DocConverter <pyp2qmd.DocConverter.DocConverter>`).
+                Each package gets its own subfolder in `man_dir` and `examples_dir` (see
+                :py:meth:`package_config`) and its own section in the sidebar; `_quarto.yml`
+                is written once. Not supported for the actions `"watch"`, `"unpack"`,
+                `"extract"`, and `"render-qmd"`, nor with `archive`.
 
         Raises:
             TypeError: If the inputs are not of the expected type.
             ValueError: If `action` is not one of the allowed ones.
+            ValueError: If `jobs` is negative.
+            ValueError: If `timeout` is not positive or `memory_limit` is negative.
+            ValueError: If `cache_size` is negative.
+            ValueError: If `archive` has an unsupported file extension or is
+                missing when `action = "unpack"`.
+            ValueError: If `ir` is missing when `action` is `"extract"` or `"render-qmd"`.
+            ValueError: If `max_default_length` is smaller than `10`.
+            ValueError: If no package is given in batch mode, or batch mode is
+                used with an action or option not supporting it.
         """
 
         # Store input arguments as object attributes
@@ -145,14 +326,22 @@ class Config:
         # --------------------------------------------
         # Now checking validity of all required args
         # --------------------------------------------
-        action_allowed = ["init", "document", "examples"]
+        action_allowed = ["init", "document", "examples", "watch", "render",
+                          "unpack", "extract", "render-qmd"]
         if not isinstance(self.get("action"), str):
             raise TypeError("argument `action` must be str")
         elif not self.get("action") in action_allowed:
             raise ValueError(f"action must be one of: {', '.join(action_allowed)}")
 
-        if not isinstance(self.get("package"), str):
-            raise TypeError("argument `package` must be str")
+        if isinstance(self.get("package"), list):
+            if not all(isinstance(x, str) and len(x) > 0 for x in self.get("package")):
+                raise TypeError("argument `package` must be str or list of (non-empty) str")
+        elif not isinstance(self.get("package"), str):
+            raise TypeError("argument `package` must be str or list of str")
+        if not isinstance(self.get("batch"), (type(None), str)):
+            raise TypeError("argument `batch` must be None or str")
+        self._packages = self.__read_packages()
+        self._siblings = []
 
         if not isinstance(self.get("quarto_dir"), str):
             raise TypeError("argument `quarto_dir` must be str")
@@ -165,6 +354,8 @@ class Config:
             raise TypeError("argument `overwrite` must be bool")
         if not isinstance(self.get("include_hidden"), bool):
             raise TypeError("argument `include_hidden` must be bool")
+        if not isinstance(self.get("link_inherited"), bool):
+            raise TypeError("argument `link_inherited` must be bool")
 
         if not isinstance(self.get("docstringstyle"), str):
             raise TypeError("argument `docstringstyle` must be str")
@@ -172,9 +363,159 @@ class Config:
         if not isinstance(self.get("silent"), bool):
             raise TypeError("argument `silent` must be bool")
 
+        if not isinstance(self.get("max_default_length"), int) or isinstance(self.get("max_default_length"), bool):
+            raise TypeError("argument `max_default_length` must be int")
+        elif self.get("max_default_length") < 10:
+            raise ValueError("argument `max_default_length` must be 10 or larger")
+
+        if not isinstance(self.get("static"), bool):
+            raise TypeError("argument `static` must be bool")
+
+        if not isinstance(self.get("profile"), (type(None), str)):
+            raise TypeError("argument `profile` must be None or str")
+        if not isinstance(self.get("pstats"), (type(None), str)):
+            raise TypeError("argument `pstats` must be None or str")
+
+        if not isinstance(self.get("run_examples"), bool):
+            raise TypeError("argument `run_examples` must be bool")
+        if not isinstance(self.get("timeout"), (int, float)) or isinstance(self.get("timeout"), bool):
+            raise TypeError("argument `timeout` must be int or float")
+        elif not self.get("timeout") > 0:
+            raise ValueError("argument `timeout` must be positive")
+        if not isinstance(self.get("memory_limit"), int) or isinstance(self.get("memory_limit"), bool):
+            raise TypeError("argument `memory_limit` must be int")
+        elif self.get("memory_limit") < 0:
+            raise ValueError("argument `memory_limit` must not be negative")
+        if not isinstance(self.get("ir"), (type(None), str)):
+            raise TypeError("argument `ir` must be None or str")
+        elif self.get("ir") is None and self.get("action") in ["extract", "render-qmd"]:
+            raise ValueError(f"argument `ir` must be set if `action = \"{self.get('action')}\"`")
+
+        if not isinstance(self.get("quarto"), str):
+            raise TypeError("argument `quarto` must be str")
+
+        if not isinstance(self.get("archive"), (type(None), str)):
+            raise TypeError("argument `archive` must be None or str")
+        elif self.get("archive") is None and self.get("action") == "unpack":
+            raise ValueError("argument `archive` must be set if `action = \"unpack\"`")
+        elif self.get("archive") is not None:
+            from .ArchiveSink import ArchiveSink
+            if not ArchiveSink.supported(self.get("archive")):
+                raise ValueError("argument `archive` must end in one of " + \
+                                 ", ".join(ArchiveSink.EXTENSIONS))
+
+        if self.is_batch():
+            if len(self._packages) == 0:
+                raise ValueError("no package to be documented (see `package` and `batch`)")
+            if self.get("action") in ["watch", "unpack", "extract", "render-qmd"]:
+                raise ValueError(f"action \"{self.get('action')}\" does not support multiple packages")
+            if self.get("archive") is not None:
+                raise ValueError("argument `archive` does not support multiple packages")
+
+        if not isinstance(self.get("prune"), bool):
+            raise TypeError("argument `prune` must be bool")
+        if not isinstance(self.get("prune_dry_run"), bool):
+            raise TypeError("argument `prune_dry_run` must be bool")
+
+        if not isinstance(self.get("cache"), bool):
+            raise TypeError("argument `cache` must be bool")
+        if not isinstance(self.get("cache_size"), int) or isinstance(self.get("cache_size"), bool):
+            raise TypeError("argument `cache_size` must be int")
+        elif self.get("cache_size") < 0:
+            raise ValueError("argument `cache_size` must not be negative")
+
+        if not isinstance(self.get("recursive"), bool):
+            raise TypeError("argument `recursive` must be bool")
+
+        if not isinstance(self.get("incremental"), bool):
+            raise TypeError("argument `incremental` must be bool")
+
+        if not isinstance(self.get("jobs"), int) or isinstance(self.get("jobs"), bool):
+            raise TypeError("argument `jobs` must be int")
+        elif self.get("jobs") < 0:
+            raise ValueError("argument `jobs` must be 0 or positive")
+
         self._is_set_up = True
 
 
+    def __read_packages(self):
+        """List of packages from `package` and the `batch` file (unique, in order)"""
+        res = list(self.get("package")) if isinstance(self.get("package"), list) else \
+              [self.get("package")] if self.get("package") else []
+        if self.get("batch") is not None:
+            try:
+                with open(self.get("batch"), "r") as fid:
+                    for line in fid:
+                        line = line.split("#", 1)[0].strip()
+                        if line: res.append(line)
+            except Exception as e:
+                raise Exception(f"cannot read batch file \"{self.get('batch')}\": {e}")
+        return list(dict.fromkeys(res))
+
+
+    def is_batch(self):
+        """Batch Mode?
+
+        Returns:
+            bool: `True` if multiple packages are documented in one run
+            (`package` is a list or `batch` is set), else `False`.
+        """
+        return isinstance(self.get("package"), list) or self.get("batch") is not None
+
+
+    def packages(self):
+        """Packages
+
+        Returns:
+            list: Names of all packages to be documented (one element
+            unless in batch mode, see :py:meth:`is_batch`).
+        """
+        return list(self._packages)
+
+
+    def siblings(self):
+        """Other Packages of the Batch
+
+        Returns:
+            list: Names of the other packages documented in the same batch
+            if this config has been created by :py:meth:`package_config`,
+            else an empty list.
+        """
+        return list(self._siblings)
+
+
+    def package_config(self, package):
+        """Config of a Package (Batch Mode)
+
+        Config used to document one package of a batch: same settings,
+        but `man_dir` and `examples_dir` are subfolders named after the
+        package. Profiling is done by the batch itself. The other packages
+        of the batch are known to the new config (see :py:meth:`siblings`).
+
+        Args:
+            package (str): Name of the package, one of :py:meth:`packages`.
+
+        Returns:
+            Config: New object of class `Config` (set up).
+
+        Raises:
+            ValueError: If `package` is not one of the packages of this config.
+        """
+        from inspect import signature
+        from os.path import join
+
+        if not package in self._packages:
+            raise ValueError(f"package \"{package}\" is not one of {', '.join(self._packages)}")
+        args = dict((k, self.get(k)) for k in signature(self.setup).parameters)
+        args.update(package = package, batch = None, profile = None, pstats = None,
+                    man_dir = f"{self.get('man_dir')}/{package}",
+                    examples_dir = join(self.get("examples_dir"), package))
+        res = Config()
+        res.setup(**args)
+        res._siblings = [x for x in self._packages if x != package]
+        return res
+
+
     def get(self, what):
         """Get Attribute
 
@@ -218,14 +559,29 @@ class Config:
         else:
             res  = f"{self.__module__} Object:\n"
             res += f"    Action:            {self.get('action')}\n"
-            res += f"    Package:           {self.get('package')}\n"
+            res += f"    Package:           {', '.join(self.packages())}" + \
+                   (" (batch)\n" if self.is_batch() else "\n")
             res += f"    Quarto dir:        {self.get('quarto_dir')}\n"
             res += f"    Man page dir:      {self.get('man_dir')}\n"
             res += f"    Output dir:        {self.get('output_dir')}\n"
+            res += f"    Quarto:            {self.get('quarto')}\n"
+            res += f"    Archive:           {self.get('archive')}\n"
+            res += f"    IR file:           {self.get('ir')}\n"
             res += f"    Overwrite:         {self.get('overwrite')}\n"
             res += f"    Examples dir:      {self.get('examples_dir')}\n"
             res += f"    Include hidden:    {self.get('include_hidden')}\n"
+            res += f"    Link inherited:    {self.get('link_inherited')}\n"
             res += f"    Docstring style:   {self.get('docstringstyle')}\n"
+            res += f"    Max default len:   {self.get('max_default_length')}\n"
+            res += f"    Jobs:              {self.get('jobs')}\n"
+            res += f"    Incremental:       {self.get('incremental')}\n"
+            res += f"    Prune:             {self.get('prune')}" + \
+                   (" (dry run)\n" if self.get("prune_dry_run") else "\n")
+            res += f"    Static:            {self.get('static')}\n"
+            res += f"    Recursive:         {self.get('recursive')}\n"
+            res += f"    Profile:           {self.get('profile')}\n"
+            res += f"    Run examples:      {self.get('run_examples')}\n"
+            res += f"    Example cache:     {self.get('cache')}\n"
             return res
 
 
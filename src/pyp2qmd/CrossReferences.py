@@ -0,0 +1,276 @@
+
+
+class CrossReferences:
+    """Cross-Reference Resolver
+
+    Converts sphinx-style cross-references in docstrings
+    (py:func, py:class, and py:meth roles; see README) into links to the
+    corresponding man pages. The table of all man pages (functions, classes,
+    and methods) is built once per run from the
+    :py:class:`SymbolIndex <pyp2qmd.SymbolIndex.SymbolIndex>` such that each
+    reference can be checked; references which cannot be resolved are not
+    linked (rendered as inline code) but collected, see :py:meth:`unresolved`.
+
+    Short references (e.g., the name of a method) are resolved relative to the
+    class (methods) or module (functions, classes) of the page they appear
+    on; if that fails, a unique match of the trailing part of a fully qualified
+    name is used (e.g., `Config` for `pyp2qmd.Config.Config`).
+    Results are memoised per module (and class, for texts with method
+    references), texts appearing on several pages (e.g., the short
+    description of a method) are only resolved once per context; the memo
+    keeps the most recent `memo_size` texts.
+
+    Symbols excluded from the index as they are documented by another
+    package of a batch (see
+    :py:meth:`SymbolIndex.excluded <pyp2qmd.SymbolIndex.SymbolIndex.excluded>`)
+    are linked to the pages of that package (`../<package>/<page>.qmd`).
+
+    Args:
+        index (None, SymbolIndex): Object of class
+            :py:class:`SymbolIndex <pyp2qmd.SymbolIndex.SymbolIndex>`. If `None`,
+            references are linked without being checked.
+        include_hidden (bool): Whether or not hidden methods get their own
+            man pages (see :py:class:`Config <pyp2qmd.Config.Config>`),
+            defaults to `False`.
+        pages (None, list): Full names of all man pages; used instead of
+            `index` if set (e.g., when rendering from an
+            :py:class:`IRFile <pyp2qmd.IRFile.IRFile>`).
+        link_inherited (bool): If `True`, methods inherited from a documented
+            base class have no page of their own; references to them
+            are linked to the page of the method on the base class (see
+            :py:meth:`page`), defaults to `False`.
+        aliases (None, dict): Only used with `pages`; names of inherited methods
+            (keys) and the pages documenting them (see `link_inherited`).
+
+    Return:
+        Initializes a new object of class `CrossReferences`.
+
+    Raises:
+        TypeError: If `index` is not None or of class `SymbolIndex`.
+        TypeError: If `include_hidden` is not bool.
+        TypeError: If `pages` is not None or list.
+        TypeError: If `link_inherited` is not bool.
+        TypeError: If `aliases` is not None or dict.
+    """
+
+    # Maximum number of memoised texts (oldest dropped first)
+    memo_size = 4096
+
+    def __init__(self, index = None, include_hidden = False, pages = None, link_inherited = False,
+                 aliases = None):
+        import re
+        from .SymbolIndex import SymbolIndex
+
+        if not isinstance(index, (type(None), SymbolIndex)):
+            raise TypeError("argument `index` must be None or of class `SymbolIndex`")
+        if not isinstance(include_hidden, bool):
+            raise TypeError("argument `include_hidden` must be bool")
+        if not isinstance(pages, (type(None), list)):
+            raise TypeError("argument `pages` must be None or list")
+        if not isinstance(link_inherited, bool):
+            raise TypeError("argument `link_inherited` must be bool")
+        if not isinstance(aliases, (type(None), dict)):
+            raise TypeError("argument `aliases` must be None or dict")
+
+        self._role   = re.compile(r":py:(func|class|meth|method):`([^`]*)`")
+        self._target = re.compile(r"^(.*?)\s*<(.*?)>$")
+        self._word   = re.compile(r"^\w+$")
+
+        self._memo       = dict()
+        self._digest     = None
+        self._pending    = []
+        self._unresolved = dict()
+        self._aliases    = dict()
+        if pages is not None:
+            self._pages   = set(pages) | set(aliases or [])
+            self._aliases = dict() if aliases is None else aliases
+        elif index is not None:
+            self._pages, self._aliases = self._build(index, include_hidden, link_inherited)
+        else:
+            self._pages = None
+
+        # Pages by trailing part of the name (e.g. "Config.setup") for short references,
+        # pages with members (classes) for method references
+        self._suffixes = dict()
+        self._classes  = set()
+        for page in (self._pages or []):
+            parts = page.split(".")
+            self._classes.add(".".join(parts[:-1]))
+            for i in range(1, len(parts)):
+                self._suffixes.setdefault(".".join(parts[i:]), []).append(page)
+
+
+    @staticmethod
+    def _build(index, include_hidden, link_inherited = False):
+        """Full names of all man pages (as used by ManPage.fullname), and
+        aliases (inherited methods, name on the subclass: page on the base class)"""
+        from .ManPage import ManPage
+
+        res, classes, aliases = set(), dict(), dict()
+        # Symbols documented by another package of the batch (man_dir/<package>)
+        entries  = [(index.entry(x), False) for x in index] + \
+                   [(x, True) for x in index.excluded().values()]
+        external = dict()
+        for entry, foreign in entries:
+            module = entry["module"] or ""
+            name   = entry["name"]
+            page   = name if name.startswith(module) else f"{module}.{name}"
+            res.add(page)
+            if entry["kind"] == "class": classes[entry["obj"]] = page
+            if foreign: external[page] = module.split(".")[0]
+
+        for cls, page in classes.items():
+            for mname, _ in ManPage.list_members(cls, include_hidden):
+                res.add(f"{page}.{mname}")
+                if page in external: external[f"{page}.{mname}"] = external[page]
+                if not link_inherited: continue
+                # Defined on a documented base class?
+                owner = next((x for x in cls.__mro__ if mname in x.__dict__), cls)
+                if owner is not cls and owner in classes:
+                    aliases[f"{page}.{mname}"] = f"{classes[owner]}.{mname}"
+
+        # Pages of the other package
+        for name in set(external) | set(aliases):
+            target = aliases.get(name, name)
+            if target in external: aliases[name] = f"../{external[target]}/{target}"
+        return res, aliases
+
+
+    def page(self, name):
+        """Page Documenting a Symbol
+
+        Args:
+            name (str): Full name of a function, class, or method (e.g., a
+                method as member of a class).
+
+        Returns:
+            str: Full name of the man page documenting `name`; differs from
+            `name` for inherited methods if `link_inherited = True`.
+        """
+        return self._aliases.get(name, name)
+
+
+    def digest(self):
+        """Digest of the Link Targets
+
+        Changes whenever a man page (link target) is added or removed, or
+        an inherited method is linked to a different page (see `link_inherited`).
+        Used by :py:class:`Manifest <pyp2qmd.Manifest.Manifest>` to rebuild
+        pages with references if the targets changed.
+
+        Returns:
+            str: Hex digest (sha1) of all pages and aliases; empty string if
+            references are not checked (no `index` or `pages`).
+        """
+        from hashlib import sha1
+        if self._pages is None: return ""
+        if self._digest is None:
+            h = sha1()
+            for page in sorted(self._pages): h.update(f"{page}\0".encode())
+            for k in sorted(self._aliases): h.update(f"{k}\0{self._aliases[k]}\0".encode())
+            self._digest = h.hexdigest()
+        return self._digest
+
+
+    def resolve(self, x, page, module):
+        """Resolve References
+
+        Args:
+            x (None, str): Text (e.g., description) containing references.
+            page (str): Full name of the page the text appears on
+                (:py:meth:`ManPage.fullname <pyp2qmd.ManPage.ManPage.fullname>`).
+            module (str): Module of the object documented on the page.
+
+        Returns:
+            None or str: `None` if `x` is `None`, else `x` with all references
+            replaced by markdown links.
+        """
+        if x is None or not ":py:" in x: return x
+
+        # Method references are resolved relative to the class (class pages)
+        # or the parent class (method pages); the page itself does not matter
+        cls = None
+        if ":py:meth" in x:
+            cls = page if page in self._classes else page.rsplit(".", 1)[0]
+        key = (x, module, cls)
+        if not key in self._memo:
+            missing = []
+            res = self._role.sub(lambda m: self._link(m.group(1), m.group(2), cls, module, missing), x)
+            if len(self._memo) >= self.memo_size: del self._memo[next(iter(self._memo))]
+            self._memo[key] = (res, missing)
+        res, missing = self._memo[key]
+        self._pending += [(ref, page) for ref in missing]
+        return res
+
+
+    def _link(self, role, ref, cls, module, missing):
+        tmp = self._target.match(ref)
+        text, target = (tmp.group(1), tmp.group(2)) if tmp else (ref, ref)
+
+        # Candidates, the first existing one is used
+        candidates = []
+        if self._word.match(target):
+            if role in ["meth", "method"]:
+                # Methods relative to the class (see resolve), else to its parent
+                candidates.append(f"{cls}.{target}")
+                if cls in self._classes: candidates.append(f"{cls.rsplit('.', 1)[0]}.{target}")
+            else:
+                candidates.append(f"{module}.{target}")
+        candidates.append(target)
+
+        if self._pages is None:
+            return f"[{text}]({candidates[0]}.qmd)"
+        for c in candidates:
+            if c in self._pages: return f"[{text}]({self.page(c)}.qmd)"
+
+        # Unique trailing match (inherited methods: unique page)
+        matches = set(self.page(x) for x in self._suffixes.get(target, []))
+        if len(matches) == 1: return f"[{text}]({matches.pop()}.qmd)"
+
+        missing.append(target)
+        return f"`{text}`"
+
+
+    def pop_unresolved(self):
+        """Get New Unresolved References
+
+        Returns:
+            list: List of tuples `(reference, page)` of all references
+            which could not be resolved since the last call.
+        """
+        res, self._pending = self._pending, []
+        return res
+
+
+    def add_unresolved(self, x):
+        """Add Unresolved References
+
+        Adds unresolved references to the summary (see :py:meth:`unresolved`);
+        used to merge the references collected in worker processes.
+
+        Args:
+            x (list): List of tuples `(reference, page)`, see :py:meth:`pop_unresolved`.
+        """
+        for ref, page in x:
+            self._unresolved.setdefault(ref, set()).add(page)
+
+
+    def unresolved(self):
+        """Unresolved References
+
+        Returns:
+            dict: Dictionary with all references which could not be resolved
+            (keys; sorted) and a sorted list of the pages they appear on.
+        """
+        return dict((k, sorted(self._unresolved[k])) for k in sorted(self._unresolved))
+
+
+    def __repr__(self):
+        """Standard Representation
+
+        Returns:
+            str: Standard representation of the class.
+        """
+        n = "unchecked" if self._pages is None else f"{len(self._pages)} pages"
+        return f"{self.__module__} Object: {n}, {len(self._unresolved)} unresolved references"
+
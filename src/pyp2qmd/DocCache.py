@@ -0,0 +1,127 @@
+
+
+class DocCache:
+    """Docstring Cache
+
+    Run-scoped cache for the parsed docstrings, signatures, and formatted
+    signatures used by :py:class:`ManPage <pyp2qmd.ManPage.ManPage>`.
+    Methods of classes are rendered multiple times (in the methods table of
+    the class man page, on their own man page, and when extracting examples);
+    the cache ensures that each docstring is only parsed once per run.
+
+    Entries are identified by the identity of the object, the docstring style,
+    and the hash of the docstring. The cache is bounded; if more than `maxsize`
+    entries are stored, the least recently used entry is dropped.
+
+    Args:
+        maxsize (int): Maximum number of entries, defaults to `4096`.
+
+    Return:
+        Initializes a new object of class `DocCache`.
+
+    Raises:
+        TypeError: If `maxsize` is not int.
+        ValueError: If `maxsize` is not positive.
+    """
+
+    def __init__(self, maxsize = 4096):
+        from collections import OrderedDict
+
+        if not isinstance(maxsize, int) or isinstance(maxsize, bool):
+            raise TypeError("argument `maxsize` must be int")
+        elif maxsize < 1:
+            raise ValueError("argument `maxsize` must be positive")
+
+        self._maxsize = maxsize
+        self._entries = OrderedDict()
+        self._hits    = 0
+        self._misses  = 0
+
+
+    def _key(self, obj, style, docstring):
+        return (id(obj), str(style), hash(docstring))
+
+
+    def get(self, obj, style, docstring):
+        """Get Cached Entry
+
+        Args:
+            obj (function or class): The object documented.
+            style: Docstring style used to parse the docstring.
+            docstring (str, None): The (cleaned) docstring of `obj`.
+
+        Returns:
+            None or dict: `None` if not cached, else a dictionary with the
+            elements `"extracted"` (parsed docstring, signature, module),
+            `"signatures"` (dictionary of formatted signatures), and
+            `"parameters"` (formatted parameters; once formatted).
+        """
+        key   = self._key(obj, style, docstring)
+        entry = self._entries.get(key)
+        # Identity check guards against reused ids of garbage collected objects
+        if entry is None or entry["obj"] is not obj:
+            self._misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self._hits += 1
+        return entry
+
+
+    def add(self, obj, style, docstring, extracted):
+        """Add Entry
+
+        Args:
+            obj (function or class): The object documented.
+            style: Docstring style used to parse the docstring.
+            docstring (str, None): The (cleaned) docstring of `obj`.
+            extracted (list): Parsed docstring, signature, and module name.
+
+        Returns:
+            dict: The new entry (see :py:meth:`get`).
+        """
+        entry = {"obj": obj, "extracted": extracted, "signatures": dict()}
+        self._entries[self._key(obj, style, docstring)] = entry
+        if len(self._entries) > self._maxsize:
+            self._entries.popitem(last = False)
+        return entry
+
+
+    def add_stats(self, hits, misses):
+        """Add Hits and Misses
+
+        Used to merge the counters of caches used in worker processes.
+
+        Args:
+            hits (int): Number of hits to be added.
+            misses (int): Number of misses to be added.
+        """
+        self._hits   += hits
+        self._misses += misses
+
+
+    def stats(self):
+        """Cache Statistics
+
+        Returns:
+            dict: Dictionary with the number of `hits`, `misses`, as well as
+            the current `size` and `maxsize` of the cache.
+        """
+        return {"hits": self._hits, "misses": self._misses,
+                "size": len(self._entries), "maxsize": self._maxsize}
+
+
+    def __len__(self):
+        return len(self._entries)
+
+
+    def __repr__(self):
+        """Standard Representation
+
+        Returns:
+            str: Standard representation of the class.
+        """
+        s = self.stats()
+        return f"{self.__module__} Object: {s['size']}/{s['maxsize']} entries, " + \
+               f"{s['hits']} hits, {s['misses']} misses"
+
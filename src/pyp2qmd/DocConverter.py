@@ -4,6 +4,165 @@
 # -------------------------------------------------
 
 
+# Config, symbol index, and docstring cache used by _render_task; set by
+# _init_worker once per worker process (or in the main process when
+# running serially).
+_worker = dict()
+
+def _load_package(config, jobs = 1):
+    """Import the package, or extract it from its sources if `static = True`
+
+    Returns a tuple with the package and the StaticPackage object (`None`
+    if the package has been imported).
+    """
+    if config.get("static"):
+        from .StaticPackage import StaticPackage
+        static = StaticPackage(config.get("package"), jobs)
+        return static.module(), static
+    from importlib import import_module
+    return import_module(config.get("package")), None
+
+def _build_index(config, pkg, static = None):
+    """Set up the SymbolIndex (see `recursive` in Config)"""
+    from .SymbolIndex import SymbolIndex
+    modules = None
+    if config.get("recursive") and static is not None:
+        hidden  = config.get("include_hidden")
+        modules = [static.module(x) for x in static.modules() if hidden or \
+                   not any(y.startswith("_") for y in x.split(".")[1:])]
+    return SymbolIndex(pkg, config.get("recursive"), config.get("include_hidden"), modules,
+                       exclude = config.siblings())
+
+def _init_worker(config, cache = None, index = None, refs = None, detector = None):
+    from .DocCache import DocCache
+    from .CrossReferences import CrossReferences
+    from .Profiler import Profiler, active
+    # Worker processes collect timings and send them back with the results
+    if config.get("profile") is not None and active() is None:
+        Profiler().activate()
+    # Batch mode: the packages are set up when needed (see _select_package)
+    if config.is_batch():
+        _worker["batch"]    = config
+        _worker["cache"]    = DocCache() if cache is None else cache
+        _worker["packages"] = dict()
+        return
+    _worker["config"] = config
+    _worker["index"]  = _build_index(config, *_load_package(config)) if index is None else index
+    _worker["cache"]  = DocCache() if cache is None else cache
+    _worker["refs"]   = CrossReferences(_worker["index"], config.get("include_hidden"),
+                                          link_inherited = config.get("link_inherited")) \
+                        if refs is None else refs
+    # Docstring style detection if `docstringstyle = "AUTO"` (see StyleDetector)
+    if detector is None and config.get("docstringstyle").upper() == "AUTO":
+        from .StyleDetector import StyleDetector
+        detector = StyleDetector()
+        detector.learn(_worker["index"])
+    _worker["detector"] = detector
+
+def _select_package(package):
+    """Batch mode: set up `package` (once per process) and make it the current one"""
+    if _worker.get("package") == package: return
+    if not package in _worker["packages"]:
+        _init_worker(_worker["batch"].package_config(package), _worker["cache"])
+        _worker["packages"][package] = dict((k, _worker[k]) for k in ["config", "index", "refs", "detector"])
+    _worker.update(_worker["packages"][package])
+    _worker["package"] = package
+
+def _render_package_task(item):
+    """Batch mode: `_render_task` for a tuple `(package, task)` (shared worker processes)"""
+    _select_package(item[0])
+    return _render_task(item[1])
+
+def _task_object(index, task):
+    """Get the function, class, or method a task refers to"""
+    what, kind, name, cls, parent = task
+    if kind == "method":
+        return getattr(index.get(cls), name.split(".")[-1])
+    return index.get(name)
+
+def _task_page(task):
+    """Create the ManPage of a task (see `_render_task`); returns `(man, members)`"""
+    from .ManPage import ManPage
+    from .Profiler import phase
+    from re import sub
+
+    what, kind, name, cls, parent = task
+    config, index = _worker["config"], _worker["index"]
+
+    if kind != "method": name = index.entry(name)["name"]
+    with phase("extract"):
+        man = ManPage(name, _task_object(index, task), config, parent = parent,
+                      cache = _worker["cache"], refs = _worker["refs"], detector = _worker["detector"])
+
+    members = []
+    if kind == "class":
+        # Convert package.module.class into package.module
+        mparent = sub(r"\.[^.]*$", "", man.fullname())
+        for mname, meth in man.getmembers():
+            if not config.get("include_hidden") and meth.__name__.startswith("_"):
+                continue
+            # Inherited methods documented on the base class (see `link_inherited`)
+            if not mname.startswith(f"{man.fullname()}."):
+                continue
+            members.append((mname, mparent))
+    return man, members
+
+def _render_task(task):
+    """Render Page (Worker)
+
+    Extracts and renders one man page (or examples page) such that this
+    can be done in a separate process (see `jobs` in
+    :py:class:`Config <pyp2qmd.Config.Config>`).
+
+    Args:
+        task (tuple): Tuple `(what, kind, name, cls, parent)`. `what` is
+            either `"man"` or `"examples"`, `kind` one of `"function"`, `"class"`,
+            or `"method"`. For methods, `cls` is the name of the exported class
+            and `parent` the module of that class.
+
+    Returns:
+        tuple: Tuple with four elements, the file to be written (`None` if
+        there is nothing to write), the content, a list of `(name, parent)`
+        tuples of all the members to be documented (classes only), and a dict
+        with statistics of this task: the number of docstring cache `hits` and
+        `misses`, the cross-references which could not be resolved (`unresolved`),
+        the time used (`seconds`), and the timings of the phases (`phases`;
+        only if profiling, see :py:class:`Profiler <pyp2qmd.Profiler.Profiler>`).
+        If examples are executed, `examples` contains the code segments. If
+        `docstringstyle = "AUTO"`, `styles` contains the number of docstrings parsed
+        per module and style (see :py:class:`StyleDetector <pyp2qmd.StyleDetector.StyleDetector>`).
+    """
+    from .Profiler import phase, active
+    from time import perf_counter
+
+    start = perf_counter()
+
+    what = task[0]
+    config, cache, refs = _worker["config"], _worker["cache"], _worker["refs"]
+    stats = cache.stats()
+
+    man, members = _task_page(task)
+
+    with phase("render"):
+        if what == "examples":
+            if not man.get("examples"):
+                file, content = None, None
+            else:
+                file, content = man.examplesfile(), "".join(man.render_examples([]) + ["\n"])
+        else:
+            file, content = man.qmdfile(), "".join(man.render([]) + ["\n"])
+
+    stats = {"hits": cache.stats()["hits"] - stats["hits"], "misses": cache.stats()["misses"] - stats["misses"],
+             "unresolved": refs.pop_unresolved(), "seconds": perf_counter() - start,
+             "phases": active().pop() if active() is not None else dict()}
+    # Code of the examples to be executed (see ExampleRunner)
+    if what == "examples" and file is not None and config.get("run_examples"):
+        stats["examples"] = man.example_segments()
+    if _worker["detector"] is not None:
+        stats["styles"] = _worker["detector"].pop()
+    return file, content, members, stats
+
+
 class DocConverter:
     """Documentation Converter
 
@@ -16,15 +175,26 @@ class DocConverter:
     arguments/settings to perform this task and is, thus, the only reqired
     input argument.
 
+    If multiple packages are given (batch mode, see `batch` in
+    :py:class:`Config <pyp2qmd.Config.Config>`), one `DocConverter` is set up
+    per package (see :py:meth:`packages`) sharing the docstring cache and
+    the worker processes; :py:meth:`document` and :py:meth:`examples` process
+    all packages in one run, :py:meth:`update_quarto_yml` adds one sidebar
+    section per package.
+
     Args:
         config (Config): See :py:class:`Config <pyp2qmd.Config.Config>` for details; must be
             set up properly.
+        filesystem (bool): If `True` (default) the quarto project is initialized
+            (`action = "init"`) or checked. If `False` the filesystem is not
+            touched, e.g., to get the pages in memory via :py:meth:`iter_pages`.
 
     Return:
         Initializes a new object of class `DocConverter`.
 
     Raises:
         TypeError: If `config` is not of class :py:class:`Config <pyp2qmd.Config.Config>`.
+        TypeError: If `filesystem` is not bool.
         Exception: If `config` object is not set up properly.
         Exception: If the package which should be documented is not found (can't
             be imported).
@@ -39,32 +209,133 @@ class DocConverter:
     # Created man pages will be stored here, used to populate _quarto.yml if needed
     _man_created = {"class": dict(), "function": dict(), "method": dict()}
 
-    def __init__(self, config):
+    # Process pool (rendering) and FileWriter (writing) if `jobs` is not 1
+    _pool    = None
+    _writers = None
+
+    # True if the process pool is shared by a batch (tasks tagged with the package)
+    _pool_shared = False
+
+    # Batch mode: one DocConverter per package, see packages()
+    _packages = None
+
+    # Manifest used by document() for incremental builds
+    _manifest = None
+
+    # Set of module names if document() is restricted to these modules
+    _modules = None
+
+    # StaticPackage used to extract the package if `static = True`
+    _static = None
+
+    # SymbolIndex of all classes and functions, see symbols()
+    _index = None
+
+    # CrossReferences resolver, see references()
+    _refs = None
+
+    # Profiler if `profile` is set, see write_profile()
+    _profiler = None
+
+    # Examples to be executed, list of (symbol, segments); see examples()
+    _examples = None
+
+    # Set of files produced (written or unchanged) in the current run, see prune()
+    _produced = None
+
+    # ArchiveSink if `archive` is set (while running document() or examples())
+    _sink = None
+
+    # Set of files modified since the last call of render()
+    _modified = None
+
+    # Files modified but not yet rendered (stored inside quarto_dir), see render()
+    RENDER_PENDING = ".pyp2qmd_render_pending.json"
+
+    # Pages produced by the last run (stored inside man_dir/examples_dir), see prune()
+    PRUNE_RECORD = ".pyp2qmd_pages_{package}.json"
+
+    # Name of the example result cache (stored inside examples_dir), see run_examples()
+    EXAMPLE_CACHE = ".pyp2qmd_example_cache.json"
+
+    # Content of _quarto.yml while inside a quarto_yml() transaction
+    _yml = None
+
+    # StyleDetector if `docstringstyle = "AUTO"`, see document()
+    _detector = None
+
+    # Docstring styles provided by docstring_parser.DocstringStyle
+    _docstring_styles = ["AUTO", "EPYDOC", "GOOGLE", "NUMPYDOC", "REST"]
+
+    def __init__(self, config, filesystem = True):
         from .Config import Config
-        from importlib import import_module
-        from docstring_parser import DocstringStyle
         if not isinstance(config, Config):
             raise TypeError("argument `config` must be of class pyp2qmd.Config")
         elif not config.is_set_up():
             raise Exception(f"issue with argument `config`: {config}")
+        if not isinstance(filesystem, bool):
+            raise TypeError("argument `filesystem` must be bool")
+
+        # Start profiling (if requested) before anything else is done
+        if config.get("profile") is not None:
+            from .Profiler import Profiler
+            self._profiler = Profiler(pstats = config.get("pstats"))
+            self._profiler.activate()
 
         # Testing two more things. First we load the package which should be
         # documented. Throws an error if that package cannot be loaded (not
         # installed). Stores the package on _pkg, used by the methods to extract
         # classes and functions (e.g., get_classes, get_functions methods).
+        # If `static = True` the package is not imported but extracted from
+        # its source files (see StaticPackage).
+        from .Profiler import phase
         try:
-            self._pkg = import_module(config.get("package"))
+            # Batch mode: packages are loaded by the DocConverter of each package (below)
+            if config.is_batch():
+                self._pkg = None
+            else:
+                with phase("import"):
+                    self._pkg, self._static = _load_package(config, config.get("jobs"))
         except Exception as e:
             raise Exception(f"Cannot document \"{config.get('package')}\". Reason: {e}.")
 
-        # Next check if the docstringstyle is valid
-        if not hasattr(DocstringStyle, config.get("docstringstyle").upper()):
-            raise ValueError("invalid `docstringstyle`, package `docstring_parser` has no class " + \
-                           f"`docstring_parser.DocstringStyle.{config.get('docstringstyle').upper()}`")
+        # Next check if the docstringstyle is valid. Styles known to exist are
+        # accepted without importing docstring_parser (faster startup).
+        style = config.get("docstringstyle").upper()
+        if not style in self._docstring_styles:
+            from docstring_parser import DocstringStyle
+            if not hasattr(DocstringStyle, style):
+                raise ValueError("invalid `docstringstyle`, package `docstring_parser` has no class " + \
+                               f"`docstring_parser.DocstringStyle.{config.get('docstringstyle').upper()}`")
 
         # Store config
         self._config = config
 
+        # Detects the style of each docstring instead of trying all parsers
+        if style == "AUTO":
+            from .StyleDetector import StyleDetector
+            self._detector = StyleDetector()
+
+        # Files modified by this object (see render())
+        self._modified = set()
+
+        # Run-scoped cache for parsed docstrings and signatures
+        from .DocCache import DocCache
+        self._cache = DocCache()
+
+        # Batch mode: one DocConverter per package sharing the cache, the style
+        # detector, the profiler, and the set of modified files
+        if config.is_batch():
+            self._packages = []
+            for package in config.packages():
+                conv = DocConverter(config.package_config(package), filesystem = False)
+                conv._cache, conv._detector = self._cache, self._detector
+                conv._profiler, conv._modified = self._profiler, self._modified
+                self._packages.append(conv)
+
+        # In-memory use only (see iter_pages); nothing to set up or check
+        if not filesystem: return
+
         # Checking action: If action = "init" and overwrite = False we are
         # checking if some specific output files already exist. If so, raise
         # Exception and inform the user that he/she can enable overwrite,
@@ -102,6 +373,10 @@ class DocConverter:
             if not isdir(tmp):
                 raise Exception("missing folder \"{tmp}\". pyp2qmd project not initialized? (check documentation for `pyp2qmd init ...`)")
 
+        # Batch mode: subfolder in man_dir for each package
+        for conv in (self._packages or []):
+            conv.__make_output_dirs()
+
         # Class is now ready to do what it is designed for
 
     def __init_documentation(self):
@@ -118,17 +393,19 @@ class DocConverter:
 
         # Adding template(s)
         def pkg_file(pkgname, directory, file):
-            from re import match
-            from pkg_resources import resource_filename
-            from os.path import isfile, join
+            from os.path import isfile, join, dirname
 
             # Getting package name
             assert isinstance(pkgname, str), TypeError("argument `pkgname` must be str")
             assert isinstance(file, str), TypeError("argument `file` must be str")
             assert isinstance(directory, str), TypeError("argument `directory` must be str")
 
-            # Getting name of file
-            file = resource_filename(pkgname, join(directory, file))
+            # Getting name of file (importlib.resources.files requires Python 3.9+)
+            try:
+                from importlib.resources import files
+                file = str(files(pkgname).joinpath(directory).joinpath(file))
+            except ImportError:
+                file = join(dirname(__file__), directory, file)
             if not isfile(file):
                 raise Exception(f"whoops, file \"{file}\" (intended to be shipped with " + \
                         "the package) does not exist; contact the mainainer")
@@ -178,6 +455,17 @@ class DocConverter:
 
 
 
+    def __make_examples_dir(self):
+
+        from os import makedirs
+
+        # Trying to create examples_dir if needed
+        try:
+            makedirs(self.config_get("examples_dir"), exist_ok = True)
+        except Exception as e:
+            raise Exception(f"cannot create {self.config_get('examples_dir')}: {e}")
+
+
     def __repr__(self):
         """Standard Representation
 
@@ -189,13 +477,17 @@ class DocConverter:
         """
         res  = f"{self.__module__} Object:\n"
 
-        cls = self.get_classes(names_only = True)
-        if len(cls) > 0:
-            res += f"{self.__nice_stdout_list_of_strings('    Classes:   ', cls)}"
+        for conv in self.packages():
+            if self._packages is not None:
+                res += f"  Package {conv.config_get('package')}:\n"
 
-        fun = self.get_functions(names_only = True)
-        if len(fun) > 0:
-            res += f"{self.__nice_stdout_list_of_strings('    Functions: ', fun)}"
+            cls = conv.get_classes(names_only = True)
+            if len(cls) > 0:
+                res += f"{self.__nice_stdout_list_of_strings('    Classes:   ', cls)}"
+
+            fun = conv.get_functions(names_only = True)
+            if len(fun) > 0:
+                res += f"{self.__nice_stdout_list_of_strings('    Functions: ', fun)}"
 
         return res
 
@@ -236,6 +528,75 @@ class DocConverter:
         return self._config.get(what)
 
 
+    def packages(self):
+        """Packages Documented
+
+        Returns:
+            list: List of `DocConverter` objects, one per package in batch mode
+            (see `batch` in :py:class:`Config <pyp2qmd.Config.Config>`), else `[self]`.
+        """
+        return [self] if self._packages is None else list(self._packages)
+
+
+    def symbols(self):
+        """Symbol Index
+
+        The index of all classes and functions to be documented is built
+        once (when first needed) and reused by all stages. If `recursive = True`
+        (see :py:class:`Config <pyp2qmd.Config.Config>`) all submodules of the
+        package are included.
+
+        Return:
+            SymbolIndex: Object of class :py:class:`SymbolIndex <pyp2qmd.SymbolIndex.SymbolIndex>`.
+        """
+        from .Profiler import phase
+        if self._index is None:
+            with phase("index"):
+                self._index = _build_index(self._config, self._pkg, self._static)
+            if self._detector is not None: self._detector.learn(self._index)
+            if not self.config_get("silent"):
+                for mod, err in self._index.errors().items():
+                    print(f"pyp2qmd: Warning: cannot import \"{mod}\" ({err}), skipped")
+        return self._index
+
+    def references(self):
+        """Cross-Reference Resolver
+
+        Set up once (when first needed) using the :py:meth:`symbols` index;
+        collects the references which could not be resolved.
+
+        Return:
+            CrossReferences: Object of class
+            :py:class:`CrossReferences <pyp2qmd.CrossReferences.CrossReferences>`.
+        """
+        from .CrossReferences import CrossReferences
+        from .Profiler import phase
+        if self._refs is None:
+            symbols = self.symbols()
+            with phase("references_table"):
+                self._refs = CrossReferences(symbols, self.config_get("include_hidden"),
+                                             link_inherited = self.config_get("link_inherited"))
+        return self._refs
+
+    def write_profile(self):
+        """Write Profiling Report
+
+        Writes the profiling report to the file specified by `profile`
+        (and the `cProfile` statistics to `pstats` if set; see
+        :py:class:`Config <pyp2qmd.Config.Config>` and
+        :py:class:`Profiler <pyp2qmd.Profiler.Profiler>`). Does nothing
+        if `profile` is not set.
+
+        Returns:
+            None or dict: `None` if not profiling, else the report.
+        """
+        if self._profiler is None: return None
+        report = self._profiler.write(self.config_get("profile"))
+        if not self.config_get("silent"):
+            print(f"pyp2qmd: Profiling report written to \"{self.config_get('profile')}\"")
+        self._profiler = None
+        return report
+
     def get_classes(self, names_only = False):
         """Get Exported Classes
 
@@ -245,21 +606,14 @@ class DocConverter:
 
         Return:
             dict or list: Dictionary with all exported classes if `names_only = True`,
-                else a list of str containing only the class names.
+                else a list of str containing only the class names. If `recursive = True`
+                the fully qualified names of all classes defined in the package.
 
         Raises:
             Exception: If there are issues extracting classes via `inspect`.
         """
-        from inspect import getmembers, isclass
-        try:
-            res = getmembers(self._pkg, isclass)
-        except Exception as e:
-            raise Exception(f"problems extracting classes from package: {e}")
-
-        if not names_only:
-            return dict(zip([x[0] for x in res], [x[1] for x in res]))
-        else:
-            return [x[0] for x in res]
+        res = self.symbols().classes()
+        return list(res) if names_only else res
 
     def get_functions(self, names_only = False):
         """Get Exported Functions
@@ -270,35 +624,205 @@ class DocConverter:
 
         Return:
             dict or list: Dictionary with all exported functions if `names_only = True`,
-                else a list of str containing only the function names.
+                else a list of str containing only the function names. If `recursive = True`
+                the fully qualified names of all functions defined in the package.
 
         Raises:
             Exception: If there are issues extracting functions via `inspect`.
         """
-        from inspect import getmembers, isfunction
+        res = self.symbols().functions()
+        return list(res) if names_only else res
+
+
+    def _start_workers(self, serial = False):
+        """Start Worker Pools
+
+        Starts a process pool for rendering the pages and a
+        :py:class:`FileWriter <pyp2qmd.FileWriter.FileWriter>` with `jobs`
+        threads for writing the files if `jobs` is not `1` (and `serial = False`).
+        Does nothing if the pools are already running.
+
+        Returns:
+            bool: `True` if the pools have been started by this call (the caller
+            is responsible to call :py:meth:`_stop_workers`), else `False`.
+        """
+        from os import cpu_count
+
+        if self._pool is not None: return False
+
+        jobs = 1 if serial else self.config_get("jobs")
+        if jobs == 0: jobs = cpu_count()
+        if jobs == 1:
+            # Batch mode: set up by the DocConverter of each package
+            if self._packages is None:
+                _init_worker(self._config, self._cache, self.symbols(), self.references(), self._detector)
+            return False
+
+        from concurrent.futures import ProcessPoolExecutor
+        from .FileWriter import FileWriter
+
+        self._pool    = ProcessPoolExecutor(jobs, initializer = _init_worker,
+                                            initargs = (self._config,))
+        self._writers = FileWriter(jobs, maxsize = 16 * jobs)
+        return True
+
+    def _stop_workers(self):
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._writers.close()
+        self._pool = self._writers = None
+
+    def _run_batch(self, method):
+        """Batch mode: calls `method` (name) of the DocConverter of each package
+        sharing the worker pool (started once); returns the list of results"""
+        started = self._start_workers()
         try:
-            res = getmembers(self._pkg, isfunction)
-        except Exception as e:
-            raise Exception(f"problems extracting classes from package: {e}")
+            res = []
+            for conv in self._packages:
+                conv._pool, conv._writers = self._pool, self._writers
+                conv._pool_shared = self._pool is not None
+                try:
+                    res.append(getattr(conv, method)())
+                finally:
+                    conv._pool, conv._writers, conv._pool_shared = None, None, False
+            return res
+        finally:
+            if started: self._stop_workers()
+
+    def _render(self, tasks):
+        """Render Pages
+
+        Renders the pages for a list of tasks (see `_render_task`), either
+        in the current process or using the process pool. The results are
+        returned in the same order as the tasks.
+        """
+        if self._pool is None:
+            return map(_render_task, tasks)
+        if self._pool_shared:
+            package = self.config_get("package")
+            return self._pool.map(_render_package_task, [(package, t) for t in tasks],
+                                  chunksize = max(1, len(tasks) // 64))
+        return self._pool.map(_render_task, tasks, chunksize = max(1, len(tasks) // 64))
+
+    def _process(self, what, kind, tasks):
+        """Render and Write Pages
+
+        Renders all `tasks` and writes the results (in the background while
+        rendering, see :py:class:`FileWriter <pyp2qmd.FileWriter.FileWriter>`;
+        exceptions raised while writing are re-raised). Prints progress messages
+        and returns the results in the order of the tasks (deterministic, also
+        when running in parallel). Man pages which did not change since
+        the last run (see :py:class:`Manifest <pyp2qmd.Manifest.Manifest>`) are
+        skipped.
 
-        if not names_only:
-            return dict(zip([x[0] for x in res], [x[1] for x in res]))
+        Returns:
+            list: List of tuples `(task, file, members)`.
+        """
+        from os.path import join, basename, normpath
+        from .ManPage import ManPage
+        from .FileWriter import FileWriter
+        from .Profiler import phase
+
+        prof = self._profiler
+        if what == "man":
+            msg = {"function": "Create man page for function", "class": "Create man page for class",
+                   "method": "   + method page for"}
+            outdir = self.config_get("quarto_dir")
         else:
-            return [x[0] for x in res]
+            msg = {"function": "Create example qmd for function", "class": "Create example qmd for class",
+                   "method": "   + examples for method page for"}
+            outdir = ""
+
+        # Check which man pages are unchanged since the last run. If
+        # restricted to a set of modules (see document()), pages of objects
+        # defined elsewhere are taken from the manifest without checking
+        # (unless they contain references, whose targets may have changed).
+        fingerprints = [None] * len(tasks)
+        unchanged    = [None] * len(tasks)
+        if what == "man" and self._manifest is not None:
+            include_hidden = self.config_get("include_hidden")
+            refs = self.references()
+            for i, task in enumerate(tasks):
+                key = f"{kind}:{task[2]}"
+                obj = _task_object(self.symbols(), task)
+                members = ManPage.list_members(obj, include_hidden) if kind == "class" else None
+                if self._modules is not None and not self._affected(obj, members) and \
+                        not self._manifest.has_references(obj, members):
+                    unchanged[i] = self._manifest.previous(key)
+                    if unchanged[i] is not None:
+                        fingerprints[i] = unchanged[i]["fingerprint"]
+                        continue
+                with phase("fingerprint"):
+                    fingerprints[i] = self._manifest.fingerprint(obj, members, refs)
+                unchanged[i]    = self._manifest.get(key, fingerprints[i])
+
+        rendered = self._render([t for t, u in zip(tasks, unchanged) if u is None])
+
+        # Serial mode: one writer thread for this call (writes overlap rendering)
+        writer = self._sink or self._writers or FileWriter()
+        try:
+            res = []
+            for i, task in enumerate(tasks):
+                if unchanged[i] is not None:
+                    file, members = unchanged[i]["file"], [tuple(x) for x in unchanged[i]["members"]]
+                    self._manifest.add(f"{kind}:{task[2]}", fingerprints[i], file, members, skipped = True)
+                    if prof is not None: prof.add_pages("skipped")
+                    if self._produced is not None:
+                        self._produced.add(normpath(join(outdir, file)))
+                    res.append((task, file, members))
+                    continue
+
+                file, content, members, stats = next(rendered)
+                if fingerprints[i] is not None:
+                    self._manifest.add(f"{kind}:{task[2]}", fingerprints[i], file, members, skipped = False)
+                # Collect cache statistics from the worker processes
+                if self._pool is not None: self._cache.add_stats(stats["hits"], stats["misses"])
+                self.references().add_unresolved(stats["unresolved"])
+                if "styles" in stats: self._detector.merge(stats["styles"])
+                if prof is not None:
+                    prof.merge(stats["phases"])
+                    prof.add_symbol(f"{what}:{kind}:{task[2]}", stats["seconds"])
+                if not self.config_get("silent"):
+                    print(f"{msg[kind]} {task[2]}")
+                if "examples" in stats and self._examples is not None:
+                    self._examples.append((basename(file)[:-len(".qmd")], stats["examples"]))
+                if file is not None:
+                    # Blocks if the writer is busy (bounded queue)
+                    writer.put(join(outdir, file), content)
+                    if self._produced is not None:
+                        self._produced.add(normpath(join(outdir, file)))
+                res.append((task, file, members))
+
+            # Wait for all writes; re-raises exceptions if any
+            written = writer.join()
+        finally:
+            if not writer in (self._sink, self._writers): writer.close()
+
+        if self._sink is None: self._mark_modified([f for f, changed, _ in written if changed])
+        for file, changed, seconds in written:
+            if prof is not None:
+                prof.merge({"write": [seconds, 1]})
+                prof.add_pages("written" if changed else "unchanged")
+        return res
 
+    def _affected(self, obj, members):
+        """Is `obj` (or one of its members) defined in one of the modules in `_modules`?"""
+        mods = self._modules
+        return getattr(obj, "__module__", None) in mods or \
+               any(getattr(m, "__module__", None) in mods for _, m in (members or []))
 
     def document_functions(self):
         """Document Functions
 
         Generates man pages for all exported functions.
         """
-        from .ManPage import ManPage
-
-        for name,cls in self.get_functions().items():
-            if not self.config_get("silent"):
-                print(f"Create man page for function {name}")
-            man = ManPage(name, cls, self._config)
-            self._man_created["function"][name] = man.write_qmd()
+        started = self._start_workers()
+        try:
+            tasks = [("man", "function", name, None, None) for name in self.get_functions(names_only = True)]
+            for task, qmd, _ in self._process("man", "function", tasks):
+                self._man_created["function"][task[2]] = qmd
+        finally:
+            if started: self._stop_workers()
     
     def examples_functions(self):
         """Examples of Functions
@@ -307,36 +831,33 @@ class DocConverter:
         and writes a dedicated quarto markdown (qmd) file which can be
         used to see if the examples run without errors.
         """
-        from .ManPage import ManPage
-
-        for name,cls in self.get_functions().items():
-            if not self.config_get("silent"):
-                print(f"Create example qmd for function {name}")
-            man = ManPage(name, cls, self._config)
-            man.write_examples_qmd()
+        started = self._start_workers()
+        try:
+            tasks = [("examples", "function", name, None, None) for name in self.get_functions(names_only = True)]
+            self._process("examples", "function", tasks)
+        finally:
+            if started: self._stop_workers()
+
+    def _class_tasks(self, what):
+        """Render and write the class pages, returns the method tasks"""
+        tasks = [(what, "class", name, None, None) for name in self.get_classes(names_only = True)]
+        res   = []
+        for task, qmd, members in self._process(what, "class", tasks):
+            if what == "man":
+                self._man_created["class"][task[2]] = qmd
+            res += [(what, "method", name, task[2], parent) for name, parent in members]
+        return res
 
     def document_classes(self):
         """Examples of Classes and Methods
 
         Generates man pages for all exported classes.
         """
-        from .ManPage import ManPage
-        from re import sub
-
-        for name,cls in self.get_classes().items():
-            if not self.config_get("silent"):
-                print(f"Create man page for class {name}")
-            man = ManPage(name, cls, self._config)
-            self._man_created["class"][name] = man.write_qmd()
-
-            for name,meth in man.getmembers():
-                if not self.config_get("include_hidden") and meth.__name__.startswith("_"):
-                    continue
-                if not self.config_get("silent"):
-                    print(f"   + method page for {name}")
-                parent = sub(r"\.[^.]*$", "", man.fullname())
-                m_man = ManPage(name, meth, self._config, parent = parent)
-                m_man.write_qmd()
+        started = self._start_workers()
+        try:
+            self._process("man", "method", self._class_tasks("man"))
+        finally:
+            if started: self._stop_workers()
 
     def examples_classes(self):
         """Document Classes
@@ -345,32 +866,144 @@ class DocConverter:
         and writes a dedicated quarto markdown (qmd) file which can be
         used to see if the examples run without errors.
         """
-        from .ManPage import ManPage
-        from re import sub
-
-        for name,cls in self.get_classes().items():
-            if not self.config_get("silent"):
-                print(f"Create example qmd for class {name}")
-            man = ManPage(name, cls, self._config)
-            man.write_examples_qmd()
-
-            for name,meth in man.getmembers():
-                if not self.config_get("include_hidden") and meth.__name__.startswith("_"):
-                    continue
-                if not self.config_get("silent"):
-                    print(f"   + examples for method page for {name}")
-                parent = sub(r"\.[^.]*$", "", man.fullname())
-                m_man = ManPage(name, meth, self._config, parent = parent)
-                m_man.write_examples_qmd()
+        started = self._start_workers()
+        try:
+            self._process("examples", "method", self._class_tasks("examples"))
+        finally:
+            if started: self._stop_workers()
 
-    def document(self):
+    def document(self, modules = None):
         """Document All
 
         Documents all exported classes and functions. Convenience function,
         calls :py:meth:`document_functions` and :py:meth:`document_classes`.
+        If `jobs` is not `1` (see :py:class:`Config <pyp2qmd.Config.Config>`)
+        the pages are rendered by a pool of worker processes.
+
+        If `incremental = True` (default) only pages which changed since the last
+        run are rebuilt. If `archive` is set, all pages are written into the
+        archive (see :py:class:`ArchiveSink <pyp2qmd.ArchiveSink.ArchiveSink>`). Pages of symbols which no longer exist are removed
+        (see :py:meth:`prune`). Cross-references which cannot be resolved (on pages rendered in this
+        run) are listed at the end, as well as the docstring styles used per module
+        if `docstringstyle = "AUTO"` (see :py:class:`StyleDetector <pyp2qmd.StyleDetector.StyleDetector>`).
+
+        Args:
+            modules (None, list): If `None` (default) all symbols are checked.
+                Else a list of module names (e.g., modules modified and reloaded via
+                :py:meth:`reload`). Only classes, functions, and methods defined in
+                these modules are checked and re-rendered if needed, the pages
+                of all other symbols are kept as they are (requires a manifest from
+                a previous run; used by :py:class:`Watcher <pyp2qmd.Watcher.Watcher>`).
+                Always sequential, independent of `jobs`. Not supported in batch mode.
+
+        Raises:
+            TypeError: If `modules` is not None or list.
+            Exception: If `modules` is set in batch mode.
         """
-        self.document_functions()
-        self.document_classes()
+        from .Manifest import Manifest
+
+        if not isinstance(modules, (type(None), list)):
+            raise TypeError("argument `modules` must be None or list")
+
+        # Batch mode: document all packages (sharing the worker pool)
+        if self._packages is not None:
+            if modules is not None:
+                raise Exception("argument `modules` is not supported in batch mode")
+            self._run_batch("document")
+            return
+
+        archive = self.config_get("archive")
+        if (self.config_get("incremental") or modules is not None) and archive is None:
+            self._manifest = Manifest(self._config)
+        self._modules = None if modules is None else set(modules)
+        # Reset such that symbols removed meanwhile are no longer listed
+        self._man_created = {"class": dict(), "function": dict(), "method": dict()}
+        self._produced    = set()
+
+        self._sink = self._open_sink("man")
+        started    = self._start_workers(serial = modules is not None)
+        try:
+            self.document_functions()
+            self.document_classes()
+            produced = self._produced
+            if self._sink is not None: self._sink.close()
+        finally:
+            if started: self._stop_workers()
+            if self._sink is not None: self._sink.discard()
+            self._sink     = None
+            self._modules  = None
+            self._produced = None
+
+        if self._manifest is not None:
+            if self.config_get("prune") and not self.config_get("prune_dry_run"):
+                self._manifest.remove_stale()
+            self._manifest.save()
+            if not self.config_get("silent"):
+                c = self._manifest.counts()
+                print(f"pyp2qmd: Man pages rebuilt: {c['rebuilt']}, skipped (unchanged): " + \
+                      f"{c['skipped']}, removed: {c['removed']}")
+            self._manifest = None
+
+        self.prune("man", produced)
+
+        # Summary of the cross-references which could not be resolved
+        unresolved = self.references().unresolved()
+        if not self.config_get("silent") and len(unresolved) > 0:
+            print(f"pyp2qmd: Unresolved references: {len(unresolved)} (not linked)")
+            for ref, pages in unresolved.items():
+                print(f"         {ref} (on {', '.join(pages)})")
+
+        # Docstring styles used per module (if `docstringstyle = "AUTO"`)
+        if self._detector is not None and not self.config_get("silent"):
+            report = self._detector.report()
+            if len(report) > 0:
+                print("pyp2qmd: Docstring styles used (AUTO: detected by docstring_parser)")
+                for mod, styles in report.items():
+                    print(f"         {mod}: {', '.join(f'{k} ({n})' for k, n in styles.items())}")
+
+    def reload(self, modules):
+        """Reload Modules
+
+        Reloads modules of the documented package (e.g., after the source
+        files have been modified) such that the next call of :py:meth:`document`
+        picks up the changes. If `static = True` the source files of these
+        modules are parsed again, else the package and all its modules are
+        removed from `sys.modules` and the package is imported again
+        (`importlib.reload` would keep names removed from a module, and modules
+        importing from the modified ones would keep the old objects). If the
+        import fails, the previously imported modules are restored.
+        The styles cached by the
+        :py:class:`StyleDetector <pyp2qmd.StyleDetector.StyleDetector>` for
+        these modules are reset.
+
+        Args:
+            modules (list): Names of the modules to be reloaded.
+
+        Raises:
+            Exception: If a module cannot be reloaded (e.g., syntax errors).
+        """
+        import sys
+        from importlib import import_module, invalidate_caches
+
+        if self._static is not None:
+            self._static.update(modules)
+            self._pkg = self._static.module()
+        else:
+            package = self.config_get("package")
+            old = dict((k, v) for k, v in sys.modules.items() \
+                       if k == package or k.startswith(f"{package}."))
+            for mod in old: del sys.modules[mod]
+            invalidate_caches()
+            try:
+                self._pkg = import_module(package)
+            except BaseException:
+                for mod in [x for x in sys.modules if x == package or x.startswith(f"{package}.")]:
+                    del sys.modules[mod]
+                sys.modules.update(old)
+                raise
+        if self._detector is not None: self._detector.reset(modules)
+        # Symbol index (and references) have to be rebuilt
+        self._index, self._refs = None, None
 
     def examples(self):
         """Extract Examples
@@ -379,27 +1012,405 @@ class DocConverter:
         classes, and methods and create dedicated quarto markdown files (qmd) for each
         of them. Only contains the example code. Used to quarto render all examples
         to see if any of them break.
+
+        Example files of symbols which no longer exist (or no longer have
+        examples) are removed (see :py:meth:`prune`). If `archive` is set,
+        the files are written into the archive (see
+        :py:class:`ArchiveSink <pyp2qmd.ArchiveSink.ArchiveSink>`).
+
+        If `run_examples = True` (see :py:class:`Config <pyp2qmd.Config.Config>`)
+        the examples are also executed directly (see
+        :py:class:`ExampleRunner <pyp2qmd.ExampleRunner.ExampleRunner>`); a report
+        is written to `examples_report.json` and `examples_report.xml` (JUnit XML)
+        inside `examples_dir`.
+
+        Returns:
+            None or list: `None` if `run_examples = False`, else the results
+            of all example segments (see
+            :py:meth:`ExampleRunner.run <pyp2qmd.ExampleRunner.ExampleRunner.run>`).
+            In batch mode the results of all packages are combined.
         """
-        self.examples_functions()
-        self.examples_classes()
-    
+        # Batch mode: examples of all packages (inside examples_dir/<package>)
+        if self._packages is not None:
+            res = self._run_batch("examples")
+            return None if not self.config_get("run_examples") else [x for y in res for x in y]
+
+        if self.config_get("run_examples"): self._examples = []
+        self._produced = set()
+        self._sink     = self._open_sink("examples")
+        started        = self._start_workers()
+        try:
+            self.examples_functions()
+            self.examples_classes()
+            produced = self._produced
+            if self._sink is not None: self._sink.close()
+        finally:
+            if started: self._stop_workers()
+            if self._sink is not None: self._sink.discard()
+            self._sink     = None
+            self._produced = None
+
+        self.prune("examples", produced)
+
+        if self._examples is None: return None
+        examples, self._examples = self._examples, None
+        return self.run_examples(examples)
+
+    def run_examples(self, examples):
+        """Run Examples
+
+        Executes the examples and writes the reports (see :py:meth:`examples`).
+
+        Args:
+            examples (list): List of tuples `(symbol, segments)`.
+
+        Returns:
+            list: Results of all example segments (see
+            :py:meth:`ExampleRunner.run <pyp2qmd.ExampleRunner.ExampleRunner.run>`).
+        """
+        from os.path import join, isdir
+        from .ExampleRunner import ExampleRunner
+        from .Profiler import phase
+
+        outdir = self.config_get("examples_dir")
+        if not isdir(outdir): self.__make_examples_dir()
+        runner = ExampleRunner(self.config_get("timeout"), self.config_get("memory_limit"),
+                               self.config_get("jobs"), cwd = outdir)
+
+        # Results of unchanged examples are taken from the cache (unless disabled)
+        cache = None
+        if self.config_get("cache"):
+            from .ExampleCache import ExampleCache
+            cache = ExampleCache(join(outdir, self.EXAMPLE_CACHE), self.package_version(),
+                                 self.config_get("cache_size") * 1024 * 1024)
+        with phase("run_examples"):
+            results = runner.run(examples, cache = cache)
+        if cache is not None: cache.save()
+        runner.write_json(join(outdir, "examples_report.json"), results)
+        runner.write_junit(join(outdir, "examples_report.xml"), results,
+                           name = f"{self.config_get('package')} examples")
+
+        if not self.config_get("silent"):
+            s = runner.summary(results)
+            print(f"pyp2qmd: Examples run: {s['total']} segments, {s['passed']} passed, " + \
+                  f"{s['failed']} failed, {s['timeout']} timed out, {s['error']} errors " + \
+                  f"({s['cached']} cached)")
+            for rec in results:
+                if rec["status"] == "passed": continue
+                cached = ", cached" if rec.get("cached") else ""
+                print(f"         {rec['symbol']} (segment {rec['segment']}{cached}): " + \
+                      f"{rec['status']}, {rec['message']}")
+        return results
+
+    def extract(self, file):
+        """Extract Intermediate Representation
+
+        First stage of the two-stage pipeline (see
+        :py:class:`IRFile <pyp2qmd.IRFile.IRFile>`): extracts all functions,
+        classes, and methods (signatures, parsed docstrings, members) and
+        writes one record per man page into a JSON Lines file. Does not
+        render any pages; can be used with `filesystem = False`.
+
+        Args:
+            file (str): Name of the JSON Lines file.
+
+        Returns:
+            int: Number of records written.
+
+        Raises:
+            TypeError: If `file` is not str.
+            Exception: In batch mode (multiple packages).
+        """
+        from .IRFile import IRFile
+
+        if not isinstance(file, str):
+            raise TypeError("argument `file` must be str")
+        if self._packages is not None:
+            raise Exception("extract() does not support multiple packages (batch mode)")
+
+        _init_worker(self._config, self._cache, self.symbols(), self.references(), self._detector)
+
+        def records():
+            for kind, names in [("function", self.get_functions(names_only = True)),
+                                ("class", self.get_classes(names_only = True))]:
+                for name in names:
+                    man, members = _task_page(("man", kind, name, None, None))
+                    yield dict(man.to_record(), kind = kind, fullname = man.fullname())
+                    for mname, parent in members:
+                        man, _ = _task_page(("man", "method", mname, name, parent))
+                        yield dict(man.to_record(), kind = "method", fullname = man.fullname())
+
+        header = {"package": self.config_get("package"),
+                  "docstringstyle": self.config_get("docstringstyle"),
+                  "include_hidden": self.config_get("include_hidden"),
+                  "recursive": self.config_get("recursive")}
+        n = IRFile(file).write(header, records())
+        if not self.config_get("silent"):
+            print(f"pyp2qmd: Extracted {n} symbols into \"{file}\"")
+        return n
+
+    def _open_sink(self, what):
+        """Opens the ArchiveSink for `what` if `archive` is set, else returns None"""
+        if self.config_get("archive") is None: return None
+        from .ArchiveSink import ArchiveSink
+        root = self.config_get("quarto_dir") if what == "man" else self.config_get("examples_dir")
+        return ArchiveSink(self.config_get("archive"), root, what)
+
+    def iter_pages(self, what = "man"):
+        """Iterate Over Pages
+
+        Generator rendering the man pages (or examples pages) of all
+        classes, functions, and methods one by one, without writing any
+        files (only one page is kept in memory at a time). Can be used with
+        `filesystem = False` (see :py:class:`DocConverter`) to stream the pages
+        into custom sinks. Pages are rendered in the current process (`jobs`
+        is ignored); symbols without examples are skipped if `what = "examples"`.
+        In batch mode the pages of all packages are yielded one package after another.
+
+        Args:
+            what (str): Either `"man"` (default) or `"examples"`.
+
+        Yields:
+            dict: Page record with the `kind` of the symbol (`"function"`,
+            `"class"`, or `"method"`), the full `name`, the `file` (relative
+            to `quarto_dir` for man pages, path of the examples file for
+            examples), and the rendered `content`.
+
+        Raises:
+            ValueError: If `what` is not `"man"` or `"examples"`.
+        """
+        from os.path import basename
+
+        if not what in ["man", "examples"]:
+            raise ValueError("argument `what` must be \"man\" or \"examples\"")
+
+        if self._packages is not None:
+            for conv in self._packages: yield from conv.iter_pages(what)
+            return
+
+        _init_worker(self._config, self._cache, self.symbols(), self.references(), self._detector)
+
+        def page(task):
+            file, content, members, stats = _render_task(task)
+            rec = None if file is None else \
+                  {"kind": task[1], "name": basename(file)[:-len(".qmd")], "file": file, "content": content}
+            return rec, members
+
+        for name in self.get_functions(names_only = True):
+            rec, _ = page((what, "function", name, None, None))
+            if rec is not None: yield rec
+        for name in self.get_classes(names_only = True):
+            rec, members = page((what, "class", name, None, None))
+            if rec is not None: yield rec
+            for mname, parent in members:
+                rec, _ = page((what, "method", mname, name, parent))
+                if rec is not None: yield rec
+
+    def prune(self, what, produced):
+        """Remove Orphaned Pages
+
+        Removes all quarto markdown files (`.qmd`) of the package in `man_dir`
+        (if `what = "man"`) or `examples_dir` (if `what = "examples"`) which
+        have not been produced in the current run (symbols which have been
+        removed or renamed), as well as their quarto freeze entries (`_freeze`).
+        Only files written by pyp2qmd are considered: the files produced by the
+        last run (recorded in `.pyp2qmd_pages_<package>.json` inside the directory;
+        also pages of symbols re-exported from other packages), and files named
+        after the package (`<package>.*.qmd`).
+        Does nothing if `prune = False` (except recording the files produced);
+        only lists the files if `prune_dry_run = True`
+        (see :py:class:`Config <pyp2qmd.Config.Config>`).
+
+        Args:
+            what (str): Either `"man"` or `"examples"`.
+            produced (set): Set of files produced in the current run.
+
+        Returns:
+            list: List of the orphaned files (removed unless dry run).
+        """
+        from os import listdir, remove
+        from os.path import join, isdir, isfile, normpath, relpath, splitext
+        from shutil import rmtree
+
+        if not what in ["man", "examples"]:
+            raise ValueError("argument `what` must be \"man\" or \"examples\"")
+        if self.config_get("archive") is not None: return []
+
+        if what == "man":
+            outdir   = join(self.config_get("quarto_dir"), self.config_get("man_dir"))
+            projects = [self.config_get("quarto_dir")]
+        else:
+            outdir   = self.config_get("examples_dir")
+            projects = [outdir, "."]
+        if not isdir(outdir): return []
+
+        prefix   = f"{self.config_get('package')}."
+        record   = join(outdir, self.PRUNE_RECORD.format(package = self.config_get("package")))
+        previous = self._load_list(record)
+        current  = set(x for x in (relpath(f, outdir) for f in produced) if not x.startswith(".."))
+        orphaned = sorted(normpath(join(outdir, f)) for f in listdir(outdir)
+                          if (f.startswith(prefix) or f in previous) and f.endswith(".qmd") and
+                          not normpath(join(outdir, f)) in produced)
+
+        # Files kept (not pruned) are still considered by the next run
+        dry = self.config_get("prune_dry_run") or not self.config_get("prune")
+        self._save_list(record, current | (set(relpath(f, outdir) for f in orphaned) if dry else set()))
+        if not self.config_get("prune"): return []
+        for file in orphaned:
+            # Freeze entries are stored in <project>/_freeze/<path relative to project>/
+            freeze = [join(p, "_freeze", splitext(relpath(file, p))[0]) for p in projects]
+            freeze = [x for x in freeze if isdir(x)]
+            if not self.config_get("silent"):
+                print(f"{'Would remove' if dry else 'Removing'} orphaned page {file}")
+                for x in freeze: print(f"   + freeze entry {x}")
+            if dry: continue
+            if isfile(file): remove(file)
+            for x in freeze: rmtree(x, ignore_errors = True)
+        return orphaned
+
+    def render(self, full = False):
+        """Render Modified Pages
+
+        Calls quarto (see :py:class:`QuartoRenderer <pyp2qmd.QuartoRenderer.QuartoRenderer>`)
+        to render the quarto markdown files in `quarto_dir` which have been
+        modified (e.g., by :py:meth:`document`) and not yet rendered successfully,
+        one after another (quarto calls share project-wide state). The whole project is
+        rendered if `_quarto.yml` has been modified (or `full = True`).
+        Modified files are kept in `.pyp2qmd_render_pending.json` inside
+        `quarto_dir` until quarto succeeds for them, such that files modified
+        by an earlier run (e.g., `pyp2qmd document`), or which failed to render,
+        are rendered by the next call.
+        The quarto executable can be set via `quarto`
+        (see :py:class:`Config <pyp2qmd.Config.Config>`).
+
+        Args:
+            full (bool): If `True` the whole project is rendered, defaults to `False`.
+
+        Returns:
+            list: One dictionary per quarto call, see
+            :py:meth:`QuartoRenderer.render_file <pyp2qmd.QuartoRenderer.QuartoRenderer.render_file>`.
+            Empty list if nothing has to be rendered.
+
+        Raises:
+            TypeError: If `full` is not bool.
+            Exception: If quarto failed to render one or more files.
+        """
+        from os.path import join, isfile
+        from .QuartoRenderer import QuartoRenderer
+        from .Profiler import phase
+
+        if not isinstance(full, bool):
+            raise TypeError("argument `full` must be bool")
+
+        qdir    = self.config_get("quarto_dir")
+        # Files removed in the meantime (e.g., pruned) are no longer rendered
+        pending = set(f for f in self._load_pending() if isfile(join(qdir, f)))
+        full    = full or "_quarto.yml" in pending
+        files   = sorted(f for f in pending if f.endswith(".qmd"))
+        # Cleared (not replaced), shared with the DocConverters of a batch
+        self._modified.clear()
+        if not full and len(files) == 0:
+            self._save_pending(set())
+            if not self.config_get("silent"): print("pyp2qmd: Nothing to render")
+            return []
+
+        renderer = QuartoRenderer(self.config_get("quarto"), cwd = qdir)
+        if not self.config_get("silent"):
+            print(f"pyp2qmd: Rendering {'whole project' if full else f'{len(files)} page(s)'} ({qdir})")
+        with phase("quarto"):
+            results = renderer.render(None if full else files)
+        # Only files rendered successfully are removed from the pending ones
+        if full and results[0]["status"] == "passed":
+            pending = set()
+        else:
+            pending -= set(x["file"] for x in results if x["status"] == "passed")
+        self._save_pending(pending)
+
+        failed = [x for x in results if x["status"] != "passed"]
+        if len(failed) > 0:
+            msg = "\n".join(f"{x['file'] or qdir} (status {x['returncode']}):\n{x['output']}" for x in failed)
+            raise Exception(f"quarto failed to render {len(failed)} of {len(results)}:\n{msg}")
+        return results
+
+    def _mark_modified(self, files):
+        """Adds files to the modified ones, also to the pending list of render()"""
+        from os.path import normpath, relpath
+        if len(files) == 0: return
+        self._modified.update(normpath(f) for f in files)
+        qdir  = self.config_get("quarto_dir")
+        files = set(relpath(f, qdir) for f in files)
+        self._save_pending(self._load_pending() | set(f for f in files if not f.startswith("..")))
+
+    def _load_pending(self):
+        """Files modified but not yet rendered (relative to quarto_dir), see render()"""
+        from os.path import join
+        return self._load_list(join(self.config_get("quarto_dir"), self.RENDER_PENDING))
+
+    def _save_pending(self, files):
+        """Stores the files not yet rendered"""
+        from os.path import join
+        self._save_list(join(self.config_get("quarto_dir"), self.RENDER_PENDING), files)
+
+    @staticmethod
+    def _load_list(file):
+        """Set of str stored as JSON list in `file` (empty if missing or broken)"""
+        import json
+        from os.path import isfile
+        if not isfile(file): return set()
+        try:
+            with open(file, "r") as fid:
+                content = json.load(fid)
+        except Exception:
+            return set()
+        return set(content) if isinstance(content, list) else set()
+
+    @staticmethod
+    def _save_list(file, items):
+        """Stores `items` as sorted JSON list in `file` (removes the file if empty)"""
+        import json
+        from os import remove
+        from os.path import isfile
+        if len(items) == 0:
+            if isfile(file): remove(file)
+            return
+        with open(file, "w") as fid:
+            json.dump(sorted(items), fid, indent = 1)
+
+    def package_version(self):
+        """Version of the Package Documented
+
+        Returns:
+            str: The `__version__` of the package if defined, else the version
+            of the installed distribution, `"unknown"` if not available.
+        """
+        version = getattr(self._pkg, "__version__", None)
+        if isinstance(version, str): return version
+        try:
+            from importlib.metadata import version
+            return version(self.config_get("package"))
+        except Exception:
+            return "unknown"
+
     def update_quarto_yml(self):
         """Update Quarto
 
         Updates the `_quarto.yml` file by adding all classes and functions
         to the website sidebar content (navigation). This is only done if
         the quarto file has just been initialized and man pages have been
-        crated.
+        crated. In batch mode, the sidebar contains one section per package
+        (the file is written once for all packages).
         """
 
-        n = 0
+        convs = self.packages()
+        n = sum(len(v) for c in convs for v in c._man_created.values())
         if not self.config_get("silent"):
             print(f"pyp2qmd: Number of (main) man pages created")
-            for k,v in self._man_created.items():
+            for k in self._man_created:
                 kx = "(es):" if k == "class" else "(s):"
-                n += len(v)
-                print(f"         {k + kx:15s}   {len(v):4d}")
+                print(f"         {k + kx:15s}   {sum(len(c._man_created[k]) for c in convs):4d}")
             print(f"         in total:         {n:4d}")
+            s = self._cache.stats()
+            print(f"pyp2qmd: Docstring cache {s['hits']} hits, {s['misses']} misses")
 
         # Nothing? Do nothing
         if not self._quarto_yml_initialized or n == 0:
@@ -408,18 +1419,30 @@ class DocConverter:
         # Reading existing yml file
         content = self._load_yaml()
             
-        content["website"]["sidebar"]["contents"] = []
+        if self._packages is None:
+            content["website"]["sidebar"]["contents"] = self._sidebar()
+        else:
+            content["website"]["sidebar"]["contents"] = \
+                [{"section": c.config_get("package"), "contents": c._sidebar()} for c in convs if c._sidebar()]
+
+        # Write back
+        self._save_yaml(content)
+
+
+    def _sidebar(self):
+        """Sidebar sections (function and class references) of the man pages created"""
+        from re import sub
+        res = []
         # Setting up dictionary for function references
         for what in ["Function", "Class"]:
             if len(self._man_created[what.lower()]):
                 tmp = []
                 for key,val in self._man_created[what.lower()].items():
+                    # Fully qualified if `recursive = True`; drop package name
+                    key = sub(f"^{self.config_get('package')}\\.", "", key)
                     tmp.append({"text": key, "file": val})
-                tmp = {"section": f"{what} references", "contents": tmp}
-                content["website"]["sidebar"]["contents"].append(tmp)
-
-        # Write back
-        self._save_yaml(content)
+                res.append({"section": f"{what} references", "contents": tmp})
+        return res
 
 
     def add_navbar_page(self, src, dest, text, menu = None):
@@ -680,29 +1703,78 @@ class DocConverter:
         self._save_yaml(content)
 
 
+    def quarto_yml(self):
+        """Batch Changes to `_quarto.yml`
+
+        Returns a context manager which loads `_quarto.yml` once, keeps it in
+        memory while all `add_*` methods (and :py:meth:`update_quarto_yml`) are
+        applied, and writes the file once when leaving the `with` block. If an
+        exception is raised inside the block, `_quarto.yml` is left unchanged.
+        Transactions can be nested, only the outermost one writes the file.
+
+        Returns:
+            Context manager; yields the dictionary with the content of
+            `_quarto.yml` which can also be modified directly, e.g.,
+            `with docconv.quarto_yml() as yml: ...`.
+        """
+        from contextlib import contextmanager
+
+        @contextmanager
+        def transaction():
+            # Nested transaction; outermost one takes care of reading/writing
+            if self._yml is not None:
+                yield self._yml
+                return
+            self._yml = self._load_yaml()
+            try:
+                yield self._yml
+                content, self._yml = self._yml, None
+                self._save_yaml(content)
+            finally:
+                self._yml = None
+
+        return transaction()
+
+
     def _load_yaml(self):
         """Load Existing YML File
 
-        Loads the existing _quarto.yml file.
+        Loads the existing _quarto.yml file; returns the in-memory
+        content if called inside a :py:meth:`quarto_yml` transaction.
         """
         from os.path import join
         import yaml
+        if self._yml is not None: return self._yml
         ymlfile = join(self.config_get('quarto_dir'), "_quarto.yml")
         with open(ymlfile, "r") as fid:
-            content = yaml.load("".join(fid.readlines()), yaml.SafeLoader)
+            # Use the libyaml based loader if available (faster)
+            content = yaml.load(fid, getattr(yaml, "CSafeLoader", yaml.SafeLoader))
         return content
 
 
     def _save_yaml(self, content):
         """Save (Updated) YML File
 
-        Writes the dictionary back to `_quarto.yml`.
+        Writes the dictionary back to `_quarto.yml`. Inside a
+        :py:meth:`quarto_yml` transaction the content is only kept in
+        memory and written when the transaction ends.
         """
         from os.path import join
         import yaml
         assert isinstance(content, dict), TypeError("argument `content` expected to be dict")
+        if self._yml is not None:
+            self._yml = content
+            return
+        from os.path import isfile, normpath
         ymlfile = join(self.config_get('quarto_dir'), "_quarto.yml")
-        with open(ymlfile, "w+") as fid: fid.write(yaml.dump(content))
+        # Use the libyaml based dumper if available (faster)
+        content = yaml.dump(content, Dumper = getattr(yaml, "CDumper", yaml.Dumper))
+        # Only rewrite (and mark as modified) if the content changed
+        if isfile(ymlfile):
+            with open(ymlfile, "r") as fid:
+                if fid.read() == content: return
+        with open(ymlfile, "w+") as fid: fid.write(content)
+        self._mark_modified([ymlfile])
 
 
     def _add_website_option(self, key, value):
@@ -740,8 +1812,9 @@ class DocConverter:
         if not match("^https?:\/\/", url):
             raise ValueError(f"url (\"{url}\") does not look like a valid URL")
 
-        self._add_website_option("repo-url", url)
-        self._add_website_option("repo-branch", branch)
+        with self.quarto_yml():
+            self._add_website_option("repo-url", url)
+            self._add_website_option("repo-branch", branch)
 
     def add_issue_url(self, url):
         """Adding URL to Issue Trackign Page
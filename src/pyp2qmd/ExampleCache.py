@@ -0,0 +1,178 @@
+
+
+class ExampleCache:
+    """Example Result Cache
+
+    Persistent cache for the results of the examples executed by
+    :py:class:`ExampleRunner <pyp2qmd.ExampleRunner.ExampleRunner>`, such
+    that only new or modified examples are executed. Entries are identified by
+    the hash of the (prepared) example code of a symbol, the version of the
+    package documented, and the Python version. Only results of segments which
+    passed or failed are cached (timeouts and crashed processes are executed
+    again).
+
+    The cache is stored as a JSON file. If its size exceeds `maxsize`, the
+    least recently used entries are dropped when saving the cache.
+
+    Args:
+        file (str): Name of the cache file.
+        version (str): Version of the package documented.
+        maxsize (int): Maximum size of the cache (bytes), defaults to 16 MB.
+
+    Return:
+        Initializes a new object of class `ExampleCache`; loads the
+        existing cache file if there is one.
+
+    Raises:
+        TypeError: If `file` or `version` are not str.
+        TypeError: If `maxsize` is not int.
+        ValueError: If `maxsize` is negative.
+    """
+
+    # Version of the cache format; entries of other formats are dropped
+    SCHEMA = 1
+
+    def __init__(self, file, version, maxsize = 16 * 1024 * 1024):
+        from platform import python_version
+
+        if not isinstance(file, str):
+            raise TypeError("argument `file` must be str")
+        if not isinstance(version, str):
+            raise TypeError("argument `version` must be str")
+        if not isinstance(maxsize, int) or isinstance(maxsize, bool):
+            raise TypeError("argument `maxsize` must be int")
+        elif maxsize < 0:
+            raise ValueError("argument `maxsize` must not be negative")
+
+        self._file    = file
+        self._version = version
+        self._python  = python_version()
+        self._maxsize = maxsize
+        self._entries = self._load()
+        self._clock   = max([x["used"] for x in self._entries.values()] + [0])
+        self._hits    = 0
+        self._misses  = 0
+        self._evicted = 0
+
+
+    def _load(self):
+        import json
+        from os.path import isfile
+
+        if not isfile(self._file): return dict()
+        try:
+            with open(self._file, "r") as fid:
+                content = json.load(fid)
+        except Exception:
+            # Broken cache; start from scratch (executes all examples)
+            return dict()
+        if not isinstance(content, dict) or content.get("schema") != self.SCHEMA or \
+           not isinstance(content.get("entries"), dict):
+            return dict()
+        return content["entries"]
+
+
+    def key(self, segments):
+        """Cache Key
+
+        Args:
+            segments (list): List of str, the code segments of a symbol.
+
+        Returns:
+            str: Hex digest (sha1) of the code, the package version, and the
+            Python version.
+        """
+        import json
+        from hashlib import sha1
+        h = sha1(f"{self._version}\0{self._python}\0".encode())
+        h.update(json.dumps(segments).encode())
+        return h.hexdigest()
+
+
+    def get(self, segments):
+        """Get Cached Results
+
+        Args:
+            segments (list): List of str, the code segments of a symbol.
+
+        Returns:
+            None or list: `None` if not cached, else the results of all segments
+            (see :py:meth:`ExampleRunner.run_symbol <pyp2qmd.ExampleRunner.ExampleRunner.run_symbol>`,
+            without `symbol` and `segment`).
+        """
+        entry = self._entries.get(self.key(segments))
+        if entry is None:
+            self._misses += 1
+            return None
+        self._clock += 1
+        entry["used"] = self._clock
+        self._hits   += 1
+        return entry["results"]
+
+
+    def add(self, segments, results):
+        """Add Results
+
+        Results are only added if all segments passed or failed.
+
+        Args:
+            segments (list): List of str, the code segments of a symbol.
+            results (list): Results of all segments (see :py:meth:`get`).
+
+        Returns:
+            bool: `True` if added, else `False`.
+        """
+        import json
+        if not all(x["status"] in ("passed", "failed") for x in results): return False
+        results = [{k: v for k, v in x.items() if not k in ("symbol", "segment", "cached")}
+                   for x in results]
+        self._clock += 1
+        self._entries[self.key(segments)] = {"results": results, "used": self._clock,
+                                             "size": len(json.dumps(results))}
+        return True
+
+
+    def _evict(self):
+        total = sum(x["size"] for x in self._entries.values())
+        for key in sorted(self._entries, key = lambda k: self._entries[k]["used"]):
+            if total <= self._maxsize: break
+            total -= self._entries.pop(key)["size"]
+            self._evicted += 1
+
+
+    def save(self):
+        """Save Cache
+
+        Drops the least recently used entries if the cache exceeds `maxsize`
+        and writes the cache file (atomically).
+        """
+        import json
+        from os import replace
+        self._evict()
+        tmp = f"{self._file}.tmp"
+        with open(tmp, "w") as fid:
+            json.dump({"schema": self.SCHEMA, "entries": self._entries}, fid)
+        replace(tmp, self._file)
+
+
+    def stats(self):
+        """Cache Statistics
+
+        Returns:
+            dict: Dictionary with the number of `entries`, cache `hits`,
+            `misses`, and entries `evicted` in this run.
+        """
+        return {"entries": len(self._entries), "hits": self._hits,
+                "misses": self._misses, "evicted": self._evicted}
+
+
+    def __repr__(self):
+        """Standard Representation
+
+        Returns:
+            str: Standard representation of the class.
+        """
+        s = self.stats()
+        return f"{self.__module__} Object: {s['entries']} entries, " + \
+               f"{s['hits']} hits, {s['misses']} misses"
+
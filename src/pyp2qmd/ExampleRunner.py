@@ -0,0 +1,266 @@
+
+
+# Executed in a separate python process; runs the segments of the examples
+# of one symbol (sharing one namespace, like the chunks of a quarto page).
+_CHILD = r"""
+import sys, io, json, time, traceback, contextlib
+cfg = json.load(sys.stdin)
+try:
+    import resource
+    if cfg["memory"] > 0: resource.setrlimit(resource.RLIMIT_AS, (cfg["memory"], cfg["memory"]))
+except ImportError:
+    pass
+# Not derived from Exception such that examples cannot catch it by accident;
+# `fired` is set even if an example swallows it (the alarm repeats every second)
+class _Timeout(BaseException): pass
+fired = []
+try:
+    import signal
+    def alarm(*args):
+        fired.append(True)
+        raise _Timeout(f"timed out after {cfg['timeout']} seconds")
+    signal.signal(signal.SIGALRM, alarm)
+    timer = lambda t: signal.setitimer(signal.ITIMER_REAL, t, 1. if t > 0 else 0.)
+except (ImportError, AttributeError):
+    timer = lambda t: None
+
+ns, res = {"__name__": "__main__"}, []
+for code in cfg["segments"]:
+    out, start, status, message = io.StringIO(), time.perf_counter(), "passed", None
+    fired.clear()
+    try:
+        try:
+            timer(cfg["timeout"])
+            with contextlib.redirect_stdout(out), contextlib.redirect_stderr(out):
+                exec(compile(code, "<example>", "exec"), ns)
+        finally:
+            timer(0)
+    except _Timeout:
+        pass
+    except BaseException as e:
+        status, message = "failed", "".join(traceback.format_exception_only(type(e), e)).strip()
+        out.write(traceback.format_exc())
+    if fired:
+        status, message = "timeout", f"timed out after {cfg['timeout']} seconds"
+    res.append({"status": status, "message": message, "output": out.getvalue()[-5000:],
+                "seconds": time.perf_counter() - start})
+    with open(cfg["result"], "w") as fid: json.dump(res, fid)
+"""
+
+
+class ExampleRunner:
+    """Example Runner
+
+    Executes the code of the examples in the docstrings (see
+    :py:meth:`ManPage.example_segments <pyp2qmd.ManPage.ManPage.example_segments>`)
+    directly, without rendering the examples pages using quarto. The examples
+    of each symbol are executed in a separate (isolated) python process,
+    segment by segment in one namespace (like the code chunks of a quarto page);
+    up to `jobs` processes run in parallel. Each segment is limited to `timeout`
+    seconds, the memory of each process can be limited (POSIX only).
+
+    Args:
+        timeout (int, float): Maximum time (seconds) per segment, defaults to `60`.
+        memory_limit (int): Maximum memory (address space, megabytes) of each
+            process, defaults to `0` (no limit).
+        jobs (int): Number of processes run in parallel, defaults to `1`;
+            `0` uses one process per CPU.
+        cwd (None, str): Working directory of the processes. If `None` (default)
+            the current working directory.
+
+    Return:
+        Initializes a new object of class `ExampleRunner`.
+
+    Raises:
+        TypeError: If `timeout` is not int or float.
+        ValueError: If `timeout` is not positive.
+        TypeError: If `memory_limit` or `jobs` are not int.
+        ValueError: If `memory_limit` or `jobs` are negative.
+        TypeError: If `cwd` is not None or str.
+    """
+
+    def __init__(self, timeout = 60, memory_limit = 0, jobs = 1, cwd = None):
+        if not isinstance(timeout, (int, float)) or isinstance(timeout, bool):
+            raise TypeError("argument `timeout` must be int or float")
+        elif not timeout > 0:
+            raise ValueError("argument `timeout` must be positive")
+        if not isinstance(memory_limit, int) or isinstance(memory_limit, bool):
+            raise TypeError("argument `memory_limit` must be int")
+        elif memory_limit < 0:
+            raise ValueError("argument `memory_limit` must not be negative")
+        if not isinstance(jobs, int) or isinstance(jobs, bool):
+            raise TypeError("argument `jobs` must be int")
+        elif jobs < 0:
+            raise ValueError("argument `jobs` must not be negative")
+        if not isinstance(cwd, (type(None), str)):
+            raise TypeError("argument `cwd` must be None or str")
+
+        self._timeout = timeout
+        self._memory  = memory_limit
+        self._jobs    = jobs
+        self._cwd     = cwd
+
+
+    def run_symbol(self, symbol, segments):
+        """Run Examples of a Symbol
+
+        Args:
+            symbol (str): Name of the symbol (used in the report).
+            segments (list): List of str, the code segments to be executed.
+
+        Returns:
+            list: One dictionary per segment with the `symbol`, the `segment`
+            (starting at `1`), the `status` (`"passed"`, `"failed"`, `"timeout"`,
+            or `"error"` if the process crashed, e.g., out of memory), a `message`
+            (`None` if passed), the captured `output`, and the time used (`seconds`).
+        """
+        import sys
+        import json
+        from os import environ, close, remove
+        from subprocess import run, TimeoutExpired
+        from tempfile import mkstemp
+
+        fd, result = mkstemp(prefix = ".pyp2qmd_example_", suffix = ".json")
+        close(fd)
+        cfg = {"segments": segments, "timeout": self._timeout, "result": result,
+               "memory": self._memory * 1024 * 1024}
+        env = dict(environ, MPLBACKEND = "Agg")
+
+        error = None
+        try:
+            # Fallback if the timer in the process does not fire (e.g., blocked in C code)
+            proc = run([sys.executable, "-c", _CHILD], input = json.dumps(cfg), cwd = self._cwd,
+                       env = env, capture_output = True, text = True,
+                       timeout = self._timeout * len(segments) + 10)
+            if proc.returncode != 0:
+                error = f"process exited with status {proc.returncode}: {proc.stderr.strip()[-2000:]}"
+        except TimeoutExpired:
+            error = f"process killed after {self._timeout * len(segments) + 10} seconds"
+        try:
+            with open(result, "r") as fid: done = json.load(fid)
+        except Exception:
+            done = []
+        finally:
+            remove(result)
+
+        res = []
+        for i in range(len(segments)):
+            if i < len(done):
+                rec = done[i]
+            else:
+                # Not finished (process crashed or killed)
+                rec = {"status": "error", "message": error, "output": "", "seconds": 0.}
+            res.append(dict(rec, symbol = symbol, segment = i + 1))
+        return res
+
+
+    def run(self, examples, cache = None):
+        """Run Examples
+
+        Args:
+            examples (list): List of tuples `(symbol, segments)`, see
+                :py:meth:`run_symbol`.
+            cache (None, ExampleCache): If set, examples with cached results
+                are not executed (see :py:class:`ExampleCache <pyp2qmd.ExampleCache.ExampleCache>`);
+                the results of all examples executed are added to the cache.
+
+        Returns:
+            list: Results of all segments of all symbols (same order as `examples`),
+            see :py:meth:`run_symbol`. Each result has an additional element
+            `cached` (`True` if taken from the cache).
+        """
+        from os import cpu_count
+
+        examples = [x for x in examples if len(x[1]) > 0]
+        res, todo = [None] * len(examples), []
+        for i, (symbol, segments) in enumerate(examples):
+            tmp = None if cache is None else cache.get(segments)
+            if tmp is None:
+                todo.append(i)
+            else:
+                res[i] = [dict(rec, symbol = symbol, segment = k + 1, cached = True)
+                          for k, rec in enumerate(tmp)]
+
+        jobs = cpu_count() if self._jobs == 0 else self._jobs
+        if jobs == 1 or len(todo) < 2:
+            done = [self.run_symbol(*examples[i]) for i in todo]
+        else:
+            # Threads only wait for the processes running the examples
+            from concurrent.futures import ThreadPoolExecutor
+            with ThreadPoolExecutor(min(jobs, len(todo))) as pool:
+                done = list(pool.map(lambda i: self.run_symbol(*examples[i]), todo))
+        for i, tmp in zip(todo, done):
+            if cache is not None: cache.add(examples[i][1], tmp)
+            res[i] = [dict(rec, cached = False) for rec in tmp]
+        return [rec for x in res for rec in x]
+
+
+    @staticmethod
+    def summary(results):
+        """Summary of Results
+
+        Args:
+            results (list): Results as returned by :py:meth:`run`.
+
+        Returns:
+            dict: Number of segments (`total`), number of segments per status,
+            and number of results taken from the cache (`cached`).
+        """
+        res = {"total": len(results), "passed": 0, "failed": 0, "timeout": 0, "error": 0,
+               "cached": sum(1 for x in results if x.get("cached"))}
+        for rec in results: res[rec["status"]] = res.get(rec["status"], 0) + 1
+        return res
+
+
+    def write_json(self, file, results):
+        """Write JSON Report
+
+        Args:
+            file (str): Name of the JSON file.
+            results (list): Results as returned by :py:meth:`run`.
+        """
+        import json
+        content = {"summary": self.summary(results), "timeout": self._timeout,
+                   "memory_limit": self._memory, "results": results}
+        with open(file, "w") as fid:
+            json.dump(content, fid, indent = 2, sort_keys = True)
+
+
+    def write_junit(self, file, results, name = "pyp2qmd examples"):
+        """Write JUnit XML Report
+
+        One test case per segment (class name is the symbol); results taken
+        from the cache have the property `cached`.
+
+        Args:
+            file (str): Name of the XML file.
+            results (list): Results as returned by :py:meth:`run`.
+            name (str): Name of the test suite.
+        """
+        from xml.etree import ElementTree as ET
+
+        s = self.summary(results)
+        suite = ET.Element("testsuite", name = name, tests = str(s["total"]),
+                           failures = str(s["failed"] + s["timeout"]), errors = str(s["error"]),
+                           time = f"{sum(x['seconds'] for x in results):.3f}")
+        for rec in results:
+            case = ET.SubElement(suite, "testcase", classname = rec["symbol"],
+                                 name = f"segment {rec['segment']}", time = f"{rec['seconds']:.3f}")
+            if rec.get("cached"):
+                prop = ET.SubElement(ET.SubElement(case, "properties"), "property")
+                prop.set("name", "cached"); prop.set("value", "true")
+            if rec["status"] != "passed":
+                tag = "error" if rec["status"] == "error" else "failure"
+                ET.SubElement(case, tag, message = rec["message"] or "", type = rec["status"]).text = rec["output"]
+        ET.ElementTree(suite).write(file, encoding = "utf-8", xml_declaration = True)
+
+
+    def __repr__(self):
+        """Standard Representation
+
+        Returns:
+            str: Standard representation of the class.
+        """
+        mem = f"{self._memory} MB" if self._memory > 0 else "unlimited"
+        return f"{self.__module__} Object: timeout {self._timeout}s, memory {mem}, jobs {self._jobs}"
+
@@ -0,0 +1,163 @@
+
+
+class FileWriter:
+    """Background File Writer
+
+    Pipelined output stage used by
+    :py:class:`DocConverter <pyp2qmd.DocConverter.DocConverter>`: pages are
+    pushed into a bounded queue (see :py:meth:`put`) and written by a pool of
+    writer threads while the next pages are rendered. Files are written using
+    :py:meth:`ManPage.write_file <pyp2qmd.ManPage.ManPage.write_file>`
+    (unchanged files are not rewritten), missing directories are created once
+    per directory.
+
+    If the queue is full, :py:meth:`put` blocks until a writer is ready
+    (back-pressure; at most `maxsize` pages are held in memory). If a write
+    fails, the remaining pages are discarded and the exception is re-raised
+    in the calling thread (by the next call of :py:meth:`put` or
+    :py:meth:`join`).
+
+    Args:
+        threads (int): Number of writer threads, defaults to `1`.
+        maxsize (int): Maximum number of pages in the queue, defaults to `64`.
+
+    Return:
+        Initializes a new object of class `FileWriter`; starts the writer threads.
+        Should be used as a context manager (or :py:meth:`close` called).
+
+    Raises:
+        TypeError: If `threads` or `maxsize` are not int.
+        ValueError: If `threads` or `maxsize` are not positive.
+    """
+
+    def __init__(self, threads = 1, maxsize = 64):
+        from queue import Queue
+        from threading import Thread, Lock
+
+        if not isinstance(threads, int) or isinstance(threads, bool):
+            raise TypeError("argument `threads` must be int")
+        elif threads < 1:
+            raise ValueError("argument `threads` must be positive")
+        if not isinstance(maxsize, int) or isinstance(maxsize, bool):
+            raise TypeError("argument `maxsize` must be int")
+        elif maxsize < 1:
+            raise ValueError("argument `maxsize` must be positive")
+
+        self._queue   = Queue(maxsize)
+        self._lock    = Lock()
+        self._dirs    = set()
+        self._results = []
+        self._error   = None
+        self._threads = [Thread(target = self._run, daemon = True) for i in range(threads)]
+        for t in self._threads: t.start()
+
+
+    def _makedirs(self, file):
+        """Create directory of `file` if needed (once per directory)"""
+        from os import makedirs
+        from os.path import dirname
+        path = dirname(file)
+        if path == "" or path in self._dirs: return
+        with self._lock:
+            if path in self._dirs: return
+            try:
+                makedirs(path, exist_ok = True)
+            except Exception as e:
+                raise Exception(f"cannot create {path}: {e}")
+            self._dirs.add(path)
+
+
+    def _run(self):
+        from time import perf_counter
+        from .ManPage import ManPage
+
+        while True:
+            item = self._queue.get()
+            try:
+                if item is None: return
+                # Discard remaining pages after an error
+                if self._error is not None: continue
+                file, content = item
+                start = perf_counter()
+                self._makedirs(file)
+                changed = ManPage.write_file(file, content)
+                with self._lock:
+                    self._results.append((file, changed, perf_counter() - start))
+            except BaseException as e:
+                with self._lock:
+                    if self._error is None: self._error = e
+            finally:
+                self._queue.task_done()
+
+
+    def _raise(self):
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise error
+
+
+    def put(self, file, content):
+        """Add File
+
+        Blocks while the queue is full.
+
+        Args:
+            file (str): Path to the output file.
+            content (str): Content to be written.
+
+        Raises:
+            Exception: Whatever has been raised by a previous write.
+        """
+        if not self._threads:
+            raise Exception("FileWriter has already been closed")
+        self._raise()
+        self._queue.put((file, content))
+
+
+    def join(self):
+        """Wait for All Writes
+
+        Returns:
+            list: List of tuples `(file, changed, seconds)` for all files
+            written since the last call (`changed` is `False` if the file
+            was unchanged).
+
+        Raises:
+            Exception: Whatever has been raised by one of the writes.
+        """
+        self._queue.join()
+        with self._lock:
+            res, self._results = self._results, []
+        self._raise()
+        return res
+
+
+    def close(self):
+        """Stop Writer Threads
+
+        Waits for all pending writes and stops the threads. Exceptions of
+        pending writes are not re-raised (use :py:meth:`join`).
+        """
+        for t in self._threads: self._queue.put(None)
+        for t in self._threads: t.join()
+        self._threads = []
+
+
+    def __enter__(self):
+        return self
+
+
+    def __exit__(self, *args):
+        self.close()
+        return False
+
+
+    def __repr__(self):
+        """Standard Representation
+
+        Returns:
+            str: Standard representation of the class.
+        """
+        return f"{self.__module__} Object: {len(self._threads)} threads, " + \
+               f"queue size {self._queue.maxsize}"
+
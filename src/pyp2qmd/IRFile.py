@@ -0,0 +1,216 @@
+
+
+# Records and CrossReferences of the worker processes (see IRFile.render)
+_worker = dict()
+
+def _init_worker(file, config):
+    """Initialize worker process (or the current process if `jobs = 1`)"""
+    ir = IRFile(file)
+    _worker["config"]  = config
+    _worker["records"] = ir.load()
+    _worker["refs"]    = ir.references()
+
+def _render_record(fullname):
+    """Render the man page of a record; returns `(file, content, unresolved)`"""
+    from .ManPage import ManPage
+    man = ManPage.from_record(_worker["records"][fullname], _worker["config"],
+                              refs = _worker["refs"], records = _worker["records"])
+    content = "".join(man.render([]) + ["\n"])
+    return man.qmdfile(), content, _worker["refs"].pop_unresolved()
+
+
+class IRFile:
+    """Intermediate Representation File
+
+    Two-stage pipeline: the expensive part (importing the package, inspecting
+    the objects, parsing the docstrings) is done once by
+    :py:meth:`DocConverter.extract <pyp2qmd.DocConverter.DocConverter.extract>`
+    which stores one record per man page (see
+    :py:meth:`ManPage.to_record <pyp2qmd.ManPage.ManPage.to_record>`) in a
+    JSON Lines file. The man pages can then be rendered from this file
+    (see :py:meth:`render`) without importing the package, e.g., on
+    machines without the dependencies of the package, in parallel, and
+    repeatedly.
+
+    The first line of the file is a header (schema version, version of pyp2qmd,
+    package, options used for extraction), followed by one record per line
+    (functions, classes, methods) with the additional elements `kind` and
+    `fullname`.
+
+    Args:
+        file (str): Name of the JSON Lines file.
+
+    Return:
+        Initializes a new object of class `IRFile`.
+
+    Raises:
+        TypeError: If `file` is not str.
+    """
+
+    # Version of the file format
+    SCHEMA = 1
+
+    def __init__(self, file):
+        if not isinstance(file, str):
+            raise TypeError("argument `file` must be str")
+        self._file = file
+
+
+    def write(self, header, records):
+        """Write File
+
+        Records are written one by one (streaming); the file is replaced
+        once all records are written.
+
+        Args:
+            header (dict): Information about the extraction (package, options).
+            records (iterable): Records to be written (dictionaries).
+
+        Returns:
+            int: Number of records written.
+        """
+        import json
+        from os import replace, remove
+        from os.path import isfile
+        from . import __version__
+
+        tmp, n = f"{self._file}.tmp", 0
+        try:
+            with open(tmp, "w", encoding = "utf-8") as fid:
+                fid.write(json.dumps(dict(header, schema = self.SCHEMA, pyp2qmd = __version__)) + "\n")
+                for rec in records:
+                    fid.write(json.dumps(rec, separators = (",", ":")) + "\n")
+                    n += 1
+            replace(tmp, self._file)
+        except BaseException:
+            if isfile(tmp): remove(tmp)
+            raise
+        return n
+
+
+    def _lines(self):
+        import json
+        with open(self._file, "r", encoding = "utf-8") as fid:
+            for line in fid:
+                if line.strip(): yield json.loads(line)
+
+
+    def header(self):
+        """Header
+
+        Returns:
+            dict: The header of the file.
+
+        Raises:
+            Exception: If the file has not been written by pyp2qmd or has
+                an unsupported schema version.
+        """
+        for rec in self._lines():
+            if not isinstance(rec, dict) or rec.get("schema") != self.SCHEMA:
+                raise Exception(f"\"{self._file}\" is not a pyp2qmd IR file (schema {self.SCHEMA})")
+            return rec
+        raise Exception(f"\"{self._file}\" is empty")
+
+
+    def records(self):
+        """Iterate Over Records
+
+        Yields:
+            dict: One record per man page.
+        """
+        self.header()
+        lines = self._lines()
+        next(lines)
+        for rec in lines: yield rec
+
+
+    def load(self):
+        """Load All Records
+
+        Returns:
+            dict: All records by full name of the man page.
+        """
+        return dict((rec["fullname"], rec) for rec in self.records())
+
+
+    def references(self):
+        """Cross-References of All Pages
+
+        Returns:
+            CrossReferences: Object of class
+            :py:class:`CrossReferences <pyp2qmd.CrossReferences.CrossReferences>`
+            checking references against all pages in the file.
+        """
+        from .CrossReferences import CrossReferences
+        pages, aliases = [], dict()
+        for rec in self.records():
+            pages.append(rec["fullname"])
+            # Inherited methods documented on the base class (see `link_inherited`)
+            for name in rec["members"]:
+                if not name.startswith(f"{rec['fullname']}."):
+                    aliases[f"{rec['fullname']}.{name.rsplit('.', 1)[-1]}"] = name
+        return CrossReferences(pages = pages, aliases = aliases)
+
+
+    def render(self, config):
+        """Render Man Pages
+
+        Renders the man pages of all records and writes them into `man_dir`
+        (inside `quarto_dir`; see :py:class:`Config <pyp2qmd.Config.Config>`).
+        Does not import the package documented. Uses `jobs` worker processes;
+        unchanged files are not rewritten (see
+        :py:class:`FileWriter <pyp2qmd.FileWriter.FileWriter>`).
+
+        Args:
+            config (Config): Object of class :py:class:`Config <pyp2qmd.Config.Config>`.
+
+        Returns:
+            dict: Dictionary with the lists of files `written` and `unchanged`,
+            and the references which could not be resolved (`unresolved`;
+            reference and list of pages).
+
+        Raises:
+            TypeError: If `config` is not of class `Config`.
+        """
+        from os import cpu_count
+        from os.path import join
+        from .Config import Config
+        from .FileWriter import FileWriter
+
+        if not isinstance(config, Config):
+            raise TypeError("argument `config` must be of class `Config`")
+
+        names = [rec["fullname"] for rec in self.records()]
+        jobs  = cpu_count() if config.get("jobs") == 0 else config.get("jobs")
+
+        res, unresolved = {"written": [], "unchanged": []}, dict()
+        pool = None
+        if jobs == 1:
+            _init_worker(self._file, config)
+            rendered = map(_render_record, names)
+        else:
+            from concurrent.futures import ProcessPoolExecutor
+            pool = ProcessPoolExecutor(jobs, initializer = _init_worker, initargs = (self._file, config))
+            rendered = pool.map(_render_record, names, chunksize = max(1, len(names) // (4 * jobs)))
+        try:
+            with FileWriter(max(1, jobs)) as writer:
+                for file, content, missing in rendered:
+                    writer.put(join(config.get("quarto_dir"), file), content)
+                    for ref, page in missing: unresolved.setdefault(ref, set()).add(page)
+                for file, changed, _ in writer.join():
+                    res["written" if changed else "unchanged"].append(file)
+        finally:
+            if pool is not None: pool.shutdown()
+
+        res["unresolved"] = dict((k, sorted(unresolved[k])) for k in sorted(unresolved))
+        return res
+
+
+    def __repr__(self):
+        """Standard Representation
+
+        Returns:
+            str: Standard representation of the class.
+        """
+        return f"{self.__module__} Object: \"{self._file}\""
+
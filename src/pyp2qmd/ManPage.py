@@ -11,15 +11,31 @@ class ManPage:
         parent (None, str): `None` (default) if a class or function is documented.
             Used to document methods, in this case `parent` contains the name of
             the parent class as str.
+        cache (None, DocCache): Optional
+            :py:class:`DocCache <pyp2qmd.DocCache.DocCache>` used to share parsed
+            docstrings and signatures between man pages. If `None` (default)
+            the docstring is parsed on initialization.
+        refs (None, CrossReferences): Optional
+            :py:class:`CrossReferences <pyp2qmd.CrossReferences.CrossReferences>`
+            used to resolve cross-references. If `None` (default) references
+            are linked without checking whether the target exists.
+        detector (None, StyleDetector): Optional
+            :py:class:`StyleDetector <pyp2qmd.StyleDetector.StyleDetector>`
+            used to detect the style of the docstring if `docstringstyle = "AUTO"`.
+            If `None` (default) `docstring_parser` detects the style.
           
     Returns:
         Initializes an object of this class.
     """
 
-    def __init__(self, name, obj, config, parent = None):
+    # Process umask, used by write_file (see there)
+    _umask = None
+
+    def __init__(self, name, obj, config, parent = None, cache = None, refs = None, detector = None):
 
         from inspect import isfunction, isclass
         from .Config import Config
+        from .DocCache import DocCache
 
         # parent (None, str): If str, this will be removed from full name.
         if not isinstance(name, str):
@@ -30,19 +46,126 @@ class ManPage:
             raise TypeError("argument `parent` must be None or str")
         if not isinstance(config, Config):
             raise TypeError("argument `config` must be of class `Config`")
+        if not isinstance(cache, (type(None), DocCache)):
+            raise TypeError("argument `cache` must be None or of class `DocCache`")
+        from .CrossReferences import CrossReferences
+        if not isinstance(refs, (type(None), CrossReferences)):
+            raise TypeError("argument `refs` must be None or of class `CrossReferences`")
+        from .StyleDetector import StyleDetector
+        if not isinstance(detector, (type(None), StyleDetector)):
+            raise TypeError("argument `detector` must be None or of class `StyleDetector`")
 
         self._name    = name
         self._obj     = obj
         self._parent  = parent
         self._config  = config
+        self._cache   = cache
+        self._refs    = CrossReferences() if refs is None else refs
+        self._detector = detector
+        self._cache_entry = None
+        self._record  = None
+        self._objmodule = obj.__module__
 
         self._doc, self._signature, self._module = self._extract_docstring()
 
 
+    def to_record(self):
+        """Intermediate Representation
+
+        Everything needed to render the man page (see :py:meth:`from_record`),
+        serializable as JSON (e.g., stored by
+        :py:class:`IRFile <pyp2qmd.IRFile.IRFile>`).
+
+        Returns:
+            dict: Dictionary with the `name`, `parent`, `module` (see
+            :py:meth:`fullname`), the module of the object (`objmodule`),
+            whether or not it is a class (`isclass`), the parameters of the
+            `signature` (list of `[name, parameter]`; see :py:meth:`format_parameter`),
+            the parsed docstring (`doc`),
+            and the names of the `members` (classes only).
+        """
+        if self._record is not None: return self._record
+
+        doc = None
+        if self._doc is not None:
+            ret = self.get("returns")
+            doc = {"short_description": self.get("short_description"),
+                   "long_description":  self.get("long_description"),
+                   "params":   [{"args": list(x.args), "arg_name": x.arg_name, "description": x.description}
+                                for x in self.get("params")],
+                   "returns":  None if ret is None else {"type_name": ret.type_name, "description": ret.description},
+                   "raises":   [{"type_name": x.type_name, "description": x.description} for x in self.get("raises")],
+                   "examples": [{"description": x.description} for x in (self.get("examples") or [])]}
+        sig = None if self._signature is None else [list(x) for x in self._parameters()]
+        return {"name": self._name, "parent": self._parent, "module": self._module,
+                "objmodule": self._objmodule, "isclass": self.isclass(), "signature": sig,
+                "doc": doc, "members": [x[0] for x in self.getmembers()] if self.isclass() else []}
+
+
+    @classmethod
+    def from_record(cls, record, config, refs = None, records = None):
+        """Man Page from Intermediate Representation
+
+        Creates a man page from a record (see :py:meth:`to_record`) without
+        the object itself (does not require the package to be installed).
+
+        Args:
+            record (dict): The record, see :py:meth:`to_record`.
+            config (Config): Object of class :py:class:`Config <pyp2qmd.Config.Config>`.
+            refs (None, CrossReferences): Optional
+                :py:class:`CrossReferences <pyp2qmd.CrossReferences.CrossReferences>`.
+            records (None, dict): Records of all pages (by `name`); required to
+                list the methods of a class.
+
+        Returns:
+            ManPage: New object of class `ManPage`.
+
+        Raises:
+            TypeError: If `record` or `records` are not dict (or None).
+            TypeError: If `config` is not of class `Config`.
+        """
+        from types import SimpleNamespace as NS
+        from .Config import Config
+        from .CrossReferences import CrossReferences
+
+        if not isinstance(record, dict):
+            raise TypeError("argument `record` must be dict")
+        if not isinstance(config, Config):
+            raise TypeError("argument `config` must be of class `Config`")
+        if not isinstance(records, (type(None), dict)):
+            raise TypeError("argument `records` must be None or dict")
+
+        self = cls.__new__(cls)
+        self._name, self._obj, self._parent = record["name"], None, record["parent"]
+        self._config, self._cache, self._cache_entry = config, None, None
+        self._detector = None
+        self._refs    = CrossReferences() if refs is None else refs
+        self._record  = record
+        self._records = dict() if records is None else records
+        self._module, self._objmodule = record["module"], record["objmodule"]
+        self._signature = None if record["signature"] is None else NS(parameters = dict(record["signature"]))
+
+        doc = record["doc"]
+        if doc is None:
+            self._doc = None
+        else:
+            ret = doc["returns"]
+            self._doc = NS(short_description = doc["short_description"],
+                           long_description  = doc["long_description"],
+                           params   = [NS(**x) for x in doc["params"]],
+                           returns  = None if ret is None else NS(**ret),
+                           raises   = [NS(**x) for x in doc["raises"]],
+                           examples = [NS(**x) for x in doc["examples"]])
+        return self
+
+
     def _extract_docstring(self):
         """Extract Docstring
 
-        Helper function to extract the docstring.
+        Helper function to extract the docstring. If a cache is used and
+        the docstring has already been parsed, the cached result is returned.
+        If `docstringstyle = "AUTO"` and a detector is used, the style is
+        detected by the detector (full detection only if ambiguous).
 
         Returns:
             list: Returns a list with three elements containing
@@ -51,15 +174,31 @@ class ManPage:
         """
         import inspect
         from docstring_parser import DocstringStyle, parse
-        dstyle = getattr(DocstringStyle, self.config_get("docstringstyle").upper())
+        from .Profiler import phase
+        style = self.config_get("docstringstyle").upper()
+
+        raw = inspect.getdoc(self._obj)
+        if self._detector is not None and style == "AUTO":
+            with phase("detect_style"):
+                style = self._detector.style(raw, self._obj.__module__)
+        dstyle = getattr(DocstringStyle, style)
+        if self._cache is not None:
+            self._cache_entry = self._cache.get(self._obj, dstyle, raw)
+            if self._cache_entry is not None:
+                return self._cache_entry["extracted"]
 
         # If parent is None, extract docstring of main function or class.
-        docstring = parse(inspect.getdoc(self._obj), dstyle)
+        with phase("parse"):
+            docstring = parse(raw, dstyle)
+        if self._detector is not None: self._detector.add(self._obj.__module__, style)
         if docstring:
             res = [docstring, inspect.signature(self._obj), self._obj.__module__]
         else:
             res = [None, None, None]
 
+        if self._cache is not None:
+            self._cache_entry = self._cache.add(self._obj, dstyle, raw, res)
+
         return res
 
     def config_get(self, what):
@@ -91,14 +230,115 @@ class ManPage:
 
     def isclass(self):
         from inspect import isclass
+        if self._record is not None: return self._record["isclass"]
         return isclass(self._obj)
 
 
     def isfunction(self):
         from inspect import isfunction
+        if self._record is not None: return not self._record["isclass"]
         return isfunction(self._obj)
 
 
+    @staticmethod
+    def format_parameter(param, max_length = 100):
+        """Format Parameter
+
+        Like `str(param)` but the representation of the default value is
+        shortened to `max_length` characters using `reprlib` (large containers
+        are not converted in full; see `max_default_length` in
+        :py:class:`Config <pyp2qmd.Config.Config>`). Strings and bytes are
+        shortened in the middle (`'abc...xyz'`). Objects larger than
+        `64 * max_length` bytes (`sys.getsizeof`), and objects whose `repr()`
+        fails, are shown as `<ClassName object>`; for all other objects `repr()`
+        is called and its result shortened (a slow `__repr__` is not bounded).
+        Memory addresses of lambda functions are removed before shortening,
+        string literals are never cut.
+
+        Args:
+            param (inspect.Parameter): The parameter.
+            max_length (int): Maximum length of the default value, defaults to `100`.
+
+        Returns:
+            str: Formatted parameter.
+        """
+        from reprlib import Repr
+        from sys import getsizeof
+        from re import compile
+
+        if param.default is param.empty: return str(param)
+
+        relambda = compile(r"<lambda>\s+at\s+\w+>")
+        max_size = 64 * max_length
+
+        class BoundedRepr(Repr):
+            def _placeholder(self, x):
+                return f"<{type(x).__qualname__} object>"
+            def repr_int(self, x, level):
+                # Converting huge integers is quadratic (or raises ValueError)
+                if x.bit_length() > 4 * self.maxlong: return self._placeholder(x)
+                return super().repr_int(x, level)
+            def repr_str(self, x, level):
+                # Strings nested in containers are shortened like the containers
+                if level == self.maxlevel: return super().repr_str(x, level)
+                maxstring, self.maxstring = self.maxstring, max(10, self.maxtuple)
+                try:     return super().repr_str(x, level)
+                finally: self.maxstring = maxstring
+            # Bytes like strings (reprlib would use repr_instance)
+            repr_bytes = repr_str
+            def repr_instance(self, x, level):
+                try:
+                    if getsizeof(x) > max_size: return self._placeholder(x)
+                    s = relambda.sub("<lambda>>", repr(x))
+                except Exception:
+                    return self._placeholder(x)
+                return s if len(s) <= self.maxother else ManPage._truncate_repr(s, self.maxother)
+
+        rep = BoundedRepr()
+        rep.maxlevel = 3
+        rep.maxstring = rep.maxlong = rep.maxother = max_length
+        for attr in ["maxtuple", "maxlist", "maxarray", "maxdict", "maxset", "maxfrozenset", "maxdeque"]:
+            setattr(rep, attr, max_length // 3)
+        # reprlib sorts the keys of dictionaries; keep their order
+        if type(param.default) is dict and len(param.default) <= rep.maxdict:
+            default = "{" + ", ".join(f"{rep.repr1(k, rep.maxlevel - 1)}: {rep.repr1(v, rep.maxlevel - 1)}" for k, v in param.default.items()) + "}"
+        else:
+            default = rep.repr(param.default)
+        if len(default) > max_length: default = ManPage._truncate_repr(default, max_length)
+
+        sep = "=" if param.annotation is param.empty else " = "
+        return str(param.replace(default = param.empty)) + sep + default
+
+
+    @staticmethod
+    def _truncate_repr(text, max_length):
+        """Shortens `text` to `max_length` characters (incl. `"..."`) without cutting a string literal"""
+        cut, quote, start, i = max_length - 3, None, 0, 0
+        while i < cut:
+            c = text[i]
+            if quote is None:
+                if c in "'\"": quote, start = c, i
+            elif c == "\\": i += 1
+            elif c == quote: quote = None
+            i += 1
+        # Cut inside a literal: drop the whole literal (incl. prefixes like b'')
+        if quote is not None:
+            cut = start
+            while cut > 0 and text[cut - 1] in "bBrRuU": cut -= 1
+        return text[:cut] + "..."
+
+
+    def _parameters(self):
+        """Formatted parameters (list of `(name, str)`), computed once per object"""
+        if self._cache_entry is not None and "parameters" in self._cache_entry:
+            return self._cache_entry["parameters"]
+        n   = self.config_get("max_default_length")
+        res = [(k, p if isinstance(p, str) else self.format_parameter(p, n)) \
+               for k, p in self._signature.parameters.items()]
+        if self._cache_entry is not None: self._cache_entry["parameters"] = res
+        return res
+
+
     def _format_signature(self, name, max_length = 200, remove_self = False):
         """
         formatting of signature to get some line breaks in output
@@ -110,20 +350,23 @@ class ManPage:
         n = max_length - len(name) - 1
         formatted_params = []
         tmp = []
+        tmp_len = -2
 
         # Replacing '<lambda> at [memory pointer]>' with <lambda>
         relambda = compile("<lambda>\s+at\s+\w+>")
 
-        for k,p in self._signature.parameters.items():
-            # Removing lambda function mem addr, excaping html chars
-            p = escape(relambda.sub(r"<lambda>>", str(p)))
+        for k,p in self._parameters():
             if remove_self and k == "self": continue
-            tmp_len = max(0, sum([len(x) for x in tmp]) + (len(tmp) - 1) * 2)
-            if (tmp_len + len(p) + 1) <= n:
+            # Removing lambda function mem addr, excaping html chars
+            p = escape(relambda.sub(r"<lambda>>", p))
+            # Length of the current line (params joined by ", ") tracked incrementally
+            if (max(0, tmp_len) + len(p) + 1) <= n:
                 tmp.append(p)
+                tmp_len += len(p) + 2
             else:
                 formatted_params.append(", ".join(tmp))  
                 tmp = [p]
+                tmp_len = len(p)
 
         # First empty? Can happen if max_length very small
         if len(formatted_params) > 0 and formatted_params[0] == "":
@@ -137,6 +380,7 @@ class ManPage:
 
     def signature(self, remove_self = None, max_length = 200):
         from re import sub
+        from .Profiler import phase
 
         assert isinstance(remove_self, type(None)) or isinstance(remove_self, bool)
         assert isinstance(max_length, int)
@@ -150,19 +394,61 @@ class ManPage:
 
         if remove_self is None:
             remove_self = self._parent is not None
-        
-        return self._format_signature(name, max_length, remove_self)
+
+        if self._cache_entry is None:
+            with phase("signature"):
+                return self._format_signature(name, max_length, remove_self)
+
+        # Formatted signatures are cached alongside the parsed docstring
+        key = (name, max_length, remove_self)
+        if not key in self._cache_entry["signatures"]:
+            with phase("signature"):
+                self._cache_entry["signatures"][key] = self._format_signature(name, max_length, remove_self)
+        return self._cache_entry["signatures"][key]
 
 
     def getmembers(self):
+        # Created from a record: objects are not available
+        if self._record is not None:
+            return [(name, None) for name in self._record["members"]]
+        # Inherited methods are linked to the page of the base class (see `link_inherited`)
+        return [(self._refs.page(f"{self.fullname()}.{name}"), obj) for name, obj in \
+                self.list_members(self._obj, self.config_get("include_hidden"))]
+
+
+    def _member_page(self, name, obj):
+        """Man page of a member (methods table of class pages)"""
+        if self._record is None:
+            return ManPage(name, obj, self._config, cache = self._cache, refs = self._refs,
+                           detector = self._detector)
+        return ManPage.from_record(dict(self._records[name], parent = None), self._config,
+                                   refs = self._refs, records = self._records)
+
+
+    @staticmethod
+    def list_members(obj, include_hidden = False):
+        """List Members to be Documented
+
+        Args:
+            obj (class): The class to be documented.
+            include_hidden (bool): If `False` (default) members starting
+                with an underscore are excluded.
+
+        Returns:
+            list: List of tuples `(name, member)` with all functions and
+            classes of `obj` (excluding dunder members).
+        """
         import inspect
+        from .Profiler import phase
         members = []
-        for rec in inspect.getmembers(self._obj):
+        with phase("getmembers"):
+            recs = inspect.getmembers(obj)
+        for rec in recs:
             # requires three independent ifs here
             if rec[0].startswith("__"): continue
             if not inspect.isfunction(rec[1]) and not inspect.isclass(rec[1]): continue
-            if not self.config_get("include_hidden") and rec[1].__name__.startswith("_"): continue
-            members.append((f"{self.fullname()}.{rec[0]}", rec[1]))
+            if not include_hidden and rec[1].__name__.startswith("_"): continue
+            members.append(rec)
         return members
 
 
@@ -172,36 +458,36 @@ class ManPage:
         else:                               return getattr(self._doc, attr)
 
 
-    def write_qmd(self):
+    def qmdfile(self):
+        """Relative Path of the Manual Page
 
-        from os.path import isfile
-        import tempfile
-        import filecmp
+        Returns:
+            str: Path of the man page relative to `quarto_dir`, used for linking.
+        """
+        return f"{self.config_get('man_dir')}/{self.quartofile()}"
 
-        qmd   = f"{self.config_get('man_dir')}/{self.quartofile()}"
-        ofile = f"{self.config_get('quarto_dir')}/{qmd}"
 
-        if not isfile(ofile):
-            with open(ofile, "w+") as fid: print(self, file = fid)
-        else:
-            tmpfile = tempfile.NamedTemporaryFile()
-            with open(tmpfile.name, "w+") as fid: print(self, file = fid)
-            files_equal = filecmp.cmp(tmpfile.name, ofile)
-            # New file differs? Overwrite existing qmd. Re-write the file (not
-            # move the temporary file) to ensure correct file permissions.
-            if not files_equal:
-                with open(ofile, "w+") as fid: print(self, file = fid)
-            tmpfile.close()
+    def examplesfile(self):
+        """Path of the Examples File
+
+        Returns:
+            str: Path of the examples qmd (inside `examples_dir`).
+        """
+        return f"{self.config_get('examples_dir')}/{self.quartofile()}"
+
+
+    def write_qmd(self):
+
+        qmd = self.qmdfile()
+        self.write_file(f"{self.config_get('quarto_dir')}/{qmd}", "".join(self.render([]) + ["\n"]))
         
         # Return name of the qmd; used for linking
         return qmd
 
     def write_examples_qmd(self):
 
-        from os.path import isfile, isdir
+        from os.path import isdir
         from os import makedirs
-        import tempfile
-        import filecmp
 
         # No examples? Nothing to do!
         if not self.get("examples"): return None
@@ -213,22 +499,86 @@ class ManPage:
             except Exception as e:
                 raise Exception(f"cannot create {self.config_get('examples_dir')}: {e}")
 
-        qmd      = f"{self.config_get('examples_dir')}/{self.quartofile()}"
-        examples = self.get_example_qmd()
-
-        with open(qmd, "w+") as fid: print(examples, file = fid)
+        qmd = self.examplesfile()
+        self.write_file(qmd, "".join(self.render_examples([]) + ["\n"]))
         
         # Return name of the qmd; used for linking
         return qmd
 
 
-    def __repr_args(self):
+    @staticmethod
+    def write_file(file, content):
+        """Write File if Changed
+
+        Writes `content` into `file` unless the file already exists
+        with identical content (keeps the modification time of unchanged
+        pages such that quarto does not re-render them). The existing file
+        is compared by size first and by hash only if the sizes match.
 
+        New content is written into a temporary file in the same directory
+        which then replaces `file` (atomic rename), thus readers never see a
+        partially written file. Permissions of an existing file are retained.
+
+        Args:
+            file (str): Path to the output file.
+            content (str): Content to be written.
+
+        Returns:
+            bool: `True` if the file has been (re-)written, `False` if unchanged.
+        """
+        from os import stat, chmod, replace, remove, fdopen, umask
+        from os.path import dirname, basename, isfile
+        from stat import S_IMODE
+        from hashlib import sha1
+        from tempfile import mkstemp
+
+        content = content.encode("utf-8")
+
+        if isfile(file):
+            info = stat(file)
+            if info.st_size == len(content):
+                h = sha1()
+                with open(file, "rb") as fid:
+                    for chunk in iter(lambda: fid.read(65536), b""): h.update(chunk)
+                if h.digest() == sha1(content).digest(): return False
+            mode = S_IMODE(info.st_mode)
+        else:
+            # Default permissions for new files (respecting umask); evaluated
+            # once as reading the umask requires to (temporarily) change it.
+            if ManPage._umask is None:
+                ManPage._umask = umask(0); umask(ManPage._umask)
+            mode = 0o666 & ~ManPage._umask
+
+        fd, tmpfile = mkstemp(dir = dirname(file) or ".", prefix = f".{basename(file)}.")
+        try:
+            with fdopen(fd, "wb") as fid: fid.write(content)
+            chmod(tmpfile, mode)
+            replace(tmpfile, file)
+        except Exception:
+            if isfile(tmpfile): remove(tmpfile)
+            raise
+        return True
+
+
+    # Templates of the page sections (see render, render_examples)
+    _TEMPLATES = {
+        "title":    "---\ntitle: \"{}\"\n---\n\n",
+        "usage":    "\n\n### Usage\n\n<pre><code class='language-python'>{}</code></pre>",
+        "missing":  "<li>WARNING(missing argument definition \"{}\" in docstring)</li>",
+        "argclass": "<code class=\"argument-class\">{}</code>",
+        "arg":      "  <dt style = \"white-space: nowrap; font-family: monospace; vertical-align: top\">\n" + \
+                    "   <code id=\"{}:{}\">{}</code>{}\n  </dt>\n <dd>{}</dd>\n",
+        "returns":  "<code>{}</code>: ",
+        "method":   "    <dt style = \"white-space: nowrap; font-family: monospace; vertical-align: top\">\n" + \
+                    "       <code>[{}]({})</code>\n    </dt>\n    <dd>{}</dd>\n",
+        "raises":   "<li><code class=\"text-warning\">{}</code>: {}\n",
+    }
+
+    def __render_args(self, w):
+        """Write the 'Arguments' section (if there are arguments or warnings)"""
         from re import findall, sub
         from html import escape
 
-        res = ""
-
         # Given the signature, we should have the following parameters
         expected_args = list(self._signature.parameters.keys())
         # These are the available parameters (from the docstring)
@@ -239,193 +589,201 @@ class ManPage:
             expected_args.remove("self")
 
         # Check if any of the expected arguments is not documented
-        missing_args = []
-        for ea in expected_args:
-            if not ea in documented_args:
-                missing_args.append(ea)
+        missing_args = [ea for ea in expected_args if not ea in documented_args]
 
-        # Counting number of warnings and/or arguments added
-        counter = 0
+        # If no arguments or warnings have to be added, skip the section
+        if len(missing_args) == 0 and len(self.get("params")) == 0:
+            return
 
+        w("\n\n### Arguments\n\n")
         if len(missing_args) > 0:
-            counter += 1
-            res += "<ul>"
+            w("<ul>")
             for rec in missing_args:
-                res += f"<li>WARNING(missing argument definition \"{rec}\" in docstring)</li>"
-            res += "</ul>"
+                w(self._TEMPLATES["missing"].format(rec))
+            w("</ul>")
 
-        # Count arguments
-        res += "<dl class=\"pyp-list param-list\">\n"
+        w("<dl class=\"pyp-list param-list\">\n")
+        fullname = self.fullname()
         for arg in self.get("params"):
-            counter += 1
             # If we get "argument (class)" we separate them
             mtch = findall(r"^(.*)\((.*?)\)$", arg.args[1])
             if len(mtch) > 0:
                 arg_name = mtch[0][0].strip()
-                arg_cls  = f"<code class=\"argument-class\">{escape(mtch[0][1])}</code>"
+                arg_cls  = self._TEMPLATES["argclass"].format(escape(mtch[0][1]))
             else:
                 arg_name = arg.args[1].strip()
                 arg_cls  = ""
 
-            #short_arg = re.search("^([\*\w]+)", arg.args[1]).group(1).replace("*", "")
             # Building html table row
-            res += "  <dt style = \"white-space: nowrap; font-family: monospace; vertical-align: top\">\n" + \
-                   f"   <code id=\"{self.fullname()}:{arg_name}\">{escape(arg_name)}</code>{arg_cls}\n" + \
-                   "  </dt>\n" + \
-                   f" <dd>{self._add_references(arg.description)}</dd>\n"
-                   ####f" <dd>{escape(self._add_references(arg.description))}</dd>\n"
-
-        res += "</dl>"
-
-        # If no arguments or warnings have been added, return None
-        # such that we can skip to add the 'Arguments' section.
-        return None if counter == 0 else res
+            w(self._TEMPLATES["arg"].format(fullname, arg_name, escape(arg_name), arg_cls,
+                                            self._add_references(arg.description)))
+        w("</dl>")
 
 
-    def __repr_raises(self):
-        import xml.etree.ElementTree as et
+    def __render_raises(self, w):
         from html import escape
-        res = "<ul class=\"python-raises\">\n"
+        w("<ul class=\"python-raises\">\n")
         for rec in self.get("raises"):
-            res += f"<li><code class=\"text-warning\">{rec.type_name}</code>: " + \
-                   f"{escape(self._add_references(rec.description))}\n"
-        return res + "</ul>\n"
+            w(self._TEMPLATES["raises"].format(rec.type_name, escape(self._add_references(rec.description))))
+        w("</ul>\n")
 
 
-    def __repr__(self):
-        import re
-
+    def __render_title(self, w):
         if self.get("short_description") is None:
-            res  = "---\ntitle: \"WARNING(short_description missing)\"\n---\n\n"
+            w(self._TEMPLATES["title"].format("WARNING(short_description missing)"))
         else:
-            res  = "---\ntitle: \"" + \
-                   self._add_references(self.get("short_description")) + \
-                   "\"\n---\n\n"
+            w(self._TEMPLATES["title"].format(self._add_references(self.get("short_description"))))
+
+
+    def example_segments(self):
+        """Example Code Segments
+
+        Returns:
+            list: List of str with the code of the examples (see
+            :py:meth:`_prepare_example`), split into segments (see
+            :py:meth:`_split_example`). Each segment is one code chunk
+            on the man page. Empty list if there are no examples.
+        """
+        examples = []
+        for tmp in [ex.description for ex in (self.get("examples") or [])]:
+            # Prepare example and possibly split it.
+            tmp       = self._prepare_example(tmp)
+            examples += self._split_example(tmp)
+        return examples
+
+
+    def __render_examples(self, w, warning = True, error = True):
+        if not self.get("examples"): return
+
+        examples = self.example_segments()
+
+        w("\n\n### Examples\n\n")
+        for tmp in examples:
+            w(self.__repr_examples(tmp, warning = warning, error = error))
+        w("\n")
+
+
+    @staticmethod
+    def _writer(out):
+        """Function used to write fragments to `out` (list or file handle)"""
+        if isinstance(out, list): return out.append
+        elif hasattr(out, "write"): return out.write
+        raise TypeError("argument `out` must be a list or a file handle (has `.write()` method)")
+
+
+    def render(self, out):
+        """Render Man Page
+
+        Writes the man page (quarto markdown) fragment by fragment, either
+        appended to a list or written to a file handle. Used by `str()`
+        (and `repr()`) which return the page as a single string.
+
+        Args:
+            out (list, file handle): A list (fragments are appended) or an
+                object with a `write()` method (e.g., an open file).
+
+        Returns:
+            Returns `out`.
+
+        Raises:
+            TypeError: If `out` is neither a list nor has a `write()` method.
+
+        Examples:
+            >>> from pyp2qmd import Config, ManPage, Manifest
+            >>> config = Config()
+            >>> config.setup("document", "pyp2qmd")
+            >>> man = ManPage("Manifest", Manifest, config)
+            >>> page = "".join(man.render([]))
+            >>> page == str(man)
+        """
+        w = self._writer(out)
+
+        self.__render_title(w)
 
         if self.get("long_description"):
-            res += "### Description\n\n"
-            res += self._add_references(self.get("long_description"))
+            w("### Description\n\n")
+            w(self._add_references(self.get("long_description")))
         else:
-            res += "WARNING(long_description missing)"
+            w("WARNING(long_description missing)")
 
-        res += "\n\n### Usage\n\n"
-        res += "<pre><code class='language-python'>" + \
-               f"{self.signature(max_length = 50)}" + \
-               "</code></pre>"
+        w(self._TEMPLATES["usage"].format(self.signature(max_length = 50)))
 
         # Function arguments
-        tmp = self.__repr_args()
-        if tmp is not None:
-            res += "\n\n### Arguments\n\n" + tmp
+        self.__render_args(w)
 
         # Return value
         if self.get("returns"):
-            res += "\n\n### Return\n\n"
+            w("\n\n### Return\n\n")
             if self.get("returns").type_name:
-                res += f"<code>{self.get('returns').type_name}</code>: "
-            res += f"{self._add_references(self.get('returns').description)}"
+                w(self._TEMPLATES["returns"].format(self.get("returns").type_name))
+            w(f"{self._add_references(self.get('returns').description)}")
 
         # If is class, append methods
         if self.isclass():
 
-            res += "\n\n### Methods\n\n"
+            w("\n\n### Methods\n\n")
             # Convert package.module.class into package.module
-            parent = re.sub(r"\.[^.]*$", "", self.fullname())
+            parent = f"{self.fullname().rsplit('.', 1)[0]}."
 
-            res += "<dl class=\"pyp-list method-list\">\n"
+            w("<dl class=\"pyp-list method-list\">\n")
             for name,meth in self.getmembers():
-                m_man = ManPage(name, meth, self._config)
+                m_man = self._member_page(name, meth)
                 if m_man.get("short_description") is None:
                     short = "WARNING(short_description missing)"
                 else:
                     short = m_man.get("short_description")
 
                 # Adding <dt><dd> for current method
-                link = m_man.quartofile()
-                text = re.sub(f"^{parent}\.", "", m_man.signature(remove_self = True))
-                res += "    <dt style = \"white-space: nowrap; font-family: monospace; vertical-align: top\">\n" + \
-                       f"       <code>[{text}]({link})</code>\n    </dt>\n" + \
-                       f"    <dd>{short}</dd>\n"
-            res += "</dl>\n"
+                text = m_man.signature(remove_self = True)
+                if text.startswith(parent): text = text[len(parent):]
+                w(self._TEMPLATES["method"].format(text, m_man.quartofile(), short))
+            w("</dl>\n")
 
- 
         # If we have examples:
-        if self.get("examples"):
-            examples = []
-            for tmp in [ex.description for ex in self.get("examples")]:
-                # Prepare example and possibly split it.
-                tmp       = self._prepare_example(tmp)
-                examples += self._split_example(tmp)
-
-            res += "\n\n### Examples\n\n"
-            for tmp in examples:
-                res += self.__repr_examples(tmp)
-            res += "\n"
+        self.__render_examples(w)
 
         # If has documented raises exception
         if len(self.get("raises")) > 0:
-            res += "\n\n### Raises\n\n" + self.__repr_raises()
+            w("\n\n### Raises\n\n")
+            self.__render_raises(w)
 
- 
-        return res
+        return out
 
-    def get_example_qmd(self):
-        import re
 
-        if self.get("short_description") is None:
-            res  = "---\ntitle: \"WARNING(short_description missing)\"\n---\n\n"
-        else:
-            res  = "---\ntitle: \"" + \
-                   self._add_references(self.get("short_description")) + \
-                   "\"\n---\n\n"
+    def __repr__(self):
+        return "".join(self.render([]))
 
-        # If we have examples:
-        if self.get("examples"):
-            examples = []
-            for tmp in [ex.description for ex in self.get("examples")]:
-                # Prepare example and possibly split it.
-                tmp       = self._prepare_example(tmp)
-                examples += self._split_example(tmp)
-
-            res += "\n\n### Examples\n\n"
-            for tmp in examples:
-                res += self.__repr_examples(tmp, warning = False, error = False)
-            res += "\n"
 
-        return res
+    def render_examples(self, out):
+        """Render Examples Page
 
-    def _add_references(self, x):
-        import re
-        if x is None: return x
-
-        # Replace sphinx refs with quarto refs
-        matches = re.findall(r":py:(?:func|class|method):`.*?`", x)
-
-        # If any matches are found, set quarto references properly
-        for m in matches:
-            # Find basic match
-            tmp = re.search("py:(\w+?):`(.*?)(?=`)", m)
-            if tmp:
-                # Extact typ (func, class, or method) and the 'reference'
-                typ,ref = tmp.groups()
-                # If format is "name <ref>" we further decompose the match
-                ref2 = re.match("^(.*)\s+?<(.*?)>$", ref)
-                # Take `text <link>` from the docstring
-                if ref2:
-                    x = x.replace(m, f"[{ref2.group(1)}]({ref2.group(2)}.qmd)")
-                # IF we only have a `word` we expect that it refers
-                # to it's current module OR its class (if typ == "method")
-                elif re.match("^\w+$", ref):
-                    if typ == "method":
-                        cls = re.sub(r"\.\w+?$", "", self.fullname())
-                        x   = x.replace(m, f"[{ref}]({cls}.{ref}.qmd)")
-                    else:
-                        x   = x.replace(m, f"[{ref}]({self._obj.__module__}.{ref}.qmd)")
-                # Else take whatever we got
-                else:
-                    x = x.replace(m, f"[{ref}]({ref}.qmd)")
+        Like :py:meth:`render` but writes the examples page (title and
+        examples only, see :py:meth:`get_example_qmd`).
 
-        return x
+        Args:
+            out (list, file handle): A list (fragments are appended) or an
+                object with a `write()` method (e.g., an open file).
+
+        Returns:
+            Returns `out`.
+
+        Raises:
+            TypeError: If `out` is neither a list nor has a `write()` method.
+        """
+        w = self._writer(out)
+        self.__render_title(w)
+        self.__render_examples(w, warning = False, error = False)
+        return out
+
+
+    def get_example_qmd(self):
+        return "".join(self.render_examples([]))
+
+
+    def _add_references(self, x):
+        from .Profiler import phase
+        with phase("references"):
+            return self._refs.resolve(x, self.fullname(), self._objmodule)
 
 
     def __repr_examples(self, x, warning = True, error = True):
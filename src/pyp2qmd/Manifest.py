@@ -0,0 +1,258 @@
+
+
+class Manifest:
+    """Incremental Build Manifest
+
+    Keeps track of the man pages created by
+    :py:class:`DocConverter <pyp2qmd.DocConverter.DocConverter>`. For each
+    symbol (function, class, method) a fingerprint is stored, calculated from
+    the docstring, the signature, the relevant config options and the version
+    of pyp2qmd. Symbols whose fingerprint has not changed since the last
+    run do not need to be parsed and rendered again. For symbols whose
+    docstrings contain cross-references the link targets are included (see
+    :py:meth:`CrossReferences.digest <pyp2qmd.CrossReferences.CrossReferences.digest>`),
+    such that their pages are rebuilt if a target has been added or removed.
+
+    The manifest is stored as a JSON file (`.pyp2qmd_manifest.json`)
+    inside `man_dir` (one manifest per package in batch mode).
+
+    Args:
+        config (Config): Object of class :py:class:`Config <pyp2qmd.Config.Config>`.
+
+    Return:
+        Initializes a new object of class `Manifest`; loads the existing
+        manifest file if there is one.
+
+    Raises:
+        TypeError: If `config` is not of class :py:class:`Config <pyp2qmd.Config.Config>`.
+    """
+
+    # Name of the manifest file (stored inside man_dir)
+    FILENAME = ".pyp2qmd_manifest.json"
+
+    # Config options which affect the content of the man pages
+    CONFIG_OPTIONS = ["man_dir", "docstringstyle", "include_hidden", "max_default_length",
+                      "link_inherited"]
+
+    def __init__(self, config):
+        from .Config import Config
+        from os.path import join
+
+        if not isinstance(config, Config):
+            raise TypeError("argument `config` must be of class `Config`")
+
+        self._config  = config
+        self._file    = join(config.get("quarto_dir"), config.get("man_dir"), self.FILENAME)
+        self._version = self.pyp2qmd_version()
+        self._old     = self._load()
+        self._new     = dict()
+        self._counts  = {"rebuilt": 0, "skipped": 0, "removed": 0}
+
+
+    @staticmethod
+    def pyp2qmd_version():
+        """Version of pyp2qmd
+
+        Returns:
+            str: Version of pyp2qmd (`pyp2qmd.__version__`).
+        """
+        from . import __version__
+        return __version__
+
+
+    def _load(self):
+        import json
+        from os.path import isfile
+
+        if not isfile(self._file): return dict()
+        try:
+            with open(self._file, "r") as fid:
+                content = json.load(fid)
+        except Exception:
+            # Broken manifest; start from scratch (rebuilds all pages)
+            return dict()
+        if not isinstance(content, dict) or not isinstance(content.get("pages"), dict):
+            return dict()
+        return content["pages"]
+
+
+    def save(self):
+        """Save Manifest
+
+        Writes the records of the current run into the manifest file.
+        """
+        import json
+        content = {"pyp2qmd": self._version, "pages": self._new}
+        with open(self._file, "w") as fid:
+            json.dump(content, fid, indent = 1, sort_keys = True)
+
+
+    def fingerprint(self, obj, members = None, refs = None):
+        """Fingerprint of a Symbol
+
+        Args:
+            obj (function or class): The object documented.
+            members (None, list): List of `(name, obj)` tuples with the
+                members of `obj` listed on its man page (classes only).
+            refs (None, CrossReferences): Object of class
+                :py:class:`CrossReferences <pyp2qmd.CrossReferences.CrossReferences>`
+                used to render the page; its link targets are included if
+                the docstrings contain references (see :py:meth:`has_references`).
+
+        Returns:
+            str: Hex digest (sha1) of the docstring, signature, module, and name
+            of `obj` (and its members), the relevant config options, the link
+            targets (if needed), and the version of pyp2qmd.
+        """
+        from hashlib import sha1
+
+        h = sha1(self._version.encode())
+        for opt in self.CONFIG_OPTIONS:
+            h.update(f"\0{opt}={self._config.get(opt)}".encode())
+        h.update(self._describe(obj).encode())
+        for name, member in ([] if members is None else members):
+            h.update(f"\0{name}\0{self._describe(member)}".encode())
+        if refs is not None and self.has_references(obj, members):
+            h.update(f"\0refs={refs.digest()}".encode())
+        return h.hexdigest()
+
+
+    @staticmethod
+    def has_references(obj, members = None):
+        """Docstrings with Cross-References
+
+        Args:
+            obj (function or class): The object documented.
+            members (None, list): List of `(name, obj)` tuples with the
+                members of `obj` (classes only).
+
+        Returns:
+            bool: `True` if the docstring of `obj` or one of its members
+            contains a cross-reference (`:py:` role), else `False`.
+        """
+        from inspect import getdoc
+        objs = [obj] + [x[1] for x in ([] if members is None else members)]
+        return any(":py:" in (getdoc(x) or "") for x in objs)
+
+
+    def _describe(self, obj):
+        import inspect
+        from re import sub
+        from .ManPage import ManPage
+        try:
+            # Default values as shown on the man pages (shortened, see ManPage.format_parameter)
+            n   = self._config.get("max_default_length")
+            sig = inspect.signature(obj)
+            sig = ", ".join(ManPage.format_parameter(p, n) for p in sig.parameters.values()) + \
+                  f" -> {sig.return_annotation}"
+            # Removing memory addresses (e.g., of lambda defaults) which change every run
+            sig = sub(r"\s+at\s+0x[0-9a-fA-F]+", "", sig)
+        except Exception:
+            sig = ""
+        return "\0".join([str(getattr(obj, "__module__", "")),
+                          str(getattr(obj, "__qualname__", "")),
+                          sig, str(inspect.getdoc(obj))])
+
+
+    def get(self, key, fingerprint):
+        """Get Unchanged Record
+
+        Args:
+            key (str): Identifier of the symbol.
+            fingerprint (str): Current fingerprint of the symbol, see
+                :py:meth:`fingerprint`.
+
+        Returns:
+            None or dict: `None` if the symbol has to be rebuilt, else the
+            record of the last run, a dictionary containing the `file`
+            (relative to `quarto_dir`) and the `members` of the page.
+        """
+        from os.path import isfile, join
+
+        rec = self._old.get(key)
+        if rec is None or rec.get("fingerprint") != fingerprint:
+            return None
+        # Page deleted in the meantime?
+        elif not isfile(join(self._config.get("quarto_dir"), rec["file"])):
+            return None
+        return rec
+
+
+    def previous(self, key):
+        """Get Record of the Last Run
+
+        Args:
+            key (str): Identifier of the symbol.
+
+        Returns:
+            None or dict: Like :py:meth:`get` but without checking the fingerprint
+            (the record also contains the `fingerprint` of the last run).
+        """
+        from os.path import isfile, join
+
+        rec = self._old.get(key)
+        if rec is None or not isfile(join(self._config.get("quarto_dir"), rec["file"])):
+            return None
+        return rec
+
+
+    def add(self, key, fingerprint, file, members, skipped):
+        """Add Record
+
+        Args:
+            key (str): Identifier of the symbol.
+            fingerprint (str): Fingerprint of the symbol.
+            file (str): Man page (relative to `quarto_dir`).
+            members (list): List of members (classes only), stored such that
+                the members are known when the page is skipped in the next run.
+            skipped (bool): `True` if the page has not been rebuilt.
+        """
+        self._new[key] = {"fingerprint": fingerprint, "file": file,
+                          "members": [list(x) for x in members]}
+        self._counts["skipped" if skipped else "rebuilt"] += 1
+
+
+    def remove_stale(self):
+        """Remove Stale Pages
+
+        Deletes man pages listed in the manifest of the last run whose symbols
+        no longer exist (no longer documented in the current run).
+
+        Returns:
+            list: List of files removed.
+        """
+        from os import remove
+        from os.path import isfile, join
+
+        current = set([x["file"] for x in self._new.values()])
+        removed = []
+        for key, rec in self._old.items():
+            if key in self._new or rec["file"] in current: continue
+            file = join(self._config.get("quarto_dir"), rec["file"])
+            if isfile(file):
+                remove(file)
+                removed.append(file)
+        self._counts["removed"] += len(removed)
+        return removed
+
+
+    def counts(self):
+        """Number of Pages Rebuilt, Skipped, Removed
+
+        Returns:
+            dict: Dictionary with the number of pages `rebuilt`, `skipped`
+            (unchanged), and `removed` in the current run.
+        """
+        return dict(self._counts)
+
+
+    def __repr__(self):
+        """Standard Representation
+
+        Returns:
+            str: Standard representation of the class.
+        """
+        c = self.counts()
+        return f"{self.__module__} Object: {c['rebuilt']} rebuilt, " + \
+               f"{c['skipped']} skipped, {c['removed']} removed"
+
@@ -0,0 +1,230 @@
+
+
+# Profiler collecting the timings of the current process (see Profiler.activate)
+_active = None
+
+
+class _Timer:
+    """Context manager adding the time spent to a phase of the active Profiler"""
+    __slots__ = ("_phases", "_name", "_start")
+
+    def __init__(self, phases, name):
+        self._phases, self._name = phases, name
+
+    def __enter__(self):
+        from time import perf_counter
+        self._start = perf_counter()
+        return self
+
+    def __exit__(self, *args):
+        from time import perf_counter
+        rec = self._phases.setdefault(self._name, [0., 0])
+        rec[0] += perf_counter() - self._start
+        rec[1] += 1
+        return False
+
+
+class _NoTimer:
+    """Does nothing; used if profiling is disabled"""
+    __slots__ = ()
+    def __enter__(self): return self
+    def __exit__(self, *args): return False
+
+_NOTIMER = _NoTimer()
+
+
+def phase(name):
+    """Time a Phase
+
+    Returns a context manager timing the code executed inside the `with`
+    block (added to phase `name` of the active profiler). Does nothing if
+    no profiler is active.
+
+    Args:
+        name (str): Name of the phase.
+
+    Returns:
+        Context manager.
+    """
+    return _NOTIMER if _active is None else _Timer(_active._pending, name)
+
+
+def active():
+    """Active Profiler
+
+    Returns:
+        None or Profiler: The active profiler of the current process (if any).
+    """
+    return _active
+
+
+class Profiler:
+    """Per-Phase Profiler
+
+    Collects timings of the phases of a pyp2qmd run (importing the package,
+    indexing, `inspect.getmembers`, parsing docstrings, formatting
+    signatures, resolving cross-references, rendering, writing files),
+    timings per symbol, and the number of pages written, unchanged, and
+    skipped. Used by :py:class:`DocConverter <pyp2qmd.DocConverter.DocConverter>`
+    if `profile` is set (see :py:class:`Config <pyp2qmd.Config.Config>`).
+
+    Phases are inclusive (e.g., the time of `"render"` contains the time
+    used to resolve the cross-references of that page). Timings of worker
+    processes are merged (see :py:meth:`pop` and :py:meth:`merge`), thus
+    the totals of the phases can exceed the wall time when `jobs` is not `1`.
+
+    Args:
+        top (int): Number of slowest symbols listed in the report, defaults to `20`.
+        pstats (None, str): If set, the whole run is also profiled using `cProfile`;
+            the statistics are written to this file (see `pstats`).
+
+    Return:
+        Initializes a new object of class `Profiler`.
+
+    Raises:
+        TypeError: If `top` is not int.
+        ValueError: If `top` is negative.
+        TypeError: If `pstats` is not None or str.
+    """
+
+    def __init__(self, top = 20, pstats = None):
+        from time import perf_counter
+
+        if not isinstance(top, int) or isinstance(top, bool):
+            raise TypeError("argument `top` must be int")
+        elif top < 0:
+            raise ValueError("argument `top` must not be negative")
+        if not isinstance(pstats, (type(None), str)):
+            raise TypeError("argument `pstats` must be None or str")
+
+        self._top     = top
+        self._pstats  = pstats
+        self._start   = perf_counter()
+        self._pending = dict()
+        self._phases  = dict()
+        self._symbols = dict()
+        self._pages   = {"written": 0, "unchanged": 0, "skipped": 0}
+        self._cprofile = None
+
+
+    def activate(self):
+        """Activate Profiler
+
+        Makes this the active profiler of the current process (see :py:func:`phase`),
+        starts `cProfile` if `pstats` is set.
+        """
+        global _active
+        _active = self
+        if self._pstats is not None and self._cprofile is None:
+            from cProfile import Profile
+            self._cprofile = Profile()
+            self._cprofile.enable()
+
+
+    def deactivate(self):
+        """Deactivate Profiler
+
+        Stops timing (and `cProfile` if running).
+        """
+        global _active
+        if _active is self: _active = None
+        if self._cprofile is not None: self._cprofile.disable()
+
+
+    def pop(self):
+        """Get New Timings
+
+        Returns:
+            dict: Dictionary with the phases (keys) and lists with the time
+            (seconds) and number of calls since the last call.
+        """
+        res, self._pending = self._pending, dict()
+        return res
+
+
+    def merge(self, phases):
+        """Merge Timings
+
+        Adds timings to the totals (e.g., collected in worker processes).
+
+        Args:
+            phases (dict): Timings as returned by :py:meth:`pop`.
+        """
+        for name, (seconds, calls) in phases.items():
+            rec = self._phases.setdefault(name, [0., 0])
+            rec[0] += seconds
+            rec[1] += calls
+
+
+    def add_symbol(self, key, seconds):
+        """Add Timing of a Symbol
+
+        Args:
+            key (str): Identifier (e.g., `"man:class:Config"`).
+            seconds (float): Time used to extract and render its page.
+        """
+        self._symbols[key] = self._symbols.get(key, 0.) + seconds
+
+
+    def add_pages(self, what, n = 1):
+        """Count Pages
+
+        Args:
+            what (str): One of `"written"` (changed or new), `"unchanged"`
+                (rendered but identical to the existing file), or `"skipped"`
+                (not rendered, see :py:class:`Manifest <pyp2qmd.Manifest.Manifest>`).
+            n (int): Number of pages, defaults to `1`.
+        """
+        self._pages[what] += n
+
+
+    def report(self):
+        """Profiling Report
+
+        Returns:
+            dict: Dictionary with the `wall` time (seconds), the totals of all
+            `phases` (seconds and calls), the timings of all `symbols`,
+            the `slowest` symbols, and the number of `pages` written, unchanged,
+            and skipped.
+        """
+        from time import perf_counter
+        self.merge(self.pop())
+
+        slowest = sorted(self._symbols.items(), key = lambda x: -x[1])[:self._top]
+        return {"wall": round(perf_counter() - self._start, 6),
+                "phases": {k: {"seconds": round(v[0], 6), "calls": v[1]} for k, v in sorted(self._phases.items())},
+                "symbols": {k: round(v, 6) for k, v in sorted(self._symbols.items())},
+                "slowest": [{"symbol": k, "seconds": round(v, 6)} for k, v in slowest],
+                "pages": dict(self._pages)}
+
+
+    def write(self, file):
+        """Write Report
+
+        Deactivates the profiler and writes the report (see :py:meth:`report`)
+        as JSON; writes the `cProfile` statistics if `pstats` is set.
+
+        Args:
+            file (str): Name of the JSON file.
+
+        Returns:
+            dict: The report.
+        """
+        import json
+        self.deactivate()
+        report = self.report()
+        with open(file, "w") as fid:
+            json.dump(report, fid, indent = 2, sort_keys = True)
+        if self._cprofile is not None:
+            self._cprofile.dump_stats(self._pstats)
+        return report
+
+
+    def __repr__(self):
+        """Standard Representation
+
+        Returns:
+            str: Standard representation of the class.
+        """
+        return f"{self.__module__} Object: {len(self._phases)} phases, {len(self._symbols)} symbols"
+
@@ -0,0 +1,112 @@
+
+
+class QuartoRenderer:
+    """Quarto Renderer
+
+    Calls the quarto executable to render a quarto project, either the whole
+    project or a list of files (`quarto render <file>`, one call per
+    file). Used by
+    :py:meth:`DocConverter.render <pyp2qmd.DocConverter.DocConverter.render>`
+    to render only the pages which changed.
+
+    The quarto calls run one after another: each call also updates
+    project-wide state (`.quarto/`, the freeze index, the search index and
+    the sitemap of the output directory) which concurrent calls would
+    overwrite.
+
+    Args:
+        quarto (str): Name of (or path to) the quarto executable, defaults to `"quarto"`.
+        cwd (None, str): Directory of the quarto project. If `None` (default)
+            the current working directory.
+
+    Return:
+        Initializes a new object of class `QuartoRenderer`.
+
+    Raises:
+        TypeError: If `quarto` is not str.
+        TypeError: If `cwd` is not None or str.
+    """
+
+    def __init__(self, quarto = "quarto", cwd = None):
+        if not isinstance(quarto, str):
+            raise TypeError("argument `quarto` must be str")
+        if not isinstance(cwd, (type(None), str)):
+            raise TypeError("argument `cwd` must be None or str")
+
+        self._quarto = quarto
+        self._cwd    = cwd
+
+
+    def executable(self):
+        """Quarto Executable
+
+        Returns:
+            str: Full path to the quarto executable.
+
+        Raises:
+            Exception: If the executable cannot be found.
+        """
+        from shutil import which
+        res = which(self._quarto)
+        if res is None:
+            raise Exception(f"quarto executable \"{self._quarto}\" not found " + \
+                            "(check the `quarto` option)")
+        return res
+
+
+    def render_file(self, file = None, executable = None):
+        """Render File
+
+        Args:
+            file (None, str): File to be rendered (relative to the project
+                directory). If `None` the whole project is rendered.
+            executable (None, str): Quarto executable; found via
+                :py:meth:`executable` if `None`.
+
+        Returns:
+            dict: Dictionary with the `file` (`None` if the whole project has
+            been rendered), the `status` (`"passed"` or `"failed"`), the
+            `returncode` of quarto, the (last part of the) `output`, and the time
+            used (`seconds`).
+        """
+        from subprocess import run, STDOUT, PIPE
+        from time import perf_counter
+
+        if executable is None: executable = self.executable()
+        start = perf_counter()
+        args  = [executable, "render"] + ([] if file is None else [file])
+        proc  = run(args, cwd = self._cwd, stdout = PIPE, stderr = STDOUT, text = True)
+        return {"file": file, "status": "passed" if proc.returncode == 0 else "failed",
+                "returncode": proc.returncode, "output": proc.stdout[-5000:],
+                "seconds": perf_counter() - start}
+
+
+    def render(self, files = None):
+        """Render Files
+
+        Args:
+            files (None, list): List of files to be rendered (relative to the
+                project directory). If `None` the whole project is rendered.
+
+        Returns:
+            list: One dictionary per quarto call (see :py:meth:`render_file`),
+            same order as `files`.
+        """
+        if not isinstance(files, (type(None), list)):
+            raise TypeError("argument `files` must be None or list")
+
+        executable = self.executable()
+        if files is None:
+            return [self.render_file(None, executable)]
+        # Sequential, quarto calls share the project-wide state
+        return [self.render_file(f, executable) for f in files]
+
+
+    def __repr__(self):
+        """Standard Representation
+
+        Returns:
+            str: Standard representation of the class.
+        """
+        return f"{self.__module__} Object: quarto \"{self._quarto}\""
+
@@ -0,0 +1,395 @@
+
+
+class StaticPackage:
+    """Static (Import-Free) Package Extraction
+
+    Extracts the exported classes and functions of a package without
+    importing it by parsing the source files with `ast`. For each class,
+    function, and method a stand-in object is created carrying the docstring,
+    signature, module, and name of the original object, such that the
+    :py:class:`ManPage <pyp2qmd.ManPage.ManPage>` can be created the same
+    way as for imported objects.
+
+    The exported symbols are the classes and functions bound in the
+    package `__init__.py`, either defined there or imported via
+    `from ... import ...` from modules of the same package. If `__all__` is
+    defined, only the names listed in `__all__` are exported.
+
+    Limitations: Default values which are not literals (e.g., `list(range(3))`
+    or lambda functions) are shown as written in the source code, base
+    classes defined outside the package are not resolved (inherited methods
+    of these classes are not listed), and module-level code is not executed
+    (conditionally defined objects are not detected).
+
+    Args:
+        package (str): Name of the package to be documented.
+        jobs (int): Number of processes used to parse the source files,
+            defaults to `1`; `0` uses one process per CPU.
+
+    Return:
+        Initializes a new object of class `StaticPackage`.
+
+    Raises:
+        TypeError: If `package` is not str or `jobs` is not int.
+        Exception: If the sources of the package cannot be found.
+    """
+
+    def __init__(self, package, jobs = 1):
+
+        if not isinstance(package, str):
+            raise TypeError("argument `package` must be str")
+        if not isinstance(jobs, int) or isinstance(jobs, bool):
+            raise TypeError("argument `jobs` must be int")
+
+        self._package = package
+        self._files   = self.find_sources(package)
+        self._modules = dict()
+        for info in self._parse(jobs):
+            self._modules[info["name"]] = info
+
+        # Objects created so far (module name -> name -> object)
+        self._objects = dict()
+
+
+    @staticmethod
+    def find_sources(package):
+        """Find Source Files
+
+        Args:
+            package (str): Name of the package.
+
+        Returns:
+            list: List of tuples `(module name, file)` with all python source
+            files of the package.
+
+        Raises:
+            Exception: If the sources of the package cannot be found.
+        """
+        from importlib.util import find_spec
+        from os import walk
+        from os.path import join, relpath, splitext, sep
+
+        try:
+            spec = find_spec(package)
+        except Exception:
+            spec = None
+        if spec is None or spec.origin is None or not spec.origin.endswith(".py"):
+            raise Exception(f"cannot find the sources of package \"{package}\"")
+
+        # Single module, not a package
+        if not spec.submodule_search_locations:
+            return [(package, spec.origin)]
+
+        res = []
+        for root in spec.submodule_search_locations:
+            for path, dirs, files in walk(root):
+                dirs[:] = sorted(d for d in dirs if not d.startswith(".") and d != "__pycache__")
+                for f in sorted(files):
+                    if not f.endswith(".py"): continue
+                    mod = splitext(relpath(join(path, f), root))[0].split(sep)
+                    if mod[-1] == "__init__": mod = mod[:-1]
+                    res.append((".".join([package] + mod), join(path, f)))
+        return res
+
+
+    def _parse(self, jobs):
+        from os import cpu_count
+        if jobs == 0: jobs = cpu_count()
+        if jobs == 1 or len(self._files) < 2:
+            return list(map(_parse_file, self._files))
+
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(min(jobs, len(self._files))) as pool:
+            return list(pool.map(_parse_file, self._files))
+
+
+    def update(self, modules):
+        """Update Modules
+
+        Re-parses the source files of the modules given (e.g., after the
+        files have been modified). Modules whose source file no longer exists
+        are removed. Call :py:meth:`module` afterwards to get the updated
+        package namespace.
+
+        Args:
+            modules (list): Names of the modules to be updated.
+        """
+        self._files = self.find_sources(self._package)
+        files = dict(self._files)
+        for mod in modules:
+            if mod in files:
+                self._modules[mod] = _parse_file((mod, files[mod]))
+            else:
+                self._modules.pop(mod, None)
+        # Objects have to be re-created (may inherit from updated classes)
+        self._objects = dict()
+
+
+    def module(self, name = None):
+        """Create Package Namespace
+
+        Args:
+            name (None, str): Name of the module. If `None` (default) the
+                namespace of the package itself is created.
+
+        Returns:
+            module: A (new) module object named like the package (or module)
+            holding all exported classes and functions (stand-in objects)
+            as attributes.
+        """
+        from types import ModuleType
+
+        name = self._package if name is None else name
+        init = self._modules.get(name)
+        if init is None:
+            raise Exception(f"cannot find the sources of \"{name}\"")
+
+        res = ModuleType(name, init["doc"])
+        if init["all"] is not None:
+            res.__all__ = list(init["all"])
+        for attr in res.__all__ if init["all"] is not None else self._names(name):
+            obj = self._resolve(name, attr)
+            if obj is not None: setattr(res, attr, obj)
+        return res
+
+
+    def modules(self):
+        """Names of All Modules
+
+        Returns:
+            list: Sorted list with the names of the package and all its submodules.
+        """
+        return sorted(self._modules)
+
+
+    def _names(self, modname, public = False):
+        """Names bound in a module (definitions, imports, star imports)"""
+        info = self._modules.get(modname)
+        if info is None: return []
+        res = [x["name"] for x in info["defs"]] + list(info["imports"]) + list(info["aliases"])
+        for mod in info["star"]:
+            star = self._modules.get(mod)
+            if star is None: continue
+            res += star["all"] if star["all"] is not None else self._names(mod, public = True)
+        res = list(dict.fromkeys(res))
+        return [x for x in res if not x.startswith("_")] if public else res
+
+
+    def _resolve(self, modname, name, seen = None):
+        """Get (create) the object bound to `name` in module `modname`"""
+        seen = set() if seen is None else seen
+        if (modname, name) in seen: return None
+        seen.add((modname, name))
+
+        objects = self._objects.setdefault(modname, dict())
+        if name in objects: return objects[name]
+
+        info = self._modules.get(modname)
+        if info is None: return None
+
+        obj = None
+        for rec in info["defs"]:
+            if rec["name"] == name: obj = self._create(modname, rec, rec["name"])
+        if obj is None and name in info["aliases"]:
+            obj = self._resolve(modname, info["aliases"][name], seen)
+        if obj is None and name in info["imports"]:
+            obj = self._resolve(*info["imports"][name], seen)
+        if obj is None:
+            for mod in info["star"]:
+                star = self._modules.get(mod)
+                if star is None: continue
+                names = star["all"] if star["all"] is not None else self._names(mod, public = True)
+                if name in names:
+                    obj = self._resolve(mod, name, seen)
+                    if obj is not None: break
+
+        objects[name] = obj
+        return obj
+
+
+    def _create(self, modname, rec, qualname):
+        if rec["type"] == "function":
+            return _stub_function(rec, modname, qualname)
+
+        # Class: resolve base classes first
+        import builtins
+        bases = []
+        for base in rec["bases"]:
+            obj = self._resolve(modname, base)
+            if obj is None and isinstance(getattr(builtins, base, None), type):
+                obj = getattr(builtins, base)
+            if isinstance(obj, type) and not obj in bases: bases.append(obj)
+
+        ns = {"__doc__": rec["doc"], "__module__": modname, "__qualname__": qualname}
+        for member in rec["body"]:
+            ns[member["name"]] = self._create(modname, member, f"{qualname}.{member['name']}")
+        if rec["init"] is not None:
+            ns["__signature__"] = _signature(rec["init"], rec["returns"], drop_first = True)
+        elif not any(hasattr(b, "__signature__") for b in bases):
+            from inspect import Signature
+            ns["__signature__"] = Signature()
+
+        try:
+            cls = type(rec["name"], tuple(bases), ns)
+        except TypeError:
+            # E.g., metaclass conflicts of builtin bases
+            cls = type(rec["name"], (), ns)
+
+        # Methods without docstring: inspect.getdoc takes the docstring of the
+        # overridden method, but cannot find the class of stand-ins (not in sys.modules)
+        for member in rec["body"]:
+            if member["type"] != "function" or member["doc"] is not None: continue
+            for base in cls.__mro__[1:]:
+                doc = getattr(getattr(base, member["name"], None), "__doc__", None)
+                if doc is not None:
+                    ns[member["name"]].__doc__ = doc
+                    break
+        return cls
+
+
+class _Expr:
+    """Source code of a (non-literal) default value or annotation"""
+    def __init__(self, source):
+        self.source = source
+    def __repr__(self):
+        return self.source
+
+
+def _value(node, source, future_annotations = False):
+    """Describe a default value or annotation; returns (kind, value) or None"""
+    import ast
+    if node is None: return None
+    segment = ast.get_source_segment(source, node) or ast.unparse(node)
+    if future_annotations: return ("literal", segment)
+    try:
+        return ("literal", ast.literal_eval(node))
+    except Exception:
+        return ("expr", segment)
+
+
+def _arguments(args, returns, source, future_annotations):
+    """Describe the arguments of a function definition"""
+    ann = lambda a: _value(a.annotation, source, future_annotations)
+
+    res = []
+    positional = args.posonlyargs + args.args
+    defaults   = [None] * (len(positional) - len(args.defaults)) + list(args.defaults)
+    for i, (arg, default) in enumerate(zip(positional, defaults)):
+        kind = "POSITIONAL_ONLY" if i < len(args.posonlyargs) else "POSITIONAL_OR_KEYWORD"
+        res.append((arg.arg, kind, _value(default, source), ann(arg)))
+    if args.vararg:
+        res.append((args.vararg.arg, "VAR_POSITIONAL", None, ann(args.vararg)))
+    for arg, default in zip(args.kwonlyargs, args.kw_defaults):
+        res.append((arg.arg, "KEYWORD_ONLY", _value(default, source), ann(arg)))
+    if args.kwarg:
+        res.append((args.kwarg.arg, "VAR_KEYWORD", None, ann(args.kwarg)))
+    return res, _value(returns, source, future_annotations)
+
+
+def _describe(node, source, future_annotations):
+    """Describe a function or class definition (picklable)"""
+    import ast
+
+    if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+        decorators = [ast.get_source_segment(source, d) for d in node.decorator_list]
+        # Class methods and properties are no functions on the class
+        if any(d in ("classmethod", "property") or str(d).endswith((".setter", ".getter", ".deleter")) \
+               for d in decorators):
+            return None
+        params, returns = _arguments(node.args, node.returns, source, future_annotations)
+        return {"type": "function", "name": node.name, "doc": ast.get_docstring(node, clean = False),
+                "params": params, "returns": returns}
+
+    body, init, returns = [], None, None
+    for child in node.body:
+        if isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef)) and child.name == "__init__":
+            init, returns = _arguments(child.args, None, source, future_annotations)
+        elif isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            if child.name.startswith("__"): continue
+            rec = _describe(child, source, future_annotations)
+            if rec is not None: body.append(rec)
+    return {"type": "class", "name": node.name, "doc": ast.get_docstring(node, clean = False),
+            "bases": [ast.get_source_segment(source, b) for b in node.bases],
+            "body": body, "init": init, "returns": returns}
+
+
+def _parse_file(args):
+    """Parse one source file
+
+    Args:
+        args (tuple): Module name and path of the source file.
+
+    Returns:
+        dict: Picklable description of the module (definitions, imports,
+        `__all__`, docstring).
+    """
+    import ast
+
+    modname, file = args
+    with open(file, "r", encoding = "utf-8") as fid:
+        source = fid.read()
+    tree = ast.parse(source, file)
+
+    # Package (for relative imports)
+    package = modname if file.endswith("__init__.py") else modname.rpartition(".")[0]
+    future_annotations = any(isinstance(n, ast.ImportFrom) and n.module == "__future__" and \
+                             any(a.name == "annotations" for a in n.names) for n in tree.body)
+
+    res = {"name": modname, "doc": ast.get_docstring(tree), "all": None,
+           "defs": [], "imports": dict(), "star": [], "aliases": dict()}
+    for node in tree.body:
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            rec = _describe(node, source, future_annotations)
+            if rec is None: continue
+            # Re-definitions replace earlier ones
+            res["defs"] = [x for x in res["defs"] if x["name"] != rec["name"]] + [rec]
+        elif isinstance(node, ast.ImportFrom) and node.module != "__future__":
+            if node.level > 0:
+                base = package.split(".")
+                base = base[:len(base) - node.level + 1]
+                mod  = ".".join(base + ([node.module] if node.module else []))
+            else:
+                mod  = node.module
+            for alias in node.names:
+                if alias.name == "*":
+                    res["star"].append(mod)
+                else:
+                    res["imports"][alias.asname or alias.name] = (mod, alias.name)
+        elif isinstance(node, ast.Assign) and len(node.targets) == 1 and \
+                isinstance(node.targets[0], ast.Name):
+            target = node.targets[0].id
+            if target == "__all__":
+                try:
+                    res["all"] = [str(x) for x in ast.literal_eval(node.value)]
+                except Exception:
+                    pass
+            elif isinstance(node.value, ast.Name):
+                res["aliases"][target] = node.value.id
+    return res
+
+
+def _signature(params, returns, drop_first = False):
+    from inspect import Signature, Parameter
+
+    def value(x):
+        if x is None: return Parameter.empty
+        return x[1] if x[0] == "literal" else _Expr(x[1])
+
+    res = []
+    for name, kind, default, annotation in params[1 if drop_first else 0:]:
+        res.append(Parameter(name, getattr(Parameter, kind), default = value(default),
+                             annotation = value(annotation)))
+    return Signature(res, return_annotation = value(returns))
+
+
+def _stub_function(rec, modname, qualname):
+    """Create a function carrying the name, docstring, and signature of `rec`"""
+    def stub(*args, **kwargs):
+        raise NotImplementedError("static stand-in object, cannot be called")
+    stub.__name__      = rec["name"]
+    stub.__qualname__  = qualname
+    stub.__module__    = modname
+    stub.__doc__       = rec["doc"]
+    stub.__signature__ = _signature(rec["params"], rec["returns"])
+    return stub
+
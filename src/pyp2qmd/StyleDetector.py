@@ -0,0 +1,226 @@
+
+
+class StyleDetector:
+    """Docstring Style Detector
+
+    Used if `docstringstyle = "AUTO"` (see :py:class:`Config <pyp2qmd.Config.Config>`).
+    Instead of parsing each docstring with all the parsers of `docstring_parser`
+    (`DocstringStyle.AUTO`), the style is detected using cheap heuristics
+    (section headers like `Args:` for `"GOOGLE"`, underlined headers like
+    `Parameters` for `"NUMPYDOC"`, fields like `:param` for `"REST"`, or `@param`
+    for `"EPYDOC"`).
+
+    Docstrings without any markers (e.g., a title and description only) use
+    the style of their module: the style most docstrings of the functions,
+    classes, and methods defined in the module use (see :py:meth:`learn` and
+    :py:meth:`module_style`; independent of the order in which the docstrings
+    are parsed).
+    Only if a docstring is ambiguous (markers of several styles, or no markers
+    and no unique style for the module) the full `AUTO` detection is used.
+    Which style has been used in which module is counted (see :py:meth:`report`).
+
+    Return:
+        Initializes a new object of class `StyleDetector`.
+    """
+
+    def __init__(self):
+        import re
+        M = re.MULTILINE
+        sections = "Parameters|Returns|Raises|Yields|Examples?|See Also|Notes?|Attributes|Other Parameters|Warns|References"
+        self._patterns = [
+            ("NUMPYDOC", re.compile(rf"^[ \t]*(?:{sections})[ \t]*\n[ \t]*-{{3,}}[ \t]*$", M)),
+            ("GOOGLE",   re.compile(r"^[ \t]*(?:Args|Arguments|Parameters|Keyword Args|Returns?|Raises|Yields?|" + \
+                                    r"Examples?|Attributes|Todo)[ \t]*:[ \t]*$", M)),
+            ("REST",     re.compile(r"^[ \t]*:(?:param|parameter|arg|argument|key|keyword|type|" + \
+                                    r"returns?|rtype|raises?|except|exception)\b", M)),
+            ("EPYDOC",   re.compile(r"^[ \t]*@(?:param|type|return|rtype|raise|keyword)\b", M)),
+        ]
+        self._modules = dict()
+        self._counts  = dict()
+        self._pending = dict()
+
+
+    def detect(self, docstring):
+        """Detect Style
+
+        Args:
+            docstring (None, str): The (cleaned) docstring.
+
+        Returns:
+            list: Names of all styles whose markers are found (empty list if none).
+        """
+        if not docstring: return []
+        return [name for name, pattern in self._patterns if pattern.search(docstring)]
+
+
+    def style(self, docstring, module):
+        """Style to be Used
+
+        Args:
+            docstring (None, str): The (cleaned) docstring.
+            module (None, str): Name of the module the object is defined in.
+
+        Returns:
+            str: Name of the style (`"GOOGLE"`, `"NUMPYDOC"`, `"REST"`,
+            `"EPYDOC"`), or `"AUTO"` if ambiguous.
+        """
+        found = self._markers(docstring)
+        if len(found) == 1:
+            return found[0]
+        elif len(found) == 0:
+            return self.module_style(module)
+        return "AUTO"
+
+
+    def learn(self, index):
+        """Module Styles from Symbol Index
+
+        Determines the style of all modules defining classes, functions, or
+        methods listed in the index (see :py:meth:`module_style`); also works
+        for the stand-in objects used if `static = True`.
+
+        Args:
+            index (SymbolIndex): Object of class
+                :py:class:`SymbolIndex <pyp2qmd.SymbolIndex.SymbolIndex>`.
+        """
+        from inspect import isclass
+        from .ManPage import ManPage
+
+        objs = dict()
+        for key in index:
+            obj = index.get(key)
+            objs[id(obj)] = obj
+            if isclass(obj):
+                for _, member in ManPage.list_members(obj, True): objs[id(member)] = member
+        modules = dict()
+        for obj in objs.values():
+            modules.setdefault(getattr(obj, "__module__", None), []).append(obj)
+        for module, x in modules.items():
+            self._modules[module] = self._vote(x)
+
+
+    def module_style(self, module):
+        """Style of a Module
+
+        The style used by most docstrings (with markers of one style only) of
+        the functions, classes, and methods defined in the module. Taken from
+        the symbol index if the module has been seen by :py:meth:`learn`, else
+        computed once from all docstrings of the (imported) module.
+
+        Args:
+            module (None, str): Name of the module.
+
+        Returns:
+            str: Name of the style, or `"AUTO"` if the module is unknown,
+            none of its docstrings has markers, or if there is a tie.
+        """
+        if module not in self._modules:
+            self._modules[module] = self._majority(module)
+        return self._modules[module]
+
+
+    def reset(self, modules = None):
+        """Reset Module Styles
+
+        Drops the styles determined for modules (see :py:meth:`module_style`),
+        e.g., after the modules have been reloaded.
+
+        Args:
+            modules (None, list): Names of the modules; all if `None` (default).
+        """
+        if modules is None:
+            self._modules = dict()
+        else:
+            for mod in modules: self._modules.pop(mod, None)
+
+
+    def _markers(self, docstring):
+        """Styles found in the docstring (see detect) after resolving Google vs. numpydoc"""
+        found = self.detect(docstring)
+        # Google and numpydoc both know "Parameters"/"Returns"; the underline decides
+        if "NUMPYDOC" in found and "GOOGLE" in found: found.remove("GOOGLE")
+        return found
+
+
+    def _majority(self, module):
+        """Majority style of all docstrings in an (imported) module, see module_style"""
+        import sys
+        from inspect import isclass, isfunction
+
+        mod = sys.modules.get(module) if isinstance(module, str) else None
+        if mod is None: return "AUTO"
+
+        objs = [x for x in vars(mod).values() if (isclass(x) or isfunction(x)) and \
+                getattr(x, "__module__", None) == module]
+        for cls in [x for x in objs if isclass(x)]:
+            objs += [x for x in vars(cls).values() if isfunction(x)]
+        return self._vote(objs)
+
+
+    def _vote(self, objs):
+        """Style used by most docstrings of `objs`, `"AUTO"` if none or a tie"""
+        from inspect import getdoc
+        counts = dict()
+        for obj in objs:
+            found = self._markers(getdoc(obj))
+            if len(found) == 1: counts[found[0]] = counts.get(found[0], 0) + 1
+        best = [k for k, v in counts.items() if v == max(counts.values())]
+        return best[0] if len(best) == 1 else "AUTO"
+
+
+    def add(self, module, style):
+        """Count Style Used
+
+        Args:
+            module (None, str): Name of the module.
+            style (str): Name of the style used (`"AUTO"` if the style
+                has been detected by `docstring_parser`).
+        """
+        rec = self._pending.setdefault(str(module), dict())
+        rec[style] = rec.get(style, 0) + 1
+
+
+    def pop(self):
+        """Get New Counts
+
+        Returns:
+            dict: Number of docstrings parsed per module and style since the last call.
+        """
+        res, self._pending = self._pending, dict()
+        return res
+
+
+    def merge(self, counts):
+        """Merge Counts
+
+        Adds counts to the totals (e.g., collected in worker processes).
+
+        Args:
+            counts (dict): Counts as returned by :py:meth:`pop`.
+        """
+        for module, styles in counts.items():
+            rec = self._counts.setdefault(module, dict())
+            for style, n in styles.items(): rec[style] = rec.get(style, 0) + n
+
+
+    def report(self):
+        """Styles Used
+
+        Returns:
+            dict: Number of docstrings parsed per module (sorted) and style
+            since the last call; `"AUTO"` counts docstrings for which the full
+            detection of `docstring_parser` has been used.
+        """
+        self.merge(self.pop())
+        counts, self._counts = self._counts, dict()
+        return dict((k, dict(sorted(counts[k].items()))) for k in sorted(counts))
+
+
+    def __repr__(self):
+        """Standard Representation
+
+        Returns:
+            str: Standard representation of the class.
+        """
+        return f"{self.__module__} Object: {len(self._modules)} modules"
+
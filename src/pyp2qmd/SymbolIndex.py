@@ -0,0 +1,225 @@
+
+
+class SymbolIndex:
+    """Symbol Index
+
+    Index of all classes and functions to be documented, built once per
+    run and used by all the other stages (listing, rendering, manifest).
+    Maps the identifier of each symbol to the object, its name, the module
+    it is defined in, and its kind (`"class"` or `"function"`).
+
+    By default (`recursive = False`) only the classes and functions exported
+    by the package itself are indexed; the identifiers are the names under
+    which they are exported. If `recursive = True` all submodules of the
+    package are walked as well (using `pkgutil.walk_packages` unless `modules`
+    are given). In this case only classes and functions defined inside the
+    package are indexed (no imported third-party objects), identified by
+    their fully qualified name (`package.module.name`). Objects reachable under
+    several names (e.g., defined in a submodule and re-exported by the package)
+    are indexed once.
+
+    Classes and functions exported by the package but defined in one of the
+    packages listed in `exclude` (e.g., the other packages of a batch which
+    get their own man pages) are not indexed but listed separately
+    (see :py:meth:`excluded`).
+
+    Args:
+        pkg (module): The package to be indexed.
+        recursive (bool): Whether or not to walk all submodules, defaults to `False`.
+        include_hidden (bool): Only used if `recursive = True`. If `False` (default)
+            private modules and names (starting with an underscore) are skipped.
+        modules (None, list): Only used if `recursive = True`. List of module
+            objects to be indexed (e.g., provided by
+            :py:class:`StaticPackage <pyp2qmd.StaticPackage.StaticPackage>`).
+            If `None` (default) the submodules are found and imported via `pkgutil`.
+        exclude (None, list): Names of packages whose classes and functions
+            are not indexed, defaults to `None`.
+
+    Return:
+        Initializes a new object of class `SymbolIndex`.
+
+    Raises:
+        TypeError: If `recursive` or `include_hidden` are not bool.
+        TypeError: If `modules` is not None or list.
+        TypeError: If `exclude` is not None or list.
+    """
+
+    def __init__(self, pkg, recursive = False, include_hidden = False, modules = None, exclude = None):
+        if not isinstance(recursive, bool):
+            raise TypeError("argument `recursive` must be bool")
+        if not isinstance(include_hidden, bool):
+            raise TypeError("argument `include_hidden` must be bool")
+        if not isinstance(modules, (type(None), list)):
+            raise TypeError("argument `modules` must be None or list")
+        if not isinstance(exclude, (type(None), list)):
+            raise TypeError("argument `exclude` must be None or list")
+
+        self._pkg       = pkg
+        self._recursive = recursive
+        self._exclude   = set() if exclude is None else set(exclude)
+        self._entries   = dict()
+        self._excluded  = dict()
+        self._errors    = dict()
+
+        if not recursive:
+            self._index_exported()
+        else:
+            if modules is None: modules = self._walk(include_hidden)
+            self._index_modules(modules, include_hidden)
+
+        self._entries = dict(sorted(self._entries.items()))
+
+
+    def _index_exported(self):
+        """Index classes and functions exported by the package (single scan)"""
+        from inspect import getmembers, isclass, isfunction
+        try:
+            res = getmembers(self._pkg)
+        except Exception as e:
+            raise Exception(f"problems extracting classes and functions from package: {e}")
+        for name, obj in res:
+            if isclass(obj):      self._add(name, name, obj, "class")
+            elif isfunction(obj): self._add(name, name, obj, "function")
+
+
+    def _walk(self, include_hidden):
+        """Import the package and all its submodules"""
+        from importlib import import_module
+        from pkgutil import walk_packages
+
+        prefix = f"{self._pkg.__name__}."
+        def onerror(modname):
+            import sys
+            self._errors[modname] = str(sys.exc_info()[1])
+
+        res = [self._pkg]
+        if not hasattr(self._pkg, "__path__"): return res
+        for info in walk_packages(self._pkg.__path__, prefix, onerror = onerror):
+            if not include_hidden and any(x.startswith("_") for x in info.name.split(".")[1:]):
+                continue
+            try:
+                res.append(import_module(info.name))
+            except Exception as e:
+                self._errors[info.name] = str(e)
+        return res
+
+
+    def _index_modules(self, modules, include_hidden):
+        """Index classes and functions defined inside the package"""
+        from inspect import isclass, isfunction
+
+        package = self._pkg.__name__
+        seen    = dict()
+        for mod in modules:
+            names = getattr(mod, "__all__", None)
+            if names is None:
+                names = [x for x in dir(mod) if include_hidden or not x.startswith("_")]
+            for name in names:
+                obj = getattr(mod, name, None)
+                if isclass(obj):      kind = "class"
+                elif isfunction(obj): kind = "function"
+                else:                 continue
+                # Defined outside the package (imported) or already indexed?
+                module = getattr(obj, "__module__", None) or ""
+                if not module == package and not module.startswith(f"{package}."): continue
+                if id(obj) in seen: continue
+                seen[id(obj)] = True
+                self._add(f"{module}.{obj.__name__}", obj.__name__, obj, kind)
+
+
+    def _add(self, key, name, obj, kind):
+        module = getattr(obj, "__module__", None)
+        target = self._excluded if (module or "").split(".")[0] in self._exclude else self._entries
+        target[key] = {"name": name, "obj": obj, "kind": kind, "module": module}
+
+
+    def get(self, key):
+        """Get Object
+
+        Args:
+            key (str): Identifier of the symbol.
+
+        Returns:
+            class or function: The object.
+
+        Raises:
+            KeyError: If `key` is not in the index.
+        """
+        return self._entries[key]["obj"]
+
+
+    def entry(self, key):
+        """Get Index Entry
+
+        Args:
+            key (str): Identifier of the symbol.
+
+        Returns:
+            dict: Dictionary with the `obj`, its `name`, `kind`, and `module`.
+
+        Raises:
+            KeyError: If `key` is not in the index.
+        """
+        return self._entries[key]
+
+
+    def classes(self):
+        """Indexed Classes
+
+        Returns:
+            dict: Dictionary with identifiers (keys) and classes (values), sorted by identifier.
+        """
+        return dict((k, v["obj"]) for k, v in self._entries.items() if v["kind"] == "class")
+
+
+    def functions(self):
+        """Indexed Functions
+
+        Returns:
+            dict: Dictionary with identifiers (keys) and functions (values), sorted by identifier.
+        """
+        return dict((k, v["obj"]) for k, v in self._entries.items() if v["kind"] == "function")
+
+
+    def excluded(self):
+        """Excluded Symbols
+
+        Returns:
+            dict: Dictionary with identifiers (keys) and entries (values; see
+            :py:meth:`entry`) of the classes and functions not indexed as they
+            are defined in one of the `exclude` packages.
+        """
+        return dict(self._excluded)
+
+
+    def errors(self):
+        """Import Errors
+
+        Returns:
+            dict: Dictionary with the names of submodules which could not be
+            imported when walking the package (keys) and the error messages.
+        """
+        return dict(self._errors)
+
+
+    def __iter__(self):
+        return iter(self._entries)
+
+
+    def __contains__(self, key):
+        return key in self._entries
+
+
+    def __len__(self):
+        return len(self._entries)
+
+
+    def __repr__(self):
+        """Standard Representation
+
+        Returns:
+            str: Standard representation of the class.
+        """
+        return f"{self.__module__} Object: {len(self.classes())} classes, " + \
+               f"{len(self.functions())} functions" + (" (recursive)" if self._recursive else "")
+
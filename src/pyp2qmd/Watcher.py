@@ -0,0 +1,226 @@
+
+
+class Watcher:
+    """Watch Package Sources
+
+    Watches the source files of the package documented by a
+    :py:class:`DocConverter <pyp2qmd.DocConverter.DocConverter>` object
+    and keeps the man pages up to date. Whenever python files are modified,
+    only the modules affected are reloaded (see
+    :py:meth:`DocConverter.reload <pyp2qmd.DocConverter.DocConverter.reload>`)
+    and only the man pages of the objects defined in these modules are
+    re-rendered (see
+    :py:meth:`DocConverter.document <pyp2qmd.DocConverter.DocConverter.document>`).
+
+    On Linux, file system events are received via inotify; on other systems
+    (or if inotify is not available) the source files are polled.
+
+    Args:
+        docconv (DocConverter): Object of class
+            :py:class:`DocConverter <pyp2qmd.DocConverter.DocConverter>`.
+        interval (float): Polling interval in seconds (also used to debounce
+            bursts of events when using inotify), defaults to `0.2`.
+        backend (str): One of `"auto"` (default; inotify if available),
+            `"inotify"`, or `"poll"`.
+
+    Return:
+        Initializes a new object of class `Watcher`.
+
+    Raises:
+        TypeError: If `docconv` is not of class `DocConverter`.
+        TypeError: If `interval` is not float or int.
+        ValueError: If `interval` is not positive.
+        ValueError: If `backend` is invalid.
+        Exception: If `backend = "inotify"` but inotify is not available.
+    """
+
+    # inotify events of interest (modify, attrib, close_write, moved from/to,
+    # create, delete, delete self)
+    _INOTIFY_MASK = 0x2 | 0x4 | 0x8 | 0x40 | 0x80 | 0x100 | 0x200 | 0x400
+
+    def __init__(self, docconv, interval = 0.2, backend = "auto"):
+        from .DocConverter import DocConverter
+
+        if not isinstance(docconv, DocConverter):
+            raise TypeError("argument `docconv` must be of class `DocConverter`")
+        if not isinstance(interval, (float, int)) or isinstance(interval, bool):
+            raise TypeError("argument `interval` must be float or int")
+        elif not interval > 0:
+            raise ValueError("argument `interval` must be positive")
+        if not backend in ["auto", "inotify", "poll"]:
+            raise ValueError("argument `backend` must be one of \"auto\", \"inotify\", \"poll\"")
+
+        self._docconv  = docconv
+        self._package  = docconv.config_get("package")
+        self._interval = float(interval)
+        self._update_sources()
+        self._snapshot = self._take_snapshot()
+
+        self._fd = None
+        if backend != "poll":
+            self._fd = self._inotify_init()
+            if self._fd is None and backend == "inotify":
+                raise Exception("inotify not available on this system")
+        self._backend = "poll" if self._fd is None else "inotify"
+
+
+    def _update_sources(self):
+        from os.path import abspath
+        from .StaticPackage import StaticPackage
+        self._sources = dict((abspath(f), m) for m, f in StaticPackage.find_sources(self._package))
+
+
+    def _take_snapshot(self):
+        from os import stat
+        res = dict()
+        for file in self._sources:
+            try:
+                s = stat(file)
+                res[file] = (s.st_mtime_ns, s.st_size)
+            except OSError:
+                pass
+        return res
+
+
+    def _inotify_init(self):
+        """Set up inotify watches for all package directories; `None` if not available"""
+        import sys
+        if not sys.platform.startswith("linux"): return None
+        try:
+            import ctypes
+            self._libc = ctypes.CDLL(None, use_errno = True)
+            fd = self._libc.inotify_init1(0o4000) # IN_NONBLOCK
+        except Exception:
+            return None
+        if fd < 0: return None
+
+        self._fd, self._wd = fd, dict()
+        self._inotify_watch()
+        return fd
+
+
+    def _inotify_watch(self):
+        """Add watches for all (new) directories containing source files"""
+        from os import fsencode
+        from os.path import dirname
+        for d in set(dirname(f) for f in self._sources):
+            if d in self._wd.values(): continue
+            wd = self._libc.inotify_add_watch(self._fd, fsencode(d), self._INOTIFY_MASK)
+            if wd >= 0: self._wd[wd] = d
+
+
+    def _inotify_read(self, timeout):
+        """Wait for events; returns `True` if python files (or directories) changed"""
+        from os import read
+        from select import select
+        from struct import unpack_from, calcsize
+
+        if not select([self._fd], [], [], timeout)[0]: return False
+        try:
+            buf = read(self._fd, 65536)
+        except BlockingIOError:
+            return False
+
+        # struct inotify_event {int wd; uint32 mask, cookie, len; char name[len]}
+        changed, size, i = False, calcsize("iIII"), 0
+        while i < len(buf):
+            wd, mask, cookie, n = unpack_from("iIII", buf, i)
+            name = buf[i + size:i + size + n].rstrip(b"\0").decode(errors = "replace")
+            i += size + n
+            if name.endswith(".py") or mask & 0x40000000: # IN_ISDIR
+                changed = True
+        return changed
+
+
+    def changed(self):
+        """Changed Modules
+
+        Compares the current state of the source files against the state when
+        last called and updates the internal state.
+
+        Returns:
+            list: Names of the modules modified, added, or deleted.
+        """
+        old = dict((f, self._sources[f]) for f in self._snapshot)
+        self._update_sources()
+        if self._backend == "inotify": self._inotify_watch()
+        new = self._take_snapshot()
+
+        files = set(f for f in set(old) | set(new) if old.get(f) is None or new.get(f) != self._snapshot.get(f))
+        self._snapshot = new
+        return sorted(set(self._sources.get(f, old.get(f)) for f in files))
+
+
+    def update(self, modules):
+        """Update Documentation
+
+        Reloads the modules given and re-renders the man pages of the objects
+        defined therein. Errors (e.g., syntax errors in the modified files)
+        are reported but do not stop the watcher.
+
+        Args:
+            modules (list): Names of the modules modified.
+
+        Returns:
+            bool: `True` on success, else `False`.
+        """
+        from time import perf_counter
+        start = perf_counter()
+        try:
+            self._docconv.reload(modules)
+            self._docconv.document(modules = modules)
+            self._docconv.update_quarto_yml()
+        except Exception as e:
+            if not self._docconv.config_get("silent"):
+                print(f"pyp2qmd: Error updating {', '.join(modules)}: {type(e).__name__}: {e}")
+            return False
+        if not self._docconv.config_get("silent"):
+            print(f"pyp2qmd: Updated {', '.join(modules)} in {perf_counter() - start:.3f}s")
+        return True
+
+
+    def run(self):
+        """Watch Sources
+
+        Watches the sources until interrupted (KeyboardInterrupt, Ctrl+C).
+        """
+        from time import sleep
+
+        if not self._docconv.config_get("silent"):
+            print(f"pyp2qmd: Watching package \"{self._package}\" ({self._backend}), press Ctrl+C to stop")
+        try:
+            while True:
+                if self._backend == "inotify":
+                    if not self._inotify_read(None): continue
+                    # Debounce; collect all events of e.g. an editor saving a file
+                    while self._inotify_read(self._interval / 4): pass
+                else:
+                    sleep(self._interval)
+                modules = self.changed()
+                if len(modules) > 0: self.update(modules)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.close()
+
+
+    def close(self):
+        """Stop Watching
+
+        Closes the inotify file descriptor (if any).
+        """
+        from os import close
+        if self._fd is not None:
+            close(self._fd)
+            self._fd = None
+
+
+    def __repr__(self):
+        """Standard Representation
+
+        Returns:
+            str: Standard representation of the class.
+        """
+        return f"{self.__module__} Object: package \"{self._package}\", " + \
+               f"{len(self._sources)} source files, backend {self._backend}"
+
@@ -1,4 +1,7 @@
 
+# Package version (also used by setup.py)
+__version__ = "0.1.2"
+
 
 
 # Class to handle the setup/config
@@ -10,5 +13,47 @@ from .DocConverter import DocConverter
 # Manual page handler
 from .ManPage import ManPage
 
+# Cache for parsed docstrings and signatures
+from .DocCache import DocCache
+
+# Manifest for incremental builds
+from .Manifest import Manifest
+
+# Import-free extraction of classes and functions
+from .StaticPackage import StaticPackage
+
+# Index of all classes and functions to be documented
+from .SymbolIndex import SymbolIndex
+
+# Resolves cross-references between man pages
+from .CrossReferences import CrossReferences
+
+# Timings of the phases of a run (profiling)
+from .Profiler import Profiler
+
+# Executes the examples of the docstrings
+from .ExampleRunner import ExampleRunner
+
+# Caches the results of the examples across runs
+from .ExampleCache import ExampleCache
+
+# Writes the pages in the background (bounded queue)
+from .FileWriter import FileWriter
+
+# Writes the pages into a zip or tar archive
+from .ArchiveSink import ArchiveSink
+
+# Intermediate representation (two-stage pipeline)
+from .IRFile import IRFile
+
+# Detects the docstring style if docstringstyle = "AUTO"
+from .StyleDetector import StyleDetector
+
+# Calls quarto to render (modified) pages
+from .QuartoRenderer import QuartoRenderer
+
+# Watches the package sources and updates the man pages
+from .Watcher import Watcher
+
 # Series of functions for testing only
 from .demofunctions import *
@@ -7,17 +7,52 @@ def main():
     config  = Config(argparse = True)
     if not config.get("silent"): print(config)
 
+    # Extract archive (see --archive); package not required
+    if config.get("action") == "unpack":
+        from pyp2qmd import ArchiveSink
+        res = ArchiveSink.extract(config.get("archive"), config.get("quarto_dir"),
+                                  config.get("examples_dir"))
+        if not config.get("silent"):
+            print(f"pyp2qmd: Extracted \"{config.get('archive')}\": {len(res['written'])} " + \
+                  f"written, {len(res['unchanged'])} unchanged")
+        return
+
+    # Render man pages from an IR file (see --ir); package not required
+    if config.get("action") == "render-qmd":
+        from pyp2qmd import IRFile
+        res = IRFile(config.get("ir")).render(config)
+        if not config.get("silent"):
+            print(f"pyp2qmd: Rendered \"{config.get('ir')}\": {len(res['written'])} " + \
+                  f"written, {len(res['unchanged'])} unchanged")
+            for ref, pages in res["unresolved"].items():
+                print(f"         Unresolved reference {ref} (on {', '.join(pages)})")
+        return
+
     # Initialize DocConverter; creates _quarto.yml,
     # pyp.sass, and index.qmd if needed.
-    docconv = DocConverter(config)
+    docconv = DocConverter(config, filesystem = config.get("action") != "extract")
     if not config.get("silent"): print(docconv)
 
     print(config)
     if config.get("action") == "examples":
         docconv.examples()
+    elif config.get("action") == "watch":
+        from pyp2qmd import Watcher
+        docconv.document()
+        docconv.update_quarto_yml()
+        Watcher(docconv).run()
+    elif config.get("action") == "extract":
+        docconv.extract(config.get("ir"))
+    elif config.get("action") == "render":
+        docconv.document()
+        docconv.update_quarto_yml()
+        docconv.render()
     else:
         docconv.document()
         docconv.update_quarto_yml()
 
+    # Write profiling report if `--profile` is set
+    docconv.write_profile()
+
 if __name__ == "__main__":
     main()